@@ -3,26 +3,53 @@ FastAPI Backend with LangGraph Multi-Agent Workflow
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 import json
 import sys
 import os
+import time
 
 # Add parent directory to path to import agents
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from sales_lead_enrichment.langgraph_workflow import run_lead_processing_pipeline
-from agents.services.sqlite_db import init_db, insert_lead, get_lead_by_id, get_all_leads
+# The pipeline (agents, LLM client, langgraph) is imported by the handlers that use it, or by
+# the warm-up, so importing the app stays fast
+from agents.services.sqlite_db import (
+    init_db, insert_lead, update_lead, get_lead_by_id, get_all_leads, insert_llm_calls, get_llm_calls,
+)
+from agents.llm_metrics import get_metrics_registry, summarize_records
+
+# Import the pipeline and compile its graphs at startup instead of on the first request
+API_WARMUP = os.getenv("API_WARMUP", "").lower() in ("1", "true", "yes")
+
+
+def warm_up():
+    """Import the pipeline and pay its one-time costs (see warm_up_pipeline)"""
+    start = time.perf_counter()
+    from sales_lead_enrichment.langgraph_workflow import warm_up_pipeline
+    timings = {"imports": (time.perf_counter() - start) * 1000, **warm_up_pipeline()}
+    print("🔥 Pipeline warmed up: " + ", ".join(f"{step} {ms:.0f} ms" for step, ms in timings.items()))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup"""
+    """Initialize database on startup and release workers and connections on shutdown"""
     init_db()
     print("✅ Database initialized")
+    if API_WARMUP:
+        warm_up()
     print("🚀 LeadGenrich API is ready!")
     yield
+    # Stop the HTML parsing / extraction worker processes and close LLM and browsing connections
+    from agents.extraction_pool import shutdown_extraction_pool
+    from agents.llm_gateway import aclose
+    from agents import web_client
+    shutdown_extraction_pool()
+    await aclose()
+    await web_client.aclose()
 
 app = FastAPI(
     title="LeadGenrich API",
@@ -46,6 +73,12 @@ class LeadInput(BaseModel):
 
 class EnrichedLeadInput(BaseModel):
     enriched_lead: dict
+    explain: bool = False  # Ask the LLM for a free-text score recommendation
+    scoring_mode: str | None = None  # engine, llm or compare (defaults to SCORING_MODE)
+
+class BatchScoringInput(BaseModel):
+    enriched_leads: list[dict]
+    scoring_mode: str | None = None  # engine, llm or compare (defaults to SCORING_MODE)
 
 class RoutingInput(BaseModel):
     enriched_lead: dict
@@ -54,6 +87,13 @@ class RoutingInput(BaseModel):
 class FullPipelineRequest(BaseModel):
     inbound_lead: dict
     enrichment_options: dict = {"metadata_enrichment": True, "opportunity_enrichment": True}
+    # enrichment_options["fused_enrichment"]: metadata + scoring in one LLM call (defaults to PIPELINE_FUSED_ENRICHMENT)
+    # enrichment_options["flat_graph"]: one flat graph instead of nested agent subgraphs (defaults to PIPELINE_FLAT_GRAPH)
+    # enrichment_options["score_pruning"]: skip opportunity enrichment for leads that cannot reach the routing threshold (defaults to PIPELINE_SCORE_PRUNING)
+    # enrichment_options["trace"]: include the run's timing waterfall (its traced spans) in the response
+
+class ReenrichRequest(BaseModel):
+    fields: list[str] = []  # Fields or stages (metadata, news, linkedin) to refresh even if still fresh
 
 @app.get("/")
 async def root():
@@ -65,7 +105,15 @@ async def root():
         "endpoints": {
             "full_pipeline": "POST /process_lead",
             "get_lead": "GET /lead/{lead_id}",
+            "reenrich_lead": "POST /lead/{lead_id}/reenrich",
+            "blob": "GET /blobs/{ref}",
             "list_leads": "GET /leads",
+            "opportunities_stream": "POST /opportunities/stream (SSE)",
+            "llm_cache_metrics": "GET /metrics/llm_cache",
+            "single_flight_metrics": "GET /metrics/single_flight",
+            "model_policy_metrics": "GET /metrics/model_policy",
+            "llm_metrics": "GET /metrics/llm",
+            "llm_run_metrics": "GET /metrics/llm/runs/{run_id}",
             "health": "GET /health"
         }
     }
@@ -75,6 +123,117 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "LeadGenrich API is running"}
 
+@app.get("/metrics/llm")
+async def llm_metrics(recent: int = 0):
+    """Per-agent LLM latency, token and cost totals since startup (optionally the most recent calls)"""
+    registry = get_metrics_registry()
+    response = {"agents": registry.summary()}
+    if recent:
+        response["recent_calls"] = registry.recent(recent)
+    return response
+
+@app.get("/metrics/llm/runs/{run_id}")
+async def llm_run_metrics(run_id: str):
+    """Persisted LLM calls of one pipeline run, with per-agent totals"""
+    calls = get_llm_calls(run_id=run_id)
+    if not calls:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {"run_id": run_id, "agents": summarize_records(calls), "calls": calls}
+
+@app.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Timing waterfall of a recent pipeline run (trace id = run id), while still in memory"""
+    from agents.tracing import get_trace_registry
+    waterfall = get_trace_registry().waterfall(trace_id)
+    if waterfall is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return {"trace_id": trace_id, "waterfall": waterfall}
+
+@app.get("/metrics/model_policy")
+async def model_policy_metrics():
+    """Per agent and model tier: attempts, accepted, escalations (with reasons) and latency"""
+    from agents.model_policy import MODEL_POLICIES, get_model_policy_stats, model_policy
+    return {
+        "policies": {agent: model_policy(agent) for agent in MODEL_POLICIES},
+        "tiers": get_model_policy_stats().summary()
+    }
+
+@app.get("/metrics/single_flight")
+async def single_flight_metrics():
+    """Coalesced enrichment requests per agent (concurrent leads from the same company)"""
+    from agents.single_flight import single_flight_stats
+    return {"groups": single_flight_stats()}
+
+@app.get("/metrics/llm_cache")
+async def llm_cache_metrics():
+    """Per-agent hit/miss counters of the LLM response cache"""
+    from agents.llm_cache import get_llm_cache
+    return {"agents": get_llm_cache().stats()}
+
+def save_pipeline_result(state: dict, llm_calls: list) -> dict:
+    """
+    Persist a finished pipeline run and build the /process_lead response (500 if the run failed)
+    A re-enrichment run (stored_lead_id set) updates its stored lead instead of inserting one
+    """
+    run_id = state.get("run_id")
+    
+    if state.get("error"):
+        insert_llm_calls(llm_calls)
+        # A failed checkpointed run keeps its completed stages; POST /process_lead/{run_id}/resume continues it
+        raise HTTPException(status_code=500, detail={
+            "error": f"Pipeline failed: {state['error']}",
+            "run_id": run_id,
+            "resumable": bool(state.get("resumable")),
+        })
+    
+    # Save to database
+    lead_record = {
+        "company": state["inbound_lead"].get("company"),
+        "email": state["inbound_lead"].get("email"),
+        "job_title": state["inbound_lead"].get("job_title"),
+        "website": state["inbound_lead"].get("website"),
+        "phone": state["inbound_lead"].get("phone"),
+        "enriched_lead": json.dumps(state.get("enriched_lead", {})),
+        "icp_score": state.get("icp_score"),
+        "assigned_rep": state.get("assigned_rep"),
+        "error": state.get("error"),
+        # Kept for incremental re-enrichment (POST /lead/{lead_id}/reenrich); payloads by blob ref
+        "opportunities": json.dumps({
+            "news_ref": state.get("news_ref"),
+            "linkedin_ref": state.get("linkedin_ref"),
+            "enrichment_opportunity": state.get("enrichment_opportunity", ""),
+        }),
+        "fetched_at": json.dumps(state.get("fetched_at", {})),
+    }
+    
+    lead_id = state.get("stored_lead_id")
+    if lead_id is not None:
+        update_lead(lead_id, lead_record)
+        print(f"\n💾 Updated database record with ID: {lead_id}")
+    else:
+        lead_id = insert_lead(lead_record)
+        print(f"\n💾 Saved to database with ID: {lead_id}")
+    insert_llm_calls(llm_calls, lead_id=lead_id)
+    
+    return {
+        "success": True,
+        "db_id": lead_id,
+        "run_id": run_id,
+        "llm_usage": summarize_records(llm_calls),
+        "inbound_lead": state["inbound_lead"],
+        "enriched_lead": state.get("enriched_lead", {}),
+        "icp_score": state.get("icp_score", 0),
+        "score_breakdown": state.get("score_breakdown", {}),
+        "score_recommendation": state.get("score_recommendation", ""),
+        "assigned_rep": state.get("assigned_rep", "Unassigned"),
+        "routing_reason": state.get("routing_reason", ""),
+        "rep_email": state.get("rep_email", ""),
+        "pruned": state.get("pruned", False),
+        # Browsed news items and LinkedIn posts: GET /blobs/{ref}
+        "opportunity_refs": {"news": state.get("news_ref"), "linkedin": state.get("linkedin_ref")},
+        "error": state.get("error")
+    }
+
 @app.post("/process_lead")
 async def process_lead_full_pipeline(request: FullPipelineRequest):
     """
@@ -82,45 +241,45 @@ async def process_lead_full_pipeline(request: FullPipelineRequest):
     Uses LangGraph StateGraph with conditional routing
     """
     try:
-        # Run the LangGraph multi-agent workflow
-        state = await run_lead_processing_pipeline(request.inbound_lead)
+        from sales_lead_enrichment.langgraph_workflow import run_lead_processing_pipeline
         
-        if state.get("error"):
-            raise Exception(state["error"])
-        
-        # Save to database
-        lead_record = {
-            "company": state["inbound_lead"].get("company"),
-            "email": state["inbound_lead"].get("email"),
-            "job_title": state["inbound_lead"].get("job_title"),
-            "website": state["inbound_lead"].get("website"),
-            "phone": state["inbound_lead"].get("phone"),
-            "enriched_lead": json.dumps(state.get("enriched_lead", {})),
-            "icp_score": state.get("icp_score"),
-            "assigned_rep": state.get("assigned_rep"),
-            "error": state.get("error"),
-        }
-        
-        lead_id = insert_lead(lead_record)
-        print(f"\n💾 Saved to database with ID: {lead_id}")
-        
-        return {
-            "success": True,
-            "db_id": lead_id,
-            "inbound_lead": state["inbound_lead"],
-            "enriched_lead": state.get("enriched_lead", {}),
-            "icp_score": state.get("icp_score", 0),
-            "score_breakdown": state.get("score_breakdown", {}),
-            "score_recommendation": state.get("score_recommendation", ""),
-            "assigned_rep": state.get("assigned_rep", "Unassigned"),
-            "routing_reason": state.get("routing_reason", ""),
-            "rep_email": state.get("rep_email", ""),
-            "error": state.get("error")
-        }
+        # Run the LangGraph multi-agent workflow
+        state = await run_lead_processing_pipeline(
+            request.inbound_lead,
+            fused=request.enrichment_options.get("fused_enrichment"),
+            flat=request.enrichment_options.get("flat_graph"),
+            prune=request.enrichment_options.get("score_pruning"),
+        )
+        response = save_pipeline_result(state, get_metrics_registry().run_records(state.get("run_id")))
+        if request.enrichment_options.get("trace"):
+            from agents.tracing import get_trace_registry
+            response["waterfall"] = get_trace_registry().waterfall(state["run_id"])
+        return response
     
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"\n❌ Pipeline error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
+
+@app.post("/process_lead/{run_id}/resume")
+async def resume_lead_pipeline(run_id: str):
+    """
+    Resume a failed /process_lead run from its last successful node
+    (completed stages are not run again)
+    """
+    # LLM calls of the failed attempt were already saved with its error
+    saved_calls = len(get_metrics_registry().run_records(run_id))
+    try:
+        from sales_lead_enrichment.langgraph_workflow import resume_lead_processing_pipeline
+        
+        state = await resume_lead_processing_pipeline(run_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No checkpointed run to resume (unknown or already completed)")
     except Exception as e:
         print(f"\n❌ Pipeline error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
+    return save_pipeline_result(state, get_metrics_registry().run_records(run_id)[saved_calls:])
 
 @app.get("/lead/{lead_id}")
 async def get_lead(lead_id: int):
@@ -130,6 +289,73 @@ async def get_lead(lead_id: int):
         return lead
     raise HTTPException(status_code=404, detail="Lead not found")
 
+def stored_pipeline_result(lead: dict) -> dict:
+    """A stored lead row as refresh_lead_pipeline input (rows saved before re-enrichment have no fetch times)"""
+    opportunities = json.loads(lead.get("opportunities") or "{}")
+    return {
+        "stored_lead_id": lead["id"],
+        "inbound_lead": {key: lead[key] for key in ("company", "email", "job_title", "website", "phone") if lead.get(key)},
+        "enriched_lead": json.loads(lead.get("enriched_lead") or "{}"),
+        "news_ref": opportunities.get("news_ref"),
+        "linkedin_ref": opportunities.get("linkedin_ref"),
+        "enrichment_opportunity": opportunities.get("enrichment_opportunity", ""),
+        "fetched_at": json.loads(lead.get("fetched_at") or "{}"),
+    }
+
+@app.post("/lead/{lead_id}/reenrich")
+async def reenrich_lead(lead_id: int, request: ReenrichRequest | None = None):
+    """
+    Incremental re-enrichment of a stored lead: refresh only its stale fields
+    (older than their freshness TTLs, see agents.freshness) and any requested
+    ones, reuse the rest, then re-score and re-route. The stored lead is updated.
+    """
+    from agents.freshness import expand_fields, freshness_report, stale_fields
+    
+    lead = get_lead_by_id(lead_id)
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    stored = stored_pipeline_result(lead)
+    try:
+        forced = expand_fields(request.fields if request else [])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    refresh_fields = stale_fields(stored["fetched_at"])
+    refresh_fields += [field for field in forced if field not in refresh_fields]
+    
+    if not refresh_fields:
+        print(f"\n♻️  Lead {lead_id} is fresh, nothing to re-enrich")
+        return {
+            "success": True,
+            "db_id": lead_id,
+            "refreshed_fields": [],
+            "freshness": freshness_report(stored["fetched_at"]),
+            "inbound_lead": stored["inbound_lead"],
+            "enriched_lead": stored["enriched_lead"],
+            "icp_score": lead.get("icp_score", 0),
+            "assigned_rep": lead.get("assigned_rep", "Unassigned"),
+        }
+    
+    try:
+        from sales_lead_enrichment.langgraph_workflow import refresh_lead_pipeline
+        
+        state = await refresh_lead_pipeline(stored, refresh_fields)
+    except Exception as e:
+        print(f"\n❌ Pipeline error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
+    response = save_pipeline_result(state, get_metrics_registry().run_records(state.get("run_id")))
+    response["refreshed_fields"] = refresh_fields
+    response["freshness"] = freshness_report(state["fetched_at"])
+    return response
+
+@app.get("/blobs/{ref}")
+async def get_blob(ref: str):
+    """A crawl payload (browsed news items, LinkedIn posts) referenced by a pipeline result"""
+    from agents.blob_store import get_blob_store
+    try:
+        return get_blob_store().get(ref)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Blob not found")
+
 @app.get("/leads")
 async def list_all_leads():
     """Get all processed leads"""
@@ -145,14 +371,14 @@ async def enrich_metadata(request: LeadInput):
     Directly uses metadata agent output without transformation
     """
     try:
-        from agents.metadata_enrichment_agent import run_metadata_enrichment
+        from agents.metadata_enrichment_agent import arun_metadata_enrichment
         
         company_name = request.lead.get("company", "")
         if not company_name:
             raise Exception("No company name provided")
         
         # Get metadata directly from agent
-        result = run_metadata_enrichment(company_name)
+        result = await arun_metadata_enrichment(company_name)
         
         # Simple passthrough - build enriched_lead from metadata agent output
         enriched_data = {
@@ -175,35 +401,75 @@ async def enrich_metadata(request: LeadInput):
         print(f"❌ Enrichment error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Enrichment failed: {str(e)}")
 
+def build_opportunities_response(result: dict) -> dict:
+    """Response body of /opportunities from the opportunity agent's result"""
+    opportunities = {
+        "news_opportunities": result.get("browsed_opportunity_from_news", []),
+        "linkedin_posts": result.get("browsed_opportunity_from_linkedin", {}).get("recent_posts", []),
+        "enrichment_summary": result.get("enrichment_opportunity", "")
+    }
+    
+    return {
+        "success": True,
+        "enriched_lead": {},
+        "opportunities": opportunities
+    }
+
 @app.post("/opportunities")
 async def find_opportunities(request: LeadInput):
     """
     Step 2: Opportunity enrichment
     """
     try:
-        from agents.opportunity_enrichment_agent import run_opportunity_enrichment
+        from agents.opportunity_enrichment_agent import arun_opportunity_enrichment
         
         company_name = request.lead.get("company", "")
         if not company_name:
             raise Exception("No company name provided")
         
-        result = run_opportunity_enrichment(company_name)
-        
-        opportunities = {
-            "news_opportunities": result.get("browsed_opportunity_from_news", []),
-            "linkedin_posts": result.get("browsed_opportunity_from_linkedin", {}).get("recent_posts", []),
-            "enrichment_summary": result.get("enrichment_opportunity", "")
-        }
-        
-        return {
-            "success": True,
-            "enriched_lead": {},
-            "opportunities": opportunities
-        }
+        result = await arun_opportunity_enrichment(company_name)
+        return build_opportunities_response(result)
     except Exception as e:
         print(f"❌ Opportunity error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Opportunity search failed: {str(e)}")
 
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/opportunities/stream")
+async def stream_opportunities(request: LeadInput):
+    """
+    Step 2 (streaming): Opportunity enrichment as Server-Sent Events
+    Events: stage (a workflow node finished), token (partial AI analysis text),
+    result (same body as /opportunities) or error
+    """
+    from agents.opportunity_enrichment_agent import astream_opportunity_enrichment
+    
+    company_name = request.lead.get("company", "")
+    if not company_name:
+        raise HTTPException(status_code=400, detail="No company name provided")
+    
+    async def events():
+        yield sse_event("stage", {"stage": "started"})
+        try:
+            async for event in astream_opportunity_enrichment(company_name):
+                if event["event"] == "result":
+                    yield sse_event("result", build_opportunities_response(event["result"]))
+                elif event["event"] == "token":
+                    yield sse_event("token", {"text": event["text"]})
+                else:
+                    yield sse_event("stage", {"stage": event["stage"]})
+        except Exception as e:
+            print(f"❌ Opportunity error: {str(e)}")
+            yield sse_event("error", {"detail": f"Opportunity search failed: {str(e)}"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/score")
 async def score_lead(request: EnrichedLeadInput):
     """
@@ -215,22 +481,46 @@ async def score_lead(request: EnrichedLeadInput):
         
         # Simple state with enriched_lead from metadata agent
         state = {
-            "enriched_lead": request.enriched_lead
+            "enriched_lead": request.enriched_lead,
+            "explain": request.explain,
+            "scoring_mode": request.scoring_mode
         }
         
         # Scoring agent handles everything else
         state = await score_lead_agent(state)
         
-        return {
+        response = {
             "success": True,
             "icp_score": state.get("icp_score", 0),
             "score_breakdown": state.get("score_breakdown", {}),
             "score_recommendation": state.get("score_recommendation", "")
         }
+        if state.get("score_comparison"):
+            response["score_comparison"] = state["score_comparison"]
+        return response
     except Exception as e:
         print(f"❌ Scoring error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
 
+@app.post("/score_batch")
+async def score_leads_batch(request: BatchScoringInput):
+    """
+    Batch ICP scoring for backfills
+    Packs many enriched leads into each LLM request; results are in input order
+    """
+    try:
+        from agents.scoring_agent import score_leads_batch as score_batch
+        
+        results = await score_batch(request.enriched_leads, request.scoring_mode)
+        return {
+            "success": True,
+            "count": len(results),
+            "results": results
+        }
+    except Exception as e:
+        print(f"❌ Batch scoring error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch scoring failed: {str(e)}")
+
 @app.post("/route")
 async def route_to_sdr(request: RoutingInput):
     """
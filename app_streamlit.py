@@ -328,24 +328,51 @@ with col2:
         st.rerun()
 
 if st.button("💼 Find Business Opportunities", use_container_width=True, disabled=not st.session_state.steps_completed['metadata']):
-    with st.spinner("🔄 Analyzing recent news and activities..."):
-        try:
-
-            response = requests.post(
-                f"{API_BASE_URL}/opportunities",
-                json={"lead": st.session_state.lead_data},
-                timeout=90
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            # Extract opportunities from the response
-            st.session_state.opportunities = result.get('opportunities', {})
-            st.session_state.steps_completed['opportunities'] = True
-            st.success("✅ Business opportunities identified!")
-            st.rerun()
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
+    stage_labels = {
+        'started': "🔄 Searching recent news...",
+        'opportunity_news_browsing_node': "🔄 Checking LinkedIn activity...",
+        'opportunity_linkedin_browsing_node': "🤖 Writing AI analysis...",
+    }
+    status_placeholder = st.empty()
+    summary_placeholder = st.empty()
+    try:
+        # Stream the AI analysis as it is generated (Server-Sent Events)
+        response = requests.post(
+            f"{API_BASE_URL}/opportunities/stream",
+            json={"lead": st.session_state.lead_data},
+            stream=True,
+            timeout=90
+        )
+        response.raise_for_status()
+
+        result = None
+        summary_text = ""
+        event_name = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event_name = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):])
+                if event_name == "stage" and data.get('stage') in stage_labels:
+                    status_placeholder.info(stage_labels[data['stage']])
+                elif event_name == "token":
+                    summary_text += data.get('text', '')
+                    summary_placeholder.markdown(summary_text + "▌")
+                elif event_name == "result":
+                    result = data
+                elif event_name == "error":
+                    raise Exception(data.get('detail', 'Opportunity search failed'))
+        if result is None:
+            raise Exception("Stream ended without a result")
+
+        # Extract opportunities from the response
+        st.session_state.opportunities = result.get('opportunities', {})
+        st.session_state.steps_completed['opportunities'] = True
+        status_placeholder.success("✅ Business opportunities identified!")
+        st.rerun()
+    except Exception as e:
+        status_placeholder.empty()
+        st.error(f"❌ Error: {str(e)}")
 
 # Display opportunity results
 if st.session_state.steps_completed['opportunities'] and st.session_state.opportunities.get('status') != 'skipped':
@@ -453,7 +480,7 @@ if st.button("🎯 Calculate ICP Score", use_container_width=True, disabled=not
             
             response = requests.post(
                 f"{API_BASE_URL}/score",
-                json={"enriched_lead": enriched_lead},
+                json={"enriched_lead": enriched_lead, "explain": True},
                 timeout=30
             )
             response.raise_for_status()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized batch opportunity scoring vs the per-article path
+
+Scores 1k and 10k synthetic articles with analyze_opportunity_texts (sparse
+term-count matrix + NumPy) and with analyze_opportunity_text in a loop, and
+checks that both produce identical results.
+
+Usage:
+    python benchmarks/bench_batch_scoring.py [--sizes 1000 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents.opportunity_batch import analyze_opportunity_texts, score_opportunity_types
+from agents.opportunity_signals import analyze_opportunity_text, classify_opportunity_types, scan_opportunities
+from benchmarks.corpus import make_corpus
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Batch sizes to run")
+    parser.add_argument("--max-chars", type=int, default=8000, help="Largest article size in characters")
+    args = parser.parse_args()
+
+    print(f"{'articles':>10}{'per-article s':>15}{'batch s':>10}{'scoring-only per-article s':>28}{'scoring-only batch s':>22}  identical")
+    for size in args.sizes:
+        corpus = make_corpus(size, min_chars=500, max_chars=args.max_chars)
+
+        # End to end: scan + classify + summaries
+        loop_time, loop_results = timed(lambda texts: [analyze_opportunity_text(t) for t in texts], corpus)
+        batch_time, batch_results = timed(analyze_opportunity_texts, corpus)
+
+        # Category scoring only, from precomputed keyword counts
+        counts = [scan_opportunities(text)[1] for text in corpus]
+        loop_score_time, _ = timed(lambda rows: [classify_opportunity_types(c) for c in rows], counts)
+        batch_score_time, _ = timed(score_opportunity_types, counts)
+
+        identical = loop_results == batch_results
+        print(f"{size:>10}{loop_time:>15.3f}{batch_time:>10.3f}{loop_score_time:>28.3f}{batch_score_time:>22.3f}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
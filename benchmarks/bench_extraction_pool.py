@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: articles/sec for HTML parsing + opportunity extraction
+
+Runs parse_and_extract over a batch of synthetic news pages inline and through
+ExtractionPool with an increasing number of worker processes.
+
+Usage:
+    python benchmarks/bench_extraction_pool.py [--pages 200] [--max-workers N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents.extraction_pool import ExtractionPool
+from benchmarks.corpus import make_html_page
+
+
+def run(pool: ExtractionPool, pages: list) -> float:
+    start = time.perf_counter()
+    pool.map((page, "utf-8") for page in pages)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="Number of HTML pages")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool size to try")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    pages = [make_html_page(rng, rng.randint(5_000, 40_000)) for _ in range(args.pages)]
+    megabytes = sum(len(page) for page in pages) / 1_000_000
+    print(f"Pages: {len(pages)}, {megabytes:.1f} MB of HTML, {os.cpu_count()} CPUs")
+    print(f"{'workers':<10}{'seconds':>10}{'articles/s':>12}{'speedup':>10}")
+
+    baseline = run(ExtractionPool(max_workers=0), pages)
+    print(f"{'inline':<10}{baseline:>10.2f}{len(pages) / baseline:>12.1f}{1.0:>10.2f}")
+
+    workers = 1
+    while workers <= args.max_workers:
+        pool = ExtractionPool(max_workers=workers)
+        pool.map([(pages[0], "utf-8")] * workers)  # start worker processes outside the timing
+        elapsed = run(pool, pages)
+        pool.shutdown()
+        print(f"{workers:<10}{elapsed:>10.2f}{len(pages) / elapsed:>12.1f}{baseline / elapsed:>10.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: end-to-end pipeline latency per lead, two-call vs fused mode
+
+Runs run_lead_processing_pipeline for each company in both modes, one lead
+at a time, and reports latency per lead (mean / p50 / p95), LLM calls and
+tokens per lead. The two-call path scores with the LLM (SCORING_MODE=llm) so
+both modes produce an LLM score. The LLM response cache is bypassed.
+
+Needs an LLM endpoint (LLM_BASE_URL). --no-browse replaces web search and
+Wikipedia with empty results so only LLM latency is measured.
+
+Usage:
+    python benchmarks/bench_fused_enrichment.py [--companies Microsoft Shopify] [--repeat 3] [--no-browse]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Set before the agents read their configuration
+os.environ["LLM_CACHE_BYPASS"] = "1"
+os.environ.setdefault("SCORING_MODE", "llm")
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents import metadata_enrichment_agent, opportunity_enrichment_agent
+from agents.llm_metrics import get_metrics_registry, summarize_records
+from sales_lead_enrichment.langgraph_workflow import run_lead_processing_pipeline
+
+
+async def no_search_results(query, num_results=2):
+    return {"organic": []}
+
+
+async def no_wiki_data(company_name):
+    return None
+
+
+def disable_browsing():
+    metadata_enrichment_agent.search_web = no_search_results
+    metadata_enrichment_agent.extract_wiki_data = no_wiki_data
+    opportunity_enrichment_agent.search_web = no_search_results
+
+
+async def run_mode(companies, repeat: int, fused: bool):
+    latencies, calls, tokens, fallbacks = [], [], [], 0
+    for _ in range(repeat):
+        for company in companies:
+            start = time.perf_counter()
+            state = await run_lead_processing_pipeline({"company": company}, fused=fused)
+            latencies.append((time.perf_counter() - start) * 1000)
+            usage = summarize_records(get_metrics_registry().run_records(state["run_id"]))
+            calls.append(sum(agent["calls"] for agent in usage.values()))
+            tokens.append(sum(agent["prompt_tokens"] + agent["completion_tokens"] for agent in usage.values()))
+            fallbacks += int(fused and "metadata" in usage)
+    return latencies, calls, tokens, fallbacks
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", nargs="+", default=["Microsoft", "Shopify", "Unilever"], help="Companies to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per company and mode")
+    parser.add_argument("--no-browse", action="store_true", help="Skip web search and Wikipedia")
+    args = parser.parse_args()
+
+    if args.no_browse:
+        disable_browsing()
+
+    rows = []
+    for label, fused in (("two-call", False), ("fused", True)):
+        latencies, calls, tokens, fallbacks = asyncio.run(run_mode(args.companies, args.repeat, fused))
+        rows.append((label, len(latencies), statistics.mean(latencies), statistics.median(latencies),
+                     percentile(latencies, 0.95), statistics.mean(calls), statistics.mean(tokens), fallbacks))
+
+    print(f"\n{'mode':>10}{'leads':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'LLM calls':>11}{'tokens':>9}{'fallbacks':>11}")
+    for label, leads, mean, p50, p95, mean_calls, mean_tokens, fallbacks in rows:
+        print(f"{label:>10}{leads:>7}{mean:>10.0f}{p50:>10.0f}{p95:>10.0f}{mean_calls:>11.1f}{mean_tokens:>9.0f}{fallbacks:>11}")
+
+
+if __name__ == "__main__":
+    main()
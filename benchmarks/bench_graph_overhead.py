@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: orchestration overhead of nested subgraphs vs the flat graph
+
+All I/O is stubbed: web search, page fetches and Wikipedia return nothing,
+and every agent's LLM call returns a canned answer immediately. What is left
+is the cost of running the pipeline itself (graph scheduling, state
+validation and copying, prompt building, metrics).
+
+Three ways of running the same steps are timed per lead:
+    direct  - the agents' step functions called in order, no graph at all
+    nested  - the default workflow (each agent a compiled subgraph)
+    flat    - the single flat graph (PIPELINE_FLAT_GRAPH)
+Overhead is reported relative to direct.
+
+Usage:
+    python benchmarks/bench_graph_overhead.py [--leads 200] [--concurrency 1]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents import metadata_enrichment_agent, opportunity_enrichment_agent, routing_agent, scoring_agent
+from agents.metadata_enrichment_agent import browse_company_metadata, enrich_company_metadata
+from agents.opportunity_enrichment_agent import (
+    analyze_opportunities,
+    browse_linkedin_opportunities,
+    browse_news_opportunities,
+)
+from agents.routing_agent import route_enriched_lead
+from agents.scoring_agent import score_enriched_lead
+from sales_lead_enrichment.langgraph_workflow import (
+    metadata_update,
+    opportunity_signals_from_news,
+    run_lead_processing_pipeline,
+)
+
+CANNED_METADATA = json.dumps({
+    "industry": "Software",
+    "company_size": "1200",
+    "locations": ["Seattle, Washington, USA"],
+    "technologies": ["AWS", "Kubernetes"],
+    "products_services": ["Analytics platform"],
+    "strategic_focus": ["Cloud Migration"],
+    "company_culture": "Engineering-led",
+    "data_confidence": "high",
+})
+CANNED_ROUTING = json.dumps({"rep_name": "Sarah Chen", "rep_email": "sarah.chen@deloitte.com", "reason": "Stub"})
+
+
+async def stub_chat_completion(agent: str, model: str, messages, **kwargs) -> str:
+    if agent == "metadata":
+        return CANNED_METADATA
+    if agent == "routing":
+        return CANNED_ROUTING
+    return "Stub opportunity analysis."
+
+
+async def no_search_results(query, num_results=2):
+    return {"organic": []}
+
+
+async def no_wiki_data(company_name):
+    return None
+
+
+def stub_io():
+    for module in (metadata_enrichment_agent, opportunity_enrichment_agent, scoring_agent, routing_agent):
+        module.chat_completion = stub_chat_completion
+    metadata_enrichment_agent.search_web = no_search_results
+    metadata_enrichment_agent.extract_wiki_data = no_wiki_data
+    opportunity_enrichment_agent.search_web = no_search_results
+
+
+async def run_direct(company: str):
+    """The pipeline's steps without any graph"""
+    browsed, news, linkedin = await asyncio.gather(
+        browse_company_metadata(company),
+        browse_news_opportunities(company),
+        browse_linkedin_opportunities(company),
+    )
+    metadata, _ = await asyncio.gather(
+        enrich_company_metadata(company, browsed["browsed_metadata"], browsed["wiki_infobox"]),
+        analyze_opportunities(company, news, linkedin),
+    )
+    enriched_lead = metadata_update(metadata.model_dump())["enriched_lead"]
+    enriched_lead["opportunity_signals"] = opportunity_signals_from_news(news)
+    score = await score_enriched_lead(enriched_lead)
+    if score["icp_score"] >= 60:
+        await route_enriched_lead(enriched_lead, score["icp_score"])
+
+
+RUNNERS = {
+    "direct": run_direct,
+    "nested": lambda company: run_lead_processing_pipeline({"company": company}, flat=False, parallel=True),
+    "flat": lambda company: run_lead_processing_pipeline({"company": company}, flat=True),
+}
+
+
+async def run_mode(mode: str, leads: int, concurrency: int):
+    runner = RUNNERS[mode]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await runner(f"{mode} company {index}")
+            latencies.append((time.perf_counter() - start) * 1e6)
+
+    # Warm up (imports, compiled prompts, lru caches)
+    for index in range(5):
+        await runner(f"{mode} warmup {index}")
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(leads)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=200, help="Leads per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="Pipelines in flight")
+    args = parser.parse_args()
+
+    stub_io()
+    results = {}
+    # The agents print progress; keep it out of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for mode in RUNNERS:
+            results[mode] = asyncio.run(run_mode(mode, args.leads, args.concurrency))
+
+    direct_mean = statistics.mean(results["direct"][1])
+    print(f"\n{'mode':>8}{'leads/s':>10}{'mean us':>10}{'p50 us':>10}{'p95 us':>10}{'overhead us':>13}")
+    for mode, (elapsed, latencies) in results.items():
+        ordered = sorted(latencies)
+        mean = statistics.mean(ordered)
+        print(f"{mode:>8}{args.leads / elapsed:>10.0f}{mean:>10.0f}{statistics.median(ordered):>10.0f}"
+              f"{ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]:>10.0f}{mean - direct_mean:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cold-start check: how long importing the API takes, and what it imports
+
+Imports the module (the FastAPI app by default) in fresh interpreters with
+`python -X importtime` and reports the median wall time of the import and
+the packages that took longest (self time summed per top-level package).
+
+The pipeline's heavy dependencies (langgraph, langchain, the OpenAI SDK,
+BeautifulSoup, tiktoken) must stay out of the app's import: they are loaded
+by the first request, or at startup with API_WARMUP=1. With --warmup, the
+time warm_up_pipeline takes in a fresh interpreter is reported as well.
+
+Exits with status 1 if the median import time is over --budget-ms or a
+forbidden package was imported, so it can run as a regression check in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--budget-ms 1500] [--warmup]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORBIDDEN = ["langgraph", "langchain_core", "langchain_openai", "openai", "bs4", "tiktoken"]
+
+IMPORT_CODE = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"import_ms": (time.perf_counter() - start) * 1000}}))
+"""
+
+WARMUP_CODE = """
+import json, time
+start = time.perf_counter()
+from sales_lead_enrichment.langgraph_workflow import warm_up_pipeline
+timings = {"imports": (time.perf_counter() - start) * 1000, **warm_up_pipeline()}
+print(json.dumps(timings))
+"""
+
+
+def run_child(code: str, importtime: bool = False):
+    """Run code in a fresh interpreter; returns (last stdout line as JSON, stderr)"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [project_root, os.environ.get("PYTHONPATH")]))}
+    completed = subprocess.run(command, capture_output=True, text=True, env=env, cwd=project_root)
+    if completed.returncode != 0:
+        sys.exit(f"❌ Child interpreter failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def parse_importtime(stderr: str):
+    """Self time in microseconds per imported module, from -X importtime output"""
+    self_us = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        self_us[name.strip()] = int(self_time)
+    return self_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="sales_lead_enrichment.app_fastapi", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=12, help="Packages to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if the median import takes longer")
+    parser.add_argument("--forbid", nargs="*", default=FORBIDDEN, help="Packages the import must not load")
+    parser.add_argument("--warmup", action="store_true", help="Also time warm_up_pipeline")
+    args = parser.parse_args()
+
+    import_ms = []
+    self_us = {}
+    for _ in range(args.runs):
+        result, stderr = run_child(IMPORT_CODE.format(module=args.module), importtime=True)
+        import_ms.append(result["import_ms"])
+        self_us = parse_importtime(stderr)
+
+    per_package = defaultdict(int)
+    for name, micros in self_us.items():
+        per_package[name.split(".")[0]] += micros
+
+    median_ms = statistics.median(import_ms)
+    print(f"\nimport {args.module}: median {median_ms:.0f} ms, min {min(import_ms):.0f} ms "
+          f"over {args.runs} fresh interpreters ({len(self_us)} modules)")
+    print(f"\n{'package':>24}{'self ms':>10}")
+    for package, micros in sorted(per_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:>24}{micros / 1000:>10.1f}")
+
+    if args.warmup:
+        timings, _ = run_child(WARMUP_CODE)
+        print("\nwarm_up_pipeline: " + ", ".join(f"{step} {ms:.0f} ms" for step, ms in timings.items()))
+
+    failures = []
+    loaded = [package for package in args.forbid if package in per_package]
+    if loaded:
+        failures.append(f"imports {', '.join(loaded)} (should be deferred to first use)")
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(f"median import {median_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"❌ {args.module} {failure}")
+    if failures:
+        sys.exit(1)
+    print("\n✅ Cold-start checks passed")
+
+
+if __name__ == "__main__":
+    main()
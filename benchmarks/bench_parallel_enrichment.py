@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential vs parallel metadata/opportunity enrichment
+
+For each company, times the metadata and opportunity agents on their own,
+then the full pipeline with the two agents chained and fanned out. With the
+fan-out, end-to-end latency should approach the longer of the two stages
+(plus scoring and routing) instead of their sum.
+
+Meant to run offline against the local fakes (see start_fakes.py and
+bench_pipeline_throughput.py for the environment to set). The LLM response
+cache is bypassed.
+
+Usage:
+    python benchmarks/bench_parallel_enrichment.py [--companies Acme Globex] [--repeat 3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Set before the agents read their configuration
+os.environ["LLM_CACHE_BYPASS"] = "1"
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents.metadata_enrichment_agent import arun_metadata_enrichment
+from agents.opportunity_enrichment_agent import arun_opportunity_enrichment
+from sales_lead_enrichment.langgraph_workflow import run_lead_processing_pipeline
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(companies, repeat: int):
+    rows = {"metadata": [], "opportunity": [], "sum": [], "max": [], "sequential": [], "parallel": []}
+    for _ in range(repeat):
+        for company in companies:
+            metadata_ms = await timed(arun_metadata_enrichment(company))
+            opportunity_ms = await timed(arun_opportunity_enrichment(company))
+            rows["metadata"].append(metadata_ms)
+            rows["opportunity"].append(opportunity_ms)
+            rows["sum"].append(metadata_ms + opportunity_ms)
+            rows["max"].append(max(metadata_ms, opportunity_ms))
+            rows["sequential"].append(await timed(run_lead_processing_pipeline({"company": company}, parallel=False)))
+            rows["parallel"].append(await timed(run_lead_processing_pipeline({"company": company}, parallel=True)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", nargs="+", default=["Acme Corp", "Globex", "Initech"], help="Companies to run")
+    parser.add_argument("--repeat", type=int, default=2, help="Runs per company")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.companies, args.repeat))
+    labels = {
+        "metadata": "metadata agent alone",
+        "opportunity": "opportunity agent alone",
+        "sum": "sum of both stages",
+        "max": "longer stage",
+        "sequential": "pipeline, sequential",
+        "parallel": "pipeline, parallel",
+    }
+    print(f"\n{'':>26}{'mean ms':>10}{'p50 ms':>10}")
+    for key, label in labels.items():
+        print(f"{label:>26}{statistics.mean(rows[key]):>10.0f}{statistics.median(rows[key]):>10.0f}")
+    speedup = statistics.mean(rows["sequential"]) / statistics.mean(rows["parallel"])
+    print(f"\nparallel speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full pipeline throughput under concurrent load
+
+Runs run_lead_processing_pipeline for --leads distinct companies with
+--concurrency pipelines in flight, and reports throughput (leads/s),
+latency per lead (p50 / p95), errors and LLM calls per lead.
+
+Meant to run entirely offline against the local fakes:
+
+    python start_fakes.py &
+    LLM_BASE_URL=http://127.0.0.1:9100 SERPER_URL=http://127.0.0.1:9101/search \\
+    WIKIPEDIA_BASE_URL=http://127.0.0.1:9102/wiki SERPER_API_KEY=fake \\
+        python benchmarks/bench_pipeline_throughput.py --leads 50 --concurrency 10
+
+Usage:
+    python benchmarks/bench_pipeline_throughput.py [--leads 50] [--concurrency 10] [--fused]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Set before the agents read their configuration
+os.environ.setdefault("LLM_CACHE_BYPASS", "1")
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents.llm_metrics import get_metrics_registry, summarize_records
+from sales_lead_enrichment.langgraph_workflow import run_lead_processing_pipeline
+
+
+async def run(leads: int, concurrency: int, fused: bool):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, llm_calls = [], 0, []
+
+    async def one(index: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            state = await run_lead_processing_pipeline({"company": f"Loadtest Company {index}"}, fused=fused)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += int(bool(state.get("error")))
+            usage = summarize_records(get_metrics_registry().run_records(state["run_id"]))
+            llm_calls.append(sum(agent["calls"] for agent in usage.values()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(leads)))
+    return time.perf_counter() - start, latencies, errors, llm_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=50, help="Leads to process")
+    parser.add_argument("--concurrency", type=int, default=10, help="Pipelines in flight")
+    parser.add_argument("--fused", action="store_true", help="Fused metadata+scoring mode")
+    args = parser.parse_args()
+
+    elapsed, latencies, errors, llm_calls = asyncio.run(run(args.leads, args.concurrency, args.fused))
+    ordered = sorted(latencies)
+    print(f"\n{'leads':>7}{'concurrency':>13}{'wall s':>9}{'leads/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}{'LLM calls/lead':>16}")
+    print(f"{args.leads:>7}{args.concurrency:>13}{elapsed:>9.2f}{args.leads / elapsed:>9.2f}"
+          f"{statistics.median(ordered):>9.0f}{ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]:>9.0f}"
+          f"{errors:>8}{statistics.mean(llm_calls):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
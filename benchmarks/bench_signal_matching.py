@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: opportunity signal matching throughput (MB/s)
+
+Compares the single-pass matcher in agents/opportunity_signals.py with the
+previous approach of compiling one `(.{0,100}signal.{0,100})` regex per
+signal and running `findall` for each of them over every article.
+
+The per-signal scan backtracks heavily (seconds per article), so it is only
+timed on a small prefix of the corpus.
+
+Usage:
+    python benchmarks/bench_signal_matching.py [--articles 200] [--legacy-articles 5]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from agents.opportunity_signals import OPPORTUNITY_SIGNALS, find_signal_contexts
+from benchmarks.corpus import make_corpus
+
+
+def legacy_signal_contexts(text: str) -> list:
+    """Per-signal regex scan, as analyze_news_for_opportunities used to do it."""
+    matches = []
+    for signal in OPPORTUNITY_SIGNALS:
+        pattern = re.compile(r'(.{0,100}' + signal + r'.{0,100})', re.IGNORECASE | re.DOTALL)
+        found = pattern.findall(text)
+        if found:
+            matches.extend(found)
+    return matches
+
+
+def measure(fn, corpus) -> tuple:
+    start = time.perf_counter()
+    results = [fn(text) for text in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200, help="Number of articles in the corpus")
+    parser.add_argument("--legacy-articles", type=int, default=5, help="Articles to time with the per-signal scan")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.articles)
+    legacy_corpus = corpus[:args.legacy_articles]
+    megabytes = sum(len(text.encode("utf-8")) for text in corpus) / 1_000_000
+    legacy_megabytes = sum(len(text.encode("utf-8")) for text in legacy_corpus) / 1_000_000
+    print(f"Corpus: {len(corpus)} articles, {megabytes:.2f} MB")
+
+    single_time, single_results = measure(find_signal_contexts, corpus)
+    legacy_time, legacy_results = measure(legacy_signal_contexts, legacy_corpus)
+
+    found_agree = sum(bool(a) == bool(b) for a, b in zip(legacy_results, single_results))
+    single_rate = megabytes / single_time
+    legacy_rate = legacy_megabytes / legacy_time
+    print(f"{'matcher':<22}{'articles':>10}{'seconds':>10}{'MB/s':>10}")
+    print(f"{'per-signal regex':<22}{len(legacy_corpus):>10}{legacy_time:>10.3f}{legacy_rate:>10.3f}")
+    print(f"{'single-pass trie':<22}{len(corpus):>10}{single_time:>10.3f}{single_rate:>10.3f}")
+    print(f"Speedup: {single_rate / legacy_rate:.0f}x, 'found' agreement: {found_agree}/{len(legacy_corpus)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Memory per in-flight lead: pipeline state size and peak Python heap
+
+Runs batches of leads through the pipeline at once, with all I/O stubbed:
+web browsing returns realistic payloads (metadata page text, news items
+with their extracted details, LinkedIn posts) and every LLM call answers
+after a short, jittered delay, so the whole batch is in flight together. Python
+allocations are measured with tracemalloc:
+
+    peak KB/lead      - peak heap over the baseline during a batch, per lead
+    retained KB/lead  - heap still held after the batch, per lead
+    state KB          - JSON size of a lead's final pipeline state
+    inline KB         - the same state with its blob refs replaced by the
+                        payloads (what the state carried before they were
+                        stored by reference)
+
+Checkpoints, blobs and the leads database go to a temporary directory.
+
+Usage:
+    python benchmarks/bench_state_memory.py [--concurrency 200] [--batches 3] [--news-items 10]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import tracemalloc
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+scratch = tempfile.mkdtemp(prefix="bench_state_memory_")
+os.environ.setdefault("PIPELINE_CHECKPOINT_DB", os.path.join(scratch, "checkpoints.db"))
+os.environ.setdefault("BLOB_STORE_DB", os.path.join(scratch, "blobs.db"))
+os.environ.setdefault("TRACE_SINK", "")
+
+from agents import metadata_enrichment_agent, opportunity_enrichment_agent, routing_agent, scoring_agent
+from agents.blob_store import get_blob_store
+from sales_lead_enrichment import langgraph_workflow
+from sales_lead_enrichment.langgraph_workflow import run_lead_processing_pipeline
+
+CANNED_METADATA = json.dumps({
+    "industry": "Software",
+    "company_size": "1200",
+    "locations": ["Seattle, Washington, USA"],
+    "technologies": ["AWS", "Kubernetes"],
+    "products_services": ["Analytics platform"],
+    "strategic_focus": ["Cloud Migration"],
+    "company_culture": "Engineering-led",
+    "data_confidence": "high",
+})
+CANNED_ROUTING = json.dumps({"rep_name": "Sarah Chen", "rep_email": "sarah.chen@deloitte.com", "reason": "Stub"})
+
+
+def stub_io(news_items: int, item_kb: int, llm_ms: float):
+    """Stub browsing with payloads of the given size and LLM calls with a fixed latency"""
+    lorem = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (item_kb * 1024 // 57 + 1)
+
+    def page_text(source: str) -> str:
+        # A distinct string per page, as crawled text is
+        return f"{source}: {lorem}"[:item_kb * 1024]
+
+    def latency() -> float:
+        # Jittered, so the leads of a batch do not move through the pipeline in lockstep
+        return random.uniform(0.5, 1.5) * llm_ms / 1000
+
+    async def chat_completion(agent: str, model: str, messages, **kwargs) -> str:
+        await asyncio.sleep(latency())
+        if agent == "metadata":
+            return CANNED_METADATA
+        if agent == "routing":
+            return CANNED_ROUTING
+        return "Stub opportunity analysis."
+
+    async def browse_company_metadata(company_name):
+        await asyncio.sleep(latency())
+        return {"browsed_metadata": f"Company: {company_name}\n\nLinkedIn About: {page_text(company_name) * 4}",
+                "wiki_infobox": {"Industry": "Software", "Headquarters": "Seattle, Washington"}}
+
+    async def browse_news_opportunities(company_name):
+        await asyncio.sleep(latency())
+        pages = [page_text(f"{company_name} news {index}") for index in range(news_items)]
+        return [{
+            "title": f"{company_name} announces cloud migration {index}",
+            "source": f"https://news.example.com/{index}",
+            "snippet": page[:300],
+            "date": "2 days ago",
+            "opportunity_type": "Cloud Migration",
+            "opportunity_types": [{"type": "Cloud Migration", "score": 0.9}],
+            "opportunity_summary": page[:200],
+            "opportunity_details": page,
+        } for index, page in enumerate(pages)]
+
+    async def browse_linkedin_opportunities(company_name):
+        await asyncio.sleep(latency())
+        return {"company_name": company_name, "recent_posts": [
+            {"title": f"Post {index}", "snippet": page_text(f"{company_name} post {index}")[:500],
+             "url": f"https://linkedin.com/posts/{index}"}
+            for index in range(5)
+        ]}
+
+    for module in (metadata_enrichment_agent, opportunity_enrichment_agent, scoring_agent, routing_agent):
+        module.chat_completion = chat_completion
+    # Both the agents' subgraphs and the flat graph's steps
+    for module in (metadata_enrichment_agent, langgraph_workflow):
+        module.browse_company_metadata = browse_company_metadata
+    for module in (opportunity_enrichment_agent, langgraph_workflow):
+        module.browse_news_opportunities = browse_news_opportunities
+        module.browse_linkedin_opportunities = browse_linkedin_opportunities
+
+
+def state_sizes(state: dict):
+    """JSON size of a final state, as is and with its blob refs resolved"""
+    blobs = get_blob_store()
+    inline = {key: value for key, value in state.items() if not key.endswith("_ref")}
+    for key in ("news_ref", "linkedin_ref", "browsed_metadata_ref"):
+        if state.get(key):
+            inline[key[:-len("_ref")]] = blobs.get(state[key])
+    return len(json.dumps(state, default=str)), len(json.dumps(inline, default=str))
+
+
+async def run_batch(flat: bool, concurrency: int, batch: int):
+    # Distinct companies, so single-flight does not share work across leads
+    return await asyncio.gather(*(
+        run_lead_processing_pipeline({"company": f"Company {batch}-{index}"}, flat=flat, parallel=True)
+        for index in range(concurrency)
+    ))
+
+
+async def measure(flat: bool, concurrency: int, batches: int):
+    await run_batch(flat, 5, -1)  # warm up (graphs, prompts, caches)
+    peaks, retained, states = [], [], []
+    for batch in range(batches):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        states = await run_batch(flat, concurrency, batch)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append((peak - baseline) / concurrency / 1024)
+        retained.append((current - baseline) / concurrency / 1024)
+    return statistics.median(peaks), statistics.median(retained), state_sizes(states[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200, help="Leads in flight per batch")
+    parser.add_argument("--batches", type=int, default=3, help="Batches per mode (median reported)")
+    parser.add_argument("--news-items", type=int, default=10, help="News items per lead")
+    parser.add_argument("--item-kb", type=int, default=2, help="Extracted text per news item, in KB")
+    parser.add_argument("--llm-ms", type=float, default=50, help="Stub latency of LLM calls and browsing")
+    args = parser.parse_args()
+
+    random.seed(0)
+    stub_io(args.news_items, args.item_kb, args.llm_ms)
+    tracemalloc.start()
+    results = {}
+    # The agents print progress; keep it out of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for mode, flat in (("nested", False), ("flat", True)):
+            results[mode] = asyncio.run(measure(flat, args.concurrency, args.batches))
+    tracemalloc.stop()
+
+    print(f"\n{args.concurrency} leads in flight, {args.news_items} news items of {args.item_kb} KB each\n")
+    print(f"{'mode':>8}{'peak KB/lead':>15}{'retained KB/lead':>19}{'state KB':>11}{'inline KB':>12}")
+    for mode, (peak, kept, (state_bytes, inline_bytes)) in results.items():
+        print(f"{mode:>8}{peak:>15.1f}{kept:>19.1f}{state_bytes / 1024:>11.1f}{inline_bytes / 1024:>12.1f}")
+    blob_stats = get_blob_store().stats()
+    print(f"\nblob store: {blob_stats['blobs']} blobs, {blob_stats['bytes'] / 1024:.0f} KB "
+          f"({blob_stats['stored_bytes'] / 1024:.0f} KB compressed)")
+
+
+if __name__ == "__main__":
+    main()
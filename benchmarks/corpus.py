@@ -0,0 +1,60 @@
+# benchmarks/corpus.py
+"""
+Synthetic news-article corpus shared by the benchmarks.
+
+Articles are built from ordinary business prose with opportunity keywords
+sprinkled in at roughly the density seen in fetched news pages, and are
+sized like the full-text pages `fetch_url(..., full_text=True)` returns.
+"""
+import random
+from typing import List
+
+FILLER_WORDS = (
+    "the company said on monday that its quarterly results reflected strong demand "
+    "across regions while analysts expected margins to remain under pressure as "
+    "executives outlined plans for the coming year and shareholders welcomed the "
+    "update according to people familiar with the matter who asked not to be named "
+    "because the discussions are private and the board has yet to approve a final "
+    "decision on the proposal which would affect customers employees and suppliers"
+).split()
+
+KEYWORDS = [
+    "partnership", "cloud migration", "digital transformation", "acquisition",
+    "supply chain", "hiring", "product launch", "sustainability", "investment",
+    "market expansion", "cybersecurity", "machine learning", "e-commerce",
+    "strategic alliance", "global expansion", "regulatory compliance", "R&D",
+    "Azure", "AWS", "Salesforce", "IPO", "joint venture", "warehouse",
+]
+
+
+def make_article(rng: random.Random, size_chars: int, keyword_rate: float = 0.01) -> str:
+    """Build one article of roughly `size_chars` characters."""
+    words = []
+    length = 0
+    while length < size_chars:
+        word = rng.choice(KEYWORDS) if rng.random() < keyword_rate else rng.choice(FILLER_WORDS)
+        if rng.random() < 0.05:
+            word = word.capitalize() + "."
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def make_corpus(count: int, min_chars: int = 3_000, max_chars: int = 30_000, seed: int = 7) -> List[str]:
+    """Build `count` articles with sizes spread between `min_chars` and `max_chars`."""
+    rng = random.Random(seed)
+    return [make_article(rng, rng.randint(min_chars, max_chars)) for _ in range(count)]
+
+
+def make_html_page(rng: random.Random, size_chars: int) -> bytes:
+    """Wrap a synthetic article in typical news-site HTML boilerplate."""
+    paragraphs = [make_article(rng, 600) for _ in range(max(1, size_chars // 600))]
+    body = "\n".join(f"<p>{p}</p>" for p in paragraphs)
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    html = (
+        "<!DOCTYPE html><html><head><title>Business news</title>"
+        "<script>window.dataLayer = [];</script><style>body{font-family:sans-serif}</style></head>"
+        f"<body><nav><ul>{nav}</ul></nav><article><h1>Company update</h1>{body}</article>"
+        "<footer>Copyright</footer></body></html>"
+    )
+    return html.encode("utf-8")
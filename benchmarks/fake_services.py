@@ -0,0 +1,282 @@
+"""
+Local stand-ins for the pipeline's external services, for offline load tests
+
+Three FastAPI apps:
+
+- llm_app: OpenAI-compatible POST /chat/completions (plain and streaming,
+  with usage). Answers are picked from the system prompt (metadata, combined
+  metadata+scoring, scoring, batch scoring, score explanation, routing,
+  opportunity analysis) and are deterministic per company, so they parse and
+  validate like real responses.
+- serper_app: Serper-compatible POST /search returning organic results
+  that link to the site fixture server (news articles, LinkedIn company pages
+  and posts).
+- site_app: static HTML fixtures: /news/<slug>, /linkedin.com/company/<slug>,
+  /linkedin.com/posts/<slug> and /wiki/<company> (with an infobox for a
+  configurable share of companies).
+
+Configuration (environment variables, read at import; see start_fakes.py):
+    FAKE_SITE_URL: public base URL of site_app (used in search results)
+    FAKE_<SERVICE>_LATENCY_MS: mean latency, SERVICE = LLM, SERPER or SITE
+        (for the LLM: time to first token)
+    FAKE_<SERVICE>_ERROR_RATE: share of requests answered with HTTP 500
+    FAKE_LATENCY_JITTER: +/- relative jitter applied to every latency
+    FAKE_LLM_TOKENS_PER_SEC: streaming/generation speed after the first token
+    FAKE_LLM_OUTPUT_CHARS: length of the opportunity analysis text
+    FAKE_ARTICLE_CHARS: length of news article bodies
+    FAKE_WIKI_INFOBOX_RATE: share of companies whose Wikipedia page has an infobox
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+FAKE_SITE_URL = os.getenv("FAKE_SITE_URL", "http://127.0.0.1:9102")
+FAKE_LATENCY_JITTER = float(os.getenv("FAKE_LATENCY_JITTER", "0.2"))
+FAKE_LLM_TOKENS_PER_SEC = float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "80"))
+FAKE_LLM_OUTPUT_CHARS = int(os.getenv("FAKE_LLM_OUTPUT_CHARS", "1500"))
+FAKE_ARTICLE_CHARS = int(os.getenv("FAKE_ARTICLE_CHARS", "6000"))
+FAKE_WIKI_INFOBOX_RATE = float(os.getenv("FAKE_WIKI_INFOBOX_RATE", "0.5"))
+
+
+def _service_config(service: str, latency_ms: str) -> Dict[str, float]:
+    return {
+        "latency_ms": float(os.getenv(f"FAKE_{service}_LATENCY_MS", latency_ms)),
+        "error_rate": float(os.getenv(f"FAKE_{service}_ERROR_RATE", "0")),
+    }
+
+
+SERVICES = {
+    "llm": _service_config("LLM", "800"),
+    "serper": _service_config("SERPER", "300"),
+    "site": _service_config("SITE", "150"),
+}
+
+INDUSTRIES = ["Information Technology", "Software", "Financial Services", "Healthcare", "Retail", "Manufacturing"]
+LOCATIONS = ["Seattle, Washington, USA", "Toronto, Ontario, Canada", "London, UK", "Austin, Texas, USA", "Berlin, Germany"]
+TECHNOLOGIES = ["AWS", "Azure", "Google Cloud", "Salesforce", "SAP", "Kubernetes", "Snowflake", "Python"]
+FOCUS_AREAS = ["Digital Transformation", "Cloud Migration", "AI innovation", "Market expansion", "Sustainability"]
+OPPORTUNITY_PHRASES = [
+    "announced a strategic partnership to accelerate its cloud migration",
+    "is investing in AI and machine learning across its product line",
+    "plans a global expansion into new markets next year",
+    "completed the acquisition of a data analytics company",
+    "launched a digital transformation program with a major consulting firm",
+    "raised new funding to expand its e-commerce platform",
+]
+
+
+def _rng(*parts: str) -> random.Random:
+    """Deterministic random generator per input (same company, same answer)."""
+    return random.Random(hashlib.sha256("|".join(parts).encode()).hexdigest())
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:60] or "company"
+
+
+async def _delay(service: str):
+    latency = SERVICES[service]["latency_ms"] / 1000
+    await asyncio.sleep(max(0.0, latency * random.uniform(1 - FAKE_LATENCY_JITTER, 1 + FAKE_LATENCY_JITTER)))
+
+
+def _failed(service: str) -> bool:
+    return random.random() < SERVICES[service]["error_rate"]
+
+
+def _error_response(service: str) -> JSONResponse:
+    return JSONResponse({"error": {"message": f"fake {service} error", "type": "server_error"}}, status_code=500)
+
+
+# ----- LLM -----
+
+llm_app = FastAPI(title="Fake LLM")
+
+
+def _company(text: str) -> str:
+    match = re.search(r"Company(?: Name)?:\s*([^\n]+)", text)
+    return match.group(1).strip() if match else "Example Corp"
+
+
+def _metadata(company: str) -> Dict[str, Any]:
+    rng = _rng("metadata", company)
+    return {
+        "industry": rng.choice(INDUSTRIES),
+        "company_size": f"{rng.choice([40, 150, 350, 1200, 5000, 25000])} employees",
+        "locations": [rng.choice(LOCATIONS)],
+        "technologies": rng.sample(TECHNOLOGIES, 3),
+        "products_services": [f"{company} platform", f"{company} services"],
+        "strategic_focus": rng.sample(FOCUS_AREAS, 2),
+        "company_culture": f"{company} values innovation, customer focus and collaboration.",
+        "data_confidence": rng.choice(["high", "high", "medium", "low"]),
+    }
+
+
+def _score(seed: str) -> Dict[str, Any]:
+    rng = _rng("score", seed)
+    breakdown = {
+        "industry": rng.randint(5, 20), "company_size": rng.randint(5, 20), "technologies": rng.randint(3, 15),
+        "strategic_focus": rng.randint(3, 15), "location": rng.randint(2, 10), "opportunities": rng.randint(5, 20),
+    }
+    return {"score": sum(breakdown.values()), "breakdown": breakdown,
+            "recommendation": "Solid ICP fit with clear opportunity signals."}
+
+
+def _rep_name(system: str) -> str:
+    match = re.search(r'"name":"([^"]+)"', system)
+    return match.group(1) if match else "Unassigned"
+
+
+def llm_answer(system: str, user: str) -> str:
+    """Response text for a chat request, chosen from its system prompt."""
+    if "Combined Mode" in system:
+        company = _company(user)
+        return json.dumps({"metadata": _metadata(company), "score": _score(user)})
+    if "MetadataEnrichmentAgent" in system:
+        return json.dumps(_metadata(_company(user)))
+    if "Batch Mode" in system:
+        indices = [int(i) for i in re.findall(r'"lead_index":\s*(\d+)', user)]
+        return json.dumps([dict(_score(f"{user}|{i}"), lead_index=i) for i in indices])
+    if "already been scored" in system:
+        return "Strong fit on industry and company size; opportunity signals suggest near-term buying intent."
+    if "ICP" in system and "routing" not in system.lower():
+        return json.dumps(_score(user))
+    if "routing" in system.lower():
+        rep = _rep_name(system)
+        return json.dumps({"rep_name": rep, "rep_email": "", "reason": "Territory and industry match"})
+    # Opportunity analysis (free text)
+    paragraph = ("## Company Overview\nThe company shows several near-term opportunities. "
+                 + " ".join(OPPORTUNITY_PHRASES) + "\n\n")
+    return (paragraph * (FAKE_LLM_OUTPUT_CHARS // len(paragraph) + 1))[:FAKE_LLM_OUTPUT_CHARS]
+
+
+def _usage(messages: List[Dict[str, str]], content: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+@llm_app.post("/chat/completions")
+@llm_app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    await _delay("llm")
+    if _failed("llm"):
+        return _error_response("llm")
+
+    system = messages[0]["content"] if messages and messages[0].get("role") == "system" else ""
+    content = llm_answer(system, messages[-1]["content"] if messages else "")
+    usage = _usage(messages, content)
+    seconds_per_char = 1 / (FAKE_LLM_TOKENS_PER_SEC * 4)
+    base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": body.get("model", "fake")}
+
+    if body.get("stream"):
+        async def events():
+            chunk_chars = 40
+            for i in range(0, len(content), chunk_chars):
+                piece = content[i:i + chunk_chars]
+                yield "data: " + json.dumps({**base, "object": "chat.completion.chunk", "choices": [
+                    {"index": 0, "delta": {"content": piece}, "finish_reason": None}]}) + "\n\n"
+                await asyncio.sleep(len(piece) * seconds_per_char)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield "data: " + json.dumps({**base, "object": "chat.completion.chunk",
+                                             "choices": [], "usage": usage}) + "\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    await asyncio.sleep(len(content) * seconds_per_char)
+    return {**base, "object": "chat.completion", "usage": usage, "choices": [
+        {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]}
+
+
+# ----- Serper -----
+
+serper_app = FastAPI(title="Fake Serper")
+
+
+@serper_app.post("/search")
+async def search(request: Request):
+    body = await request.json()
+    query, num = body.get("q", ""), int(body.get("num", 10))
+    await _delay("serper")
+    if _failed("serper"):
+        return _error_response("serper")
+
+    slug = _slug(query)
+    if "linkedin.com/posts" in query or "linkedin posts" in query or "linkedin announcement" in query:
+        links = [(f"{FAKE_SITE_URL}/linkedin.com/posts/{slug}-{i}", f"LinkedIn update #{i + 1}") for i in range(num)]
+    elif "linkedin" in query:
+        company = query.replace("company linkedin", "").strip()
+        links = [(f"{FAKE_SITE_URL}/linkedin.com/company/{_slug(company)}", f"{company} | LinkedIn")]
+        links += [(f"{FAKE_SITE_URL}/news/{slug}-{i}", f"{company} news #{i}") for i in range(1, num)]
+    else:
+        links = [(f"{FAKE_SITE_URL}/news/{slug}-{i}", f"{query[:60]} #{i + 1}") for i in range(num)]
+
+    rng = _rng("serper", query)
+    organic = [{"title": title, "link": link, "position": position + 1,
+                "snippet": f"{title}: the company {rng.choice(OPPORTUNITY_PHRASES)}.",
+                "date": f"{rng.randint(1, 28)} days ago"}
+               for position, (link, title) in enumerate(links[:num])]
+    return {"searchParameters": {"q": query, "num": num}, "organic": organic}
+
+
+# ----- Site fixtures -----
+
+site_app = FastAPI(title="Fake site fixtures")
+
+
+async def _page(title: str, body: str) -> HTMLResponse:
+    await _delay("site")
+    if _failed("site"):
+        return HTMLResponse("<html><body>Internal Server Error</body></html>", status_code=500)
+    return HTMLResponse(f"<html><head><title>{title}</title></head><body><h1>{title}</h1>{body}</body></html>")
+
+
+@site_app.get("/news/{slug}")
+async def news_article(slug: str):
+    rng = _rng("news", slug)
+    sentences = []
+    while sum(len(s) for s in sentences) < FAKE_ARTICLE_CHARS:
+        sentences.append(f"<p>The company {rng.choice(OPPORTUNITY_PHRASES)}, according to people familiar with the plans. "
+                         "Analysts expect the move to drive growth, investment and new technology spending.</p>")
+    return await _page(slug.replace("-", " ").title(), "".join(sentences))
+
+
+@site_app.get("/linkedin.com/company/{slug}")
+async def linkedin_company(slug: str):
+    company = slug.replace("-", " ").title()
+    about = (f"About {company} is a leading provider of enterprise solutions, focused on digital transformation, "
+             "cloud migration and AI innovation for customers worldwide. " * 4)
+    return await _page(f"{company} | LinkedIn", f"<section><h2>About</h2><p>{about}</p></section>")
+
+
+@site_app.get("/linkedin.com/posts/{slug}")
+async def linkedin_post(slug: str):
+    rng = _rng("post", slug)
+    return await _page("LinkedIn post", f"<p>We are excited: our company {rng.choice(OPPORTUNITY_PHRASES)}.</p>")
+
+
+@site_app.get("/wiki/{company}")
+async def wikipedia(company: str):
+    name = company.replace("_", " ")
+    rng = _rng("wiki", name)
+    if rng.random() >= FAKE_WIKI_INFOBOX_RATE:
+        return await _page(name, f"<p>{name} is a company.</p>")
+    metadata = _metadata(name)
+    rows = {
+        "Industry": metadata["industry"],
+        "Number of employees": f"{metadata['company_size'].split()[0]} (2024) [ 1 ]",
+        "Headquarters": metadata["locations"][0],
+        "Products": ", ".join(metadata["products_services"]),
+    }
+    infobox = "".join(f"<tr><th>{key}</th><td>{value}</td></tr>" for key, value in rows.items())
+    return await _page(name, f'<table class="infobox vcard">{infobox}</table><p>{name} is a company.</p>')
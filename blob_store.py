@@ -0,0 +1,119 @@
+# agents/blob_store.py
+"""
+Content-addressed store for large crawl payloads.
+
+The pipeline state holds the browsed metadata text, the news items and the
+LinkedIn posts by reference: a step that crawls them puts the payload here
+and keeps only its ref (a hash of its content) in the state, and the step
+that analyzes them loads it back. Every node update, checkpoint and stored
+lead then carries a 32-character ref instead of tens of KB of page text.
+
+Blobs are compressed JSON in a WAL-mode SQLite file, so a payload costs
+memory only while a step is working on it. Identical payloads (e.g. the
+news of one company crawled for several leads) are stored once. Blobs are
+not deleted with the runs or leads that reference them.
+
+Configuration (environment variables):
+    BLOB_STORE_DB: SQLite file for blobs
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+BLOB_STORE_DB = os.getenv("BLOB_STORE_DB", "pipeline_blobs.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    ref TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+class BlobStore:
+    """JSON payloads keyed by the hash of their content."""
+
+    def __init__(self, path: str = BLOB_STORE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the pipeline creates no file
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def put(self, value: Any) -> str:
+        """Store a JSON-serializable payload; returns its ref."""
+        # Encoded in chunks straight into the hash and the compressor, never as one string
+        digest = hashlib.sha256()
+        compressor = zlib.compressobj(1)
+        compressed = []
+        size = 0
+        for chunk in ENCODER.iterencode(value):
+            data = chunk.encode("utf-8")
+            digest.update(data)
+            compressed.append(compressor.compress(data))
+            size += len(data)
+        compressed.append(compressor.flush())
+        ref = digest.hexdigest()[:32]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?)",
+                (ref, b"".join(compressed), size, time.time()),
+            )
+        return ref
+
+    def get(self, ref: Optional[str], default: Any = None) -> Any:
+        """
+        Load a payload by ref.
+
+        Returns:
+            The payload, or default if ref is None
+
+        Raises:
+            KeyError: If there is no blob for ref
+        """
+        if ref is None:
+            return default
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM blobs WHERE ref = ?", (ref,)).fetchone()
+        if row is None:
+            raise KeyError(ref)
+        return json.loads(zlib.decompress(row[0]))
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of blobs and their total size (uncompressed and stored bytes)."""
+        with self._lock:
+            count, size, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        return {"blobs": count, "bytes": size, "stored_bytes": stored}
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store (created on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore()
+        return _store
@@ -0,0 +1,159 @@
+# agents/extraction_pool.py
+"""
+Process-pool stage for CPU-bound HTML parsing and opportunity extraction.
+
+BeautifulSoup parsing and signal analysis hold the GIL, so running them on the
+graph's thread serializes concurrent leads. This module ships the raw response
+bytes to worker processes and gets back a compact result (a few hundred bytes
+instead of the full article text).
+
+Configuration (environment variables):
+    EXTRACTION_WORKERS: worker processes (0 = parse inline in the calling thread)
+    EXTRACTION_MAX_PENDING: max articles queued or in flight before submit() blocks
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agents.opportunity_signals import analyze_opportunity_text
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_MAX_PENDING = int(os.getenv("EXTRACTION_MAX_PENDING", "0")) or None
+
+# Content markers of job postings, which are skipped as news sources
+JOB_POSTING_MARKERS = ["apply now", "job description", "responsibilities:", "requirements:", "qualifications:"]
+
+
+def html_to_text(raw: bytes, encoding: Optional[str] = None) -> str:
+    """Parse an HTML document and return its visible text."""
+    from bs4 import BeautifulSoup
+
+    html = raw.decode(encoding or "utf-8", errors="replace")
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+
+def parse_and_extract(raw: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Worker entry point: parse an article and extract opportunity information.
+
+    Args:
+        raw: Raw HTTP response body
+        encoding: Response encoding, if known
+
+    Returns:
+        Compact dictionary with is_job_posting, text_chars and the fields of
+        analyze_opportunity_text (found, summary, details, opportunity_type(s))
+    """
+    text = html_to_text(raw, encoding)
+    lowered = text.lower()
+    result = {
+        "is_job_posting": any(marker in lowered for marker in JOB_POSTING_MARKERS),
+        "text_chars": len(text),
+    }
+    if result["is_job_posting"]:
+        result.update({"found": False, "summary": "", "details": "",
+                       "opportunity_type": "", "opportunity_types": []})
+    else:
+        result.update(analyze_opportunity_text(text))
+    return result
+
+
+class ExtractionPool:
+    """
+    Bounded process pool for parse_and_extract.
+
+    submit() blocks once `max_pending` articles are queued or running, so a
+    fast producer (many concurrent leads fetching pages) cannot pile up
+    unbounded raw HTML in memory. asubmit() is the event-loop variant: it
+    waits for a slot and for the result without blocking the loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = EXTRACTION_WORKERS if max_workers is None else max_workers
+        self.max_pending = max_pending or EXTRACTION_MAX_PENDING or max(1, self.max_workers) * 4
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def submit(self, raw: bytes, encoding: Optional[str] = None) -> "Future[Dict[str, Any]]":
+        """Queue one article for extraction, blocking while the pool is saturated."""
+        if self.max_workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(parse_and_extract(raw, encoding))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._slots.acquire()
+        try:
+            future = self._get_executor().submit(parse_and_extract, raw, encoding)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def asubmit(self, raw: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Extract one article from a coroutine, awaiting a free slot and the result."""
+        if self.max_workers <= 0:
+            return parse_and_extract(raw, encoding)
+
+        # Only park a thread on the semaphore when the pool is actually saturated
+        if not self._slots.acquire(blocking=False):
+            acquiring = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+            try:
+                await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # The thread still takes the slot once one frees up; give it back then
+                acquiring.add_done_callback(lambda _: self._slots.release())
+                raise
+        try:
+            future = self._get_executor().submit(parse_and_extract, raw, encoding)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def map(self, documents: Iterable[Tuple[bytes, Optional[str]]]) -> List[Dict[str, Any]]:
+        """Extract many (raw, encoding) documents, preserving input order."""
+        futures = [self.submit(raw, encoding) for raw, encoding in documents]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return the process-wide extraction pool (created on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool()
+        return _pool
+
+
+def shutdown_extraction_pool():
+    """Stop the process-wide pool's workers, if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,114 @@
+# agents/freshness.py
+"""
+Freshness policies for stored enrichment results.
+
+Company metadata such as the industry or headquarters changes rarely, while
+news and LinkedIn posts go stale within days. Every enriched field has a
+TTL, and a stored result keeps the time each field was last fetched
+(fetched_at: epoch seconds per field). A field older than its TTL, or never
+fetched, is stale.
+
+Fields are refreshed by re-running the pipeline stage that produces them:
+
+    metadata  - the metadata agent (browsing and extraction); only its stale
+                fields take the new values, fresh ones keep the stored ones
+    news      - the opportunity agent's news crawl, and the scoring signals
+                drawn from it
+    linkedin  - the opportunity agent's LinkedIn posts
+
+The opportunity analysis is redone when news or LinkedIn is refreshed, and
+the lead is always re-scored and re-routed after a refresh.
+
+Configuration (environment variables):
+    FRESHNESS_TTL_<FIELD>: TTL of a field in hours, e.g. FRESHNESS_TTL_NEWS=12
+"""
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Default TTL per field, in seconds
+FIELD_TTLS = {
+    "industry": 180 * DAY,
+    "headquarters_location": 180 * DAY,
+    "company_size": 90 * DAY,
+    "annual_revenue": 90 * DAY,
+    "company_culture": 90 * DAY,
+    "products_services": 60 * DAY,
+    "technologies": 30 * DAY,
+    "strategic_focus": 30 * DAY,
+    "data_confidence": 30 * DAY,
+    "news": 2 * DAY,
+    "linkedin": 3 * DAY,
+}
+
+# Fields each pipeline stage produces
+STAGE_FIELDS = {
+    "metadata": [
+        "industry", "headquarters_location", "company_size", "annual_revenue", "company_culture",
+        "products_services", "technologies", "strategic_focus", "data_confidence",
+    ],
+    "news": ["news"],
+    "linkedin": ["linkedin"],
+}
+
+
+def field_ttl(field: str) -> float:
+    """TTL of a field in seconds, from FRESHNESS_TTL_<FIELD> or FIELD_TTLS."""
+    override = os.getenv(f"FRESHNESS_TTL_{field.upper()}")
+    if override:
+        return float(override) * HOUR
+    return FIELD_TTLS[field]
+
+
+def expand_fields(names: Iterable[str]) -> List[str]:
+    """
+    Fields named directly or through their stage (e.g. "metadata").
+
+    Raises:
+        ValueError: If a name is neither a field nor a stage
+    """
+    fields: List[str] = []
+    for name in names:
+        expanded = STAGE_FIELDS.get(name) or ([name] if name in FIELD_TTLS else None)
+        if expanded is None:
+            raise ValueError(f"Unknown field or stage {name!r}, expected one of {list(FIELD_TTLS)} "
+                             f"or {list(STAGE_FIELDS)}")
+        fields.extend(field for field in expanded if field not in fields)
+    return fields
+
+
+def stale_fields(fetched_at: Dict[str, float], now: Optional[float] = None) -> List[str]:
+    """Fields older than their TTL or never fetched."""
+    now = time.time() if now is None else now
+    return [field for field in FIELD_TTLS if now - (fetched_at.get(field) or 0) >= field_ttl(field)]
+
+
+def stages_to_refresh(fields: Iterable[str]) -> List[str]:
+    """Stages that have to run again to refresh the given fields."""
+    fields = set(fields)
+    return [stage for stage, stage_fields in STAGE_FIELDS.items() if fields.intersection(stage_fields)]
+
+
+def mark_fetched(fetched_at: Dict[str, float], fields: Iterable[str], now: Optional[float] = None) -> Dict[str, float]:
+    """fetched_at with the given fields stamped now (the rest unchanged)."""
+    now = time.time() if now is None else now
+    return {**fetched_at, **{field: now for field in fields}}
+
+
+def freshness_report(fetched_at: Dict[str, float], now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """Per field: when it was fetched, its age and TTL in hours, and whether it is stale."""
+    now = time.time() if now is None else now
+    report = {}
+    for field in FIELD_TTLS:
+        fetched = fetched_at.get(field)
+        ttl = field_ttl(field)
+        report[field] = {
+            "fetched_at": fetched,
+            "age_hours": None if fetched is None else round((now - fetched) / HOUR, 1),
+            "ttl_hours": round(ttl / HOUR, 1),
+            "stale": fetched is None or now - fetched >= ttl,
+        }
+    return report
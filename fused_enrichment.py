@@ -0,0 +1,109 @@
+# agents/fused_enrichment.py
+"""
+Fused metadata + scoring agent (opt-in, for high-volume backfills).
+
+The default pipeline makes one LLM call to extract CompanyMetadata from the
+browsed company data and, in llm/compare scoring modes, a second one to
+score that metadata. Scoring only consumes the metadata output, so this
+agent asks for both in a single structured response:
+
+    {"metadata": {...CompanyMetadata...}, "score": {...IcpScore...}}
+
+Both halves are validated against their schemas. If either fails, the lead
+falls back to the two-call path (metadata_enrichment_node on the same
+browsed data, then the regular scoring agent), so a bad response costs one
+extra call instead of a bad lead.
+
+The opportunity agent must run first: its opportunity_signals are part of
+the scoring input.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from agents import prompts
+from agents.llm_gateway import chat_completion
+from agents.metadata_enrichment_agent import (
+    CompanyMetadata,
+    MetadataEnrichmentState,
+    apply_infobox,
+    metadata_enrichment_node,
+    metadata_web_browsing_node,
+)
+from agents.model_policy import run_tiered
+from agents.prompt_builder import PromptBuilder
+from agents.scoring_agent import IcpScore, extract_json_text, scoring_instructions
+
+
+@lru_cache(maxsize=1)
+def fused_instructions() -> str:
+    """Static prompt: metadata extraction, scoring rubric and the combined output format"""
+    return "\n\n".join([
+        prompts.METADATA_ENRICHMENT_PROMPT.strip(),
+        scoring_instructions(),
+        prompts.FUSED_ENRICHMENT_PROMPT.strip(),
+    ])
+
+
+def parse_fused_response(content: str) -> Optional[Dict[str, Any]]:
+    """
+    Validate a fused response against CompanyMetadata and IcpScore
+
+    Returns:
+        {"metadata": {...}, "score": {...}}, or None if either half is invalid
+    """
+    try:
+        data = json.loads(extract_json_text(content, "{", "}"))
+        metadata = CompanyMetadata.model_validate(data["metadata"])
+        score = IcpScore.model_validate(data["score"])
+    except (json.JSONDecodeError, KeyError, TypeError, ValidationError) as e:
+        print(f"⚠️ Fused response failed validation: {type(e).__name__}: {str(e)[:200]}")
+        return None
+    return {"metadata": metadata.model_dump(), "score": score.model_dump()}
+
+
+async def arun_fused_enrichment(company_name: str, opportunity_signals: List[str]) -> Dict[str, Any]:
+    """
+    Extract company metadata and score it in one LLM call
+
+    Args:
+        company_name: Name of the company to enrich
+        opportunity_signals: Opportunity types found by the opportunity agent
+
+    Returns:
+        Dictionary with the CompanyMetadata fields, score (validated LLM
+        score data, or None if the fused call failed and the metadata came
+        from the two-call fallback) and fused (whether one call sufficed)
+    """
+    state = await metadata_web_browsing_node(MetadataEnrichmentState(inbound_lead=company_name))
+
+    messages = (PromptBuilder("fused")
+                .static(fused_instructions())
+                .data("Company Data", state.browsed_metadata)
+                .data("opportunity_signals", opportunity_signals)
+                .build())
+
+    async def call_model(model: str) -> Optional[Dict[str, Any]]:
+        content = await chat_completion(agent="fused", model=model, messages=messages, temperature=0)
+        return parse_fused_response(content)
+
+    # A response that fails validation escalates (MODEL_POLICY_FUSED, large by default)
+    try:
+        fused = await run_tiered("fused", call_model, lambda result: None)
+    except Exception as e:
+        print(f"⚠️ Fused enrichment call failed: {str(e)}")
+        fused = None
+
+    if fused is not None:
+        metadata = apply_infobox(CompanyMetadata.model_validate(fused["metadata"]), state.wiki_infobox)
+        fused["metadata"] = metadata.model_dump()
+        print(f"✅ Fused enrichment: metadata and ICP score ({fused['score']['score']}) in one call")
+        return {**fused["metadata"], "score": fused["score"], "fused": True}
+
+    # Two-call fallback: metadata now (same browsed data), scoring by the caller
+    print("↩️ Falling back to separate metadata and scoring calls")
+    state = await metadata_enrichment_node(state)
+    metadata = {field: getattr(state, field) for field in CompanyMetadata.model_fields}
+    return {**metadata, "score": None, "fused": False}
@@ -0,0 +1,228 @@
+# agents/icp_scoring_engine.py
+"""
+Deterministic ICP scoring engine.
+
+Computes the 100-point icp_score and its per-dimension breakdown directly from
+the load_icp_criteria() point tables, following the rules of
+LEAD_SCORING_PROMPT:
+
+- industry: best matching target industry, 5 points minimum
+- company_size: employee count (midpoint of a range) mapped to a size band
+- technologies / strategic_focus: sum of matching entries, capped, 3 minimum
+- location: best matching target location, 2 points minimum
+- opportunities: sum of matching opportunity signals, capped, 5 minimum
+
+Table entries match lead values case-insensitively on whole words, in either
+direction ("AI" in strategic focus matches "AI innovation", "Redmond,
+Washington, U.S." matches "Washington" and "U.S.").
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Minimum points per dimension ("prevents overly harsh penalties")
+DIMENSION_MINIMUMS = {
+    "industry": 5,
+    "technologies": 3,
+    "strategic_focus": 3,
+    "location": 2,
+    "opportunities": 5,
+}
+
+_NUMBER = r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*([kKmM](?![a-zA-Z]))?"
+_SIZE_RANGE = re.compile(_NUMBER + r"\s*(?:-|–|to)\s*" + _NUMBER)
+_SIZE_VALUE = re.compile(_NUMBER)
+
+
+def _to_count(number: str, suffix: str) -> float:
+    value = float(number.replace(",", ""))
+    if suffix:
+        value *= 1_000 if suffix.lower() == "k" else 1_000_000
+    return value
+
+
+def parse_company_size(company_size: Any) -> Optional[int]:
+    """
+    Extract an employee count from a company_size value.
+
+    Handles integers and strings such as "228,000", "5,000+ employees",
+    "200-500" (midpoint), "10k" and "1.2M".
+
+    Returns:
+        Employee count, or None if no number is found
+    """
+    if isinstance(company_size, bool) or company_size is None:
+        return None
+    if isinstance(company_size, (int, float)):
+        return int(company_size)
+
+    text = str(company_size)
+    match = _SIZE_RANGE.search(text)
+    if match:
+        low = _to_count(match.group(1), match.group(2))
+        high = _to_count(match.group(3), match.group(4))
+        return int((low + high) / 2)
+    match = _SIZE_VALUE.search(text)
+    if match:
+        return int(_to_count(match.group(1), match.group(2)))
+    return None
+
+
+def _parse_size_band(band: str) -> Tuple[float, float]:
+    """Turn a company_size_ranges key ("500+", "200-499", "<50") into [low, high]."""
+    band = band.replace(",", "").strip()
+    if band.startswith("<"):
+        return 0, float(band[1:]) - 1
+    if band.endswith("+"):
+        return float(band[:-1]), float("inf")
+    low, _, high = band.partition("-")
+    return float(low), float(high or low)
+
+
+def _term_pattern(term: str) -> "re.Pattern[str]":
+    """Case-insensitive whole-word pattern (works for terms like "U.S." and "AI/ML")."""
+    return re.compile(r"(?<!\w)" + re.escape(term.lower()) + r"(?!\w)")
+
+
+class IcpScoringEngine:
+    """Scores enriched leads against a fixed ICP criteria table."""
+
+    def __init__(self, criteria: Dict[str, Any]):
+        self.criteria = criteria
+        self.max_points = {
+            dimension: config["max_points"]
+            for dimension, config in criteria["scoring_breakdown"].items()
+        }
+        self.industries = self._compile(criteria["target_industries"])
+        self.technologies = self._compile(criteria["target_technologies"])
+        self.focus_areas = self._compile(criteria["strategic_focus_areas"])
+        self.opportunity_signals = self._compile(criteria["opportunity_signals"])
+        self.locations = self._compile(criteria["target_locations"])
+        self.size_bands = sorted(
+            ((_parse_size_band(band), points) for band, points in criteria["company_size_ranges"].items()),
+            key=lambda item: item[0][0],
+        )
+
+    @staticmethod
+    def _compile(table: Dict[str, int]) -> List[Tuple[str, "re.Pattern[str]", int]]:
+        return [(term, _term_pattern(term), points) for term, points in table.items()]
+
+    @staticmethod
+    def _matched_terms(table, values: Iterable[str]) -> List[Tuple[str, int]]:
+        """Table terms matching any lead value: term in value, or value in term."""
+        values = [str(v).strip().lower() for v in values if v and str(v).strip()]
+        value_patterns = [_term_pattern(value) for value in values]
+        matched = []
+        for term, pattern, points in table:
+            lowered = term.lower()
+            if any(pattern.search(value) for value in values) or \
+                    any(value_pattern.search(lowered) for value_pattern in value_patterns):
+                matched.append((term, points))
+        return matched
+
+    def _cap(self, dimension: str, points: int) -> int:
+        points = max(points, DIMENSION_MINIMUMS.get(dimension, 0))
+        return min(points, self.max_points[dimension])
+
+    def score_industry(self, industry: str) -> int:
+        matched = self._matched_terms(self.industries, [industry])
+        return self._cap("industry", max((points for _, points in matched), default=0))
+
+    def score_company_size(self, company_size: Any) -> int:
+        employees = parse_company_size(company_size)
+        if employees is None:
+            # Unknown size scores as the smallest band
+            return self._cap("company_size", self.size_bands[0][1])
+        points = self.size_bands[0][1]
+        for (low, high), band_points in self.size_bands:
+            if employees >= low:
+                points = band_points
+        return self._cap("company_size", points)
+
+    def score_technologies(self, technologies: List[str]) -> int:
+        matched = self._matched_terms(self.technologies, technologies or [])
+        return self._cap("technologies", sum(points for _, points in matched))
+
+    def score_strategic_focus(self, strategic_focus: List[str]) -> int:
+        matched = self._matched_terms(self.focus_areas, strategic_focus or [])
+        return self._cap("strategic_focus", sum(points for _, points in matched))
+
+    def score_location(self, location: str) -> int:
+        matched = self._matched_terms(self.locations, [location])
+        return self._cap("location", max((points for _, points in matched), default=0))
+
+    def score_opportunities(self, opportunity_signals: List[Any]) -> int:
+        signals = [s.get("type", "") if isinstance(s, dict) else s for s in opportunity_signals or []]
+        matched = self._matched_terms(self.opportunity_signals, signals)
+        return self._cap("opportunities", sum(points for _, points in matched))
+
+    def score(self, enriched_lead: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score an enriched lead.
+
+        Args:
+            enriched_lead: Enriched lead dictionary (industry, company_size,
+                headquarters_location, technologies, strategic_focus,
+                opportunity_signals, ...)
+
+        Returns:
+            Dictionary with score (0-100) and breakdown (points per dimension)
+        """
+        location = enriched_lead.get("headquarters_location") or ", ".join(enriched_lead.get("locations") or [])
+        breakdown = {
+            "industry": self.score_industry(enriched_lead.get("industry") or ""),
+            "company_size": self.score_company_size(enriched_lead.get("company_size")),
+            "technologies": self.score_technologies(enriched_lead.get("technologies")),
+            "strategic_focus": self.score_strategic_focus(enriched_lead.get("strategic_focus")),
+            "location": self.score_location(location),
+            "opportunities": self.score_opportunities(enriched_lead.get("opportunity_signals")),
+        }
+        return {"score": min(sum(breakdown.values()), 100), "breakdown": breakdown}
+
+    def upper_bound(self, enriched_lead: Dict[str, Any], unknown: Iterable[str] = ("opportunities",)) -> Dict[str, Any]:
+        """
+        Best score a lead can still reach while some dimensions are unknown.
+
+        Args:
+            enriched_lead: Enriched lead dictionary, as for score()
+            unknown: Dimensions not enriched yet, counted at their max points
+
+        Returns:
+            Dictionary with score (the bound) and breakdown
+        """
+        unknown = set(unknown)
+        breakdown = {
+            dimension: self.max_points[dimension] if dimension in unknown else points
+            for dimension, points in self.score(enriched_lead)["breakdown"].items()
+        }
+        return {"score": min(sum(breakdown.values()), 100), "breakdown": breakdown}
+
+    def summarize(self, result: Dict[str, Any]) -> str:
+        """One-line deterministic recommendation for a score result."""
+        breakdown = result["breakdown"]
+        strongest = sorted(
+            breakdown, key=lambda d: breakdown[d] / self.max_points[d], reverse=True
+        )[:2]
+        parts = ", ".join(f"{d} ({breakdown[d]}/{self.max_points[d]})" for d in strongest)
+        return f"ICP score {result['score']}/100 - strongest fit on {parts}."
+
+
+def compare_scores(engine_result: Dict[str, Any], llm_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Report where the engine and an LLM score disagree.
+
+    Returns:
+        Dictionary with both totals, their delta and the per-dimension
+        disagreements ({dimension: {"engine": x, "llm": y}})
+    """
+    llm_breakdown = llm_result.get("breakdown", {}) or {}
+    disagreements = {}
+    for dimension, points in engine_result["breakdown"].items():
+        llm_points = llm_breakdown.get(dimension)
+        if llm_points != points:
+            disagreements[dimension] = {"engine": points, "llm": llm_points}
+    return {
+        "engine_score": engine_result["score"],
+        "llm_score": llm_result.get("score"),
+        "score_delta": (llm_result.get("score") or 0) - engine_result["score"],
+        "disagreements": disagreements,
+    }
@@ -2,199 +2,306 @@
 LangGraph Multi-Agent Workflow for Lead Enrichment
 Integrates metadata enrichment, opportunity discovery, ICP scoring, and SDR routing
 """
-from typing import TypedDict, Dict, Any
-from langgraph.graph import StateGraph, END
+from typing import TYPE_CHECKING, TypedDict, Dict, Any, List, Optional, Annotated, Callable
+from functools import lru_cache
+import inspect
 import sys
 import os
+import time
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 # Import the new agents from teammate
-from agents.metadata_enrichment_agent import run_metadata_enrichment
-from agents.opportunity_enrichment_agent import run_opportunity_enrichment
-from agents.scoring_agent import score_lead_agent
-from agents.routing_agent import route_lead_agent
+from agents.metadata_enrichment_agent import (
+    arun_metadata_enrichment,
+    browse_company_metadata,
+    enrich_company_metadata,
+)
+from agents.opportunity_enrichment_agent import (
+    analyze_opportunities,
+    arun_opportunity_enrichment,
+    browse_linkedin_opportunities,
+    browse_news_opportunities,
+)
+from agents.scoring_agent import combine_scores, score_enriched_lead, score_lead_agent, score_upper_bound
+from agents.fused_enrichment import arun_fused_enrichment
+from agents.routing_agent import ROUTING_CONFIG, route_enriched_lead, route_lead_agent
+from agents.llm_metrics import get_metrics_registry, llm_run, summarize_records
+from agents.single_flight import coalesce_company
+from agents.freshness import STAGE_FIELDS, mark_fetched, stages_to_refresh
+from agents.tracing import trace, traced
+from agents.blob_store import get_blob_store
+
+if TYPE_CHECKING:
+    # langgraph (and langchain_core under it) is imported when a graph is first compiled
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.graph import StateGraph
+
+# Extract metadata and score it in one LLM call (opt-in, for backfills)
+PIPELINE_FUSED_ENRICHMENT = os.getenv("PIPELINE_FUSED_ENRICHMENT", "").lower() in ("1", "true", "yes")
+# Run the metadata and opportunity agents in parallel ("0" chains them)
+PIPELINE_PARALLEL_ENRICHMENT = os.getenv("PIPELINE_PARALLEL_ENRICHMENT", "1").lower() not in ("0", "false", "no")
+# Run the agents' steps as nodes of one graph instead of nesting their compiled subgraphs
+PIPELINE_FLAT_GRAPH = os.getenv("PIPELINE_FLAT_GRAPH", "").lower() in ("1", "true", "yes")
+# Check after metadata whether the lead can still reach the routing threshold, and skip the
+# opportunity agent and scoring if not (runs the metadata agent first instead of in parallel)
+PIPELINE_SCORE_PRUNING = os.getenv("PIPELINE_SCORE_PRUNING", "").lower() in ("1", "true", "yes")
+# Checkpoint runs after every step so a failed run can be resumed ("0" disables)
+PIPELINE_CHECKPOINTS = os.getenv("PIPELINE_CHECKPOINTS", "1").lower() not in ("0", "false", "no")
+# Keep the checkpoints of completed runs (by default they are deleted once a run succeeds)
+PIPELINE_KEEP_CHECKPOINTS = os.getenv("PIPELINE_KEEP_CHECKPOINTS", "").lower() in ("1", "true", "yes")
+
+# Leads scoring below this are not routed
+ROUTING_SCORE_THRESHOLD = ROUTING_CONFIG["min_score_threshold"]
+
+
+# State reducers: the parallel enrichment branches update the same keys in one step
+def merge_dicts(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """enriched_lead: merge each branch's fields instead of replacing the dict"""
+    return {**(current or {}), **(update or {})}
+
+
+def merge_errors(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """error: keep every branch's error (an update never clears one)"""
+    if not update or update == current:
+        return current
+    if not current:
+        return update
+    if update in current.split("; "):
+        return current
+    return f"{current}; {update}"
+
+
+class StageFailed(Exception):
+    """A pipeline stage reported an error; stops a checkpointed run at its last successful step"""
+
+
+def halt_on_error(node: Callable) -> Callable:
+    """
+    Wrap a node so that a new error in its update raises StageFailed
+    
+    Nodes report failures in the error key and let the pipeline carry on.
+    In a checkpointed graph the run stops instead: the failed node's update
+    is discarded, the checkpoint keeps everything before it, and a resume
+    re-runs just that node.
+    """
+    async def run(state: Dict[str, Any]) -> Dict[str, Any]:
+        # Read before the call: some nodes set the error on the state they were given
+        previous_error = state.get("error")
+        update = node(state)
+        if inspect.isawaitable(update):
+            update = await update
+        error = (update or {}).get("error")
+        if error and error != previous_error:
+            raise StageFailed(error)
+        return update
+    
+    run.__name__ = node.__name__
+    return run
 
 
 # Define the State structure for our multi-agent system
 class LeadProcessingState(TypedDict):
-    """State that flows through the agent workflow"""
+    """
+    State that flows through the agent workflow
+    
+    Each piece of data is held once: the metadata agent's fields and the
+    opportunity signals live only in enriched_lead, and the crawled news and
+    LinkedIn payloads are kept in the blob store (agents.blob_store), the
+    state holding their refs. Every node update and checkpoint stays small.
+    """
     inbound_lead: Dict[str, Any]
-    enriched_lead: Dict[str, Any]
-    
-    # Fields from metadata enrichment agent
-    industry: str
-    company_size: str
-    locations: list
-    technologies: list
-    products_services: list
-    strategic_focus: list
-    company_culture: str
-    data_confidence: str
-    
-    # Fields from opportunity enrichment agent
+    
+    # Fields from metadata enrichment agent, plus opportunity_signals (scoring input)
+    enriched_lead: Annotated[Dict[str, Any], merge_dicts]
+    
+    # Fields from opportunity enrichment agent: the analysis, and refs of the
+    # browsed news items and LinkedIn posts (None until browsed)
     enrichment_opportunity: str
-    browsed_opportunity_from_news: list
-    browsed_opportunity_from_linkedin: Dict[str, Any]
+    news_ref: Optional[str]
+    linkedin_ref: Optional[str]
     
     # Fields from scoring agent
     icp_score: int
     score_breakdown: Dict[str, Any]
     score_recommendation: str
     
+    # Score pruning: best reachable score after metadata, and whether the lead was pruned
+    score_upper_bound: Optional[int]
+    pruned: bool
+    
     # Fields from routing agent
     assigned_rep: str
     rep_email: str
     routing_reason: str
     
-    error: str | None
+    error: Annotated[str | None, merge_errors]
+
+
+class FlatLeadProcessingState(LeadProcessingState):
+    """LeadProcessingState plus the intermediate results the agents' subgraphs keep to themselves"""
+    # Ref of the metadata agent's browsed text and Wikipedia infobox
+    browsed_metadata_ref: Optional[str]
+    score_comparison: Dict[str, Any]
+    
+    # Incremental re-enrichment (refresh_lead_pipeline): the fields to refresh (None in a full run),
+    # when each stored field was fetched, and the stored lead's database id
+    refresh_fields: Optional[List[str]]
+    fetched_at: Dict[str, float]
+    stored_lead_id: Optional[int]
+
+
+def metadata_update(metadata_result: Dict[str, Any]) -> Dict[str, Any]:
+    """State update with the enriched_lead fields built from the metadata agent's result"""
+    locations = metadata_result.get("locations", [])
+    # Merged into state by merge_dicts
+    return {"enriched_lead": {
+        "industry": metadata_result.get("industry", ""),
+        "company_size": metadata_result.get("company_size", ""),
+        "headquarters_location": ", ".join(locations) if locations else "",
+        "technologies": metadata_result.get("technologies", []),
+        "products_services": metadata_result.get("products_services", []),
+        "strategic_focus": metadata_result.get("strategic_focus", []),
+        "company_culture": metadata_result.get("company_culture", ""),
+        "data_confidence": metadata_result.get("data_confidence", ""),
+        "annual_revenue": ""  # Not provided by metadata agent - scoring agent will handle empty value
+    }}
+
+
+def print_metadata(metadata_result: Dict[str, Any]):
+    print(f"✅ Metadata enriched: Industry={metadata_result.get('industry', '')}, "
+          f"Size={metadata_result.get('company_size', '')}, Locations={len(metadata_result.get('locations', []))}")
+
+
+def opportunity_signals_from_news(news: list) -> list:
+    """
+    Opportunity signals for scoring from the ranked multi-label
+    opportunity_types of each news item (primary type first)
+    """
+    opportunity_signals = []
+    for news_item in news:
+        opp_types = [t["type"] for t in news_item.get("opportunity_types", [])]
+        if not opp_types and news_item.get("opportunity_type", ""):
+            opp_types = [news_item["opportunity_type"]]
+        for opp_type in opp_types:
+            if opp_type not in opportunity_signals:
+                opportunity_signals.append(opp_type)
+    return opportunity_signals
 
 
 # Define agent nodes
-def metadata_node(state: LeadProcessingState) -> LeadProcessingState:
+@traced("metadata_enrichment", kind="node")
+async def metadata_node(state: LeadProcessingState) -> Dict[str, Any]:
     """Node 1: Metadata Enrichment Agent
     
-    Runs the metadata enrichment workflow and populates state with company metadata.
-    The enriched fields are stored both as individual fields (for scoring/routing)
-    and as enriched_lead dict (for backward compatibility).
+    Runs the metadata enrichment workflow and populates enriched_lead with
+    company metadata (read by the scoring and routing agents).
+    
+    Runs in parallel with the opportunity agent, so it returns only the keys it
+    updates (never the whole state).
     """
     print("\n🔍 [AGENT 1/4] Metadata Enrichment Agent...")
     try:
         company_name = state["inbound_lead"].get("company", "")
         if not company_name:
-            state["error"] = "No company name provided"
-            return state
-        
-        # Run the metadata enrichment workflow
-        metadata_result = run_metadata_enrichment(company_name)
+            return {"error": "No company name provided"}
         
-        # Store individual fields in state (for scoring and routing agents)
-        state["industry"] = metadata_result.get("industry", "")
-        state["company_size"] = metadata_result.get("company_size", "")
-        state["locations"] = metadata_result.get("locations", [])
-        state["technologies"] = metadata_result.get("technologies", [])
-        state["products_services"] = metadata_result.get("products_services", [])
-        state["strategic_focus"] = metadata_result.get("strategic_focus", [])
-        state["company_culture"] = metadata_result.get("company_culture", "")
-        state["data_confidence"] = metadata_result.get("data_confidence", "")
-        
-        # Also build enriched_lead dict for backward compatibility
-        state["enriched_lead"] = {
-            "industry": state["industry"],
-            "company_size": state["company_size"],
-            "headquarters_location": ", ".join(state["locations"]) if state["locations"] else "",
-            "technologies": state["technologies"],
-            "products_services": state["products_services"],
-            "strategic_focus": state["strategic_focus"],
-            "company_culture": state["company_culture"],
-            "data_confidence": state["data_confidence"],
-            "annual_revenue": ""  # Not provided by metadata agent - scoring agent will handle empty value
-        }
+        # Run the metadata enrichment workflow (shared with concurrent leads from the same company)
+        metadata_result = await coalesce_company(
+            "metadata", company_name, lambda: arun_metadata_enrichment(company_name)
+        )
         
-        print(f"✅ Metadata enriched: Industry={state['industry']}, Size={state['company_size']}, Locations={len(state['locations'])}")
+        print_metadata(metadata_result)
+        return metadata_update(metadata_result)
         
     except Exception as e:
         print(f"❌ Metadata enrichment error: {str(e)}")
-        state["error"] = f"Metadata enrichment failed: {str(e)}"
-    
-    return state
+        return {"error": f"Metadata enrichment failed: {str(e)}"}
 
 
-def opportunity_node(state: LeadProcessingState) -> LeadProcessingState:
+@traced("opportunity_enrichment", kind="node")
+async def opportunity_node(state: LeadProcessingState) -> Dict[str, Any]:
     """Node 2: Opportunity Enrichment Agent
     
     Runs the opportunity enrichment workflow to find business opportunities
     from news and LinkedIn posts.
+    
+    Runs in parallel with the metadata agent, so it returns only the keys it
+    updates (never the whole state).
     """
     print("\n💼 [AGENT 2/4] Opportunity Enrichment Agent...")
     try:
         company_name = state["inbound_lead"].get("company", "")
         if not company_name:
-            state["error"] = "No company name provided"
-            return state
-        
-        # Run the opportunity enrichment workflow
-        opportunity_result = run_opportunity_enrichment(company_name)
+            return {"error": "No company name provided"}
         
-        # Store opportunity fields in state
-        state["enrichment_opportunity"] = opportunity_result.get("enrichment_opportunity", "")
-        state["browsed_opportunity_from_news"] = opportunity_result.get("browsed_opportunity_from_news", [])
-        state["browsed_opportunity_from_linkedin"] = opportunity_result.get("browsed_opportunity_from_linkedin", {})
+        # Run the opportunity enrichment workflow (shared with concurrent leads from the same company)
+        opportunity_result = await coalesce_company(
+            "opportunity", company_name, lambda: arun_opportunity_enrichment(company_name)
+        )
         
-        # Extract opportunity signals for scoring (from news opportunity_type fields)
-        opportunity_signals = []
-        for news_item in state["browsed_opportunity_from_news"]:
-            opp_type = news_item.get("opportunity_type", "")
-            if opp_type:
-                opportunity_signals.append(opp_type)
+        # Opportunity fields for state
+        news = opportunity_result.get("browsed_opportunity_from_news", [])
+        linkedin = opportunity_result.get("browsed_opportunity_from_linkedin", {})
         
-        # Add opportunity signals to enriched_lead for scoring agent
-        state["enriched_lead"]["opportunity_signals"] = opportunity_signals
+        opportunity_signals = opportunity_signals_from_news(news)
         
-        news_count = len(state["browsed_opportunity_from_news"])
-        linkedin_count = len(state["browsed_opportunity_from_linkedin"].get("recent_posts", []))
+        news_count = len(news)
+        linkedin_count = len(linkedin.get("recent_posts", []))
         print(f"✅ Opportunities found: {news_count} news items, {linkedin_count} LinkedIn posts")
         print(f"✅ Opportunity signals for scoring: {opportunity_signals[:5]}...")  # Show first 5
         
+        blobs = get_blob_store()
+        return {
+            "enrichment_opportunity": opportunity_result.get("enrichment_opportunity", ""),
+            "news_ref": blobs.put(news),
+            "linkedin_ref": blobs.put(linkedin),
+            # Add opportunity signals to enriched_lead for scoring agent (merged by merge_dicts)
+            "enriched_lead": {"opportunity_signals": opportunity_signals},
+        }
+        
     except Exception as e:
         print(f"❌ Opportunity enrichment error: {str(e)}")
-        state["error"] = f"Opportunity enrichment failed: {str(e)}"
-    
-    return state
+        return {"error": f"Opportunity enrichment failed: {str(e)}"}
 
 
-def scoring_node(state: LeadProcessingState) -> LeadProcessingState:
+@traced("icp_scoring", kind="node")
+async def scoring_node(state: LeadProcessingState) -> Dict[str, Any]:
     """Node 3: ICP Scoring Agent
     
     Scores the lead against ICP criteria using the metadata from the enrichment agent.
-    The scoring agent will automatically build enriched_lead from state fields if needed.
+    Returns only the scoring fields (the agent is given just enriched_lead).
     """
     print("\n🎯 [AGENT 3/4] ICP Scoring Agent...")
     try:
-        # Call the async score_lead_agent
-        # The agent will use the metadata fields from state (industry, company_size, locations)
-        import asyncio
-        if asyncio.iscoroutinefunction(score_lead_agent):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(score_lead_agent(state))
-            loop.close()
-        else:
-            result = score_lead_agent(state)
+        # Await the async score_lead_agent on the pipeline's own event loop
+        result = await score_lead_agent({"enriched_lead": state["enriched_lead"]})
         
         score = result.get('icp_score', 0)
         breakdown = result.get('score_breakdown', {})
         print(f"✅ ICP Score: {score}/90")
         print(f"   Breakdown: Industry={breakdown.get('industry', 0)}, Size={breakdown.get('company_size', 0)}, Revenue={breakdown.get('annual_revenue', 0)}, Location={breakdown.get('location', 0)}")
-        return result
+        return {key: result[key] for key in ("icp_score", "score_breakdown", "score_recommendation",
+                                             "score_comparison", "enriched_lead") if key in result}
         
     except Exception as e:
         print(f"❌ Scoring error: {str(e)}")
-        state["error"] = f"Scoring failed: {str(e)}"
-        state["icp_score"] = 0
-        return state
+        return {"error": f"Scoring failed: {str(e)}", "icp_score": 0}
 
 
-def routing_node(state: LeadProcessingState) -> LeadProcessingState:
+@traced("sdr_routing", kind="node")
+async def routing_node(state: LeadProcessingState) -> Dict[str, Any]:
     """Node 4: SDR Routing Agent
     
     Routes the lead to an appropriate sales rep based on the ICP score and metadata.
-    The routing agent will use the enriched_lead and icp_score from previous agents.
+    Returns only the routing fields (the agent is given enriched_lead and icp_score).
     """
     print("\n👤 [AGENT 4/4] SDR Routing Agent...")
     try:
-        # Call the async route_lead_agent
-        # The agent will use enriched_lead and icp_score from state
-        import asyncio
-        if asyncio.iscoroutinefunction(route_lead_agent):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(route_lead_agent(state))
-            loop.close()
-        else:
-            result = route_lead_agent(state)
+        # Await the async route_lead_agent on the pipeline's own event loop
+        result = await route_lead_agent({"enriched_lead": state["enriched_lead"], "icp_score": state["icp_score"]})
         
         rep = result.get('assigned_rep', 'Unassigned')
         rep_email = result.get('rep_email', '')
@@ -203,13 +310,48 @@ def routing_node(state: LeadProcessingState) -> LeadProcessingState:
         if rep_email:
             print(f"   Email: {rep_email}")
         print(f"   Reason: {reason}")
-        return result
+        return {"assigned_rep": rep, "rep_email": rep_email, "routing_reason": reason}
         
     except Exception as e:
         print(f"❌ Routing error: {str(e)}")
-        state["error"] = f"Routing failed: {str(e)}"
-        state["assigned_rep"] = "Unassigned - Error"
-        return state
+        return {"error": f"Routing failed: {str(e)}", "assigned_rep": "Unassigned - Error"}
+
+
+@traced("fused_enrichment", kind="node")
+async def fused_enrichment_node(state: LeadProcessingState) -> LeadProcessingState:
+    """Fused mode: Metadata Enrichment + ICP Scoring in one LLM call
+    
+    Runs after the opportunity agent, whose opportunity signals are part of the
+    scoring input. Falls back to the separate metadata and scoring calls when
+    the fused response does not validate.
+    """
+    print("\n🔗 [AGENT 2-3/4] Fused Metadata Enrichment + ICP Scoring...")
+    try:
+        company_name = state["inbound_lead"].get("company", "")
+        if not company_name:
+            state["error"] = "No company name provided"
+            return state
+        
+        opportunity_signals = state.get("enriched_lead", {}).get("opportunity_signals", [])
+        fused_result = await arun_fused_enrichment(company_name, opportunity_signals)
+        update = metadata_update(fused_result)
+        update["enriched_lead"] = merge_dicts(state.get("enriched_lead", {}), update["enriched_lead"])
+        state.update(update)
+        print_metadata(fused_result)
+        
+        if fused_result["score"] is None:
+            state.update(await scoring_node(state))
+            return state
+        
+        state.update(combine_scores(state["enriched_lead"], fused_result["score"]))
+        print(f"✅ ICP Score: {state['icp_score']}/100")
+        
+    except Exception as e:
+        print(f"❌ Fused enrichment error: {str(e)}")
+        state["error"] = f"Fused enrichment failed: {str(e)}"
+        state["icp_score"] = 0
+    
+    return state
 
 
 # Conditional edge function
@@ -220,47 +362,296 @@ def should_route_lead(state: LeadProcessingState) -> str:
     """
     score = state.get('icp_score', 0)
     
-    if score >= 60:
-        print(f"✅ Score {score} meets threshold (60+) → Routing to SDR")
+    if score >= ROUTING_SCORE_THRESHOLD:
+        print(f"✅ Score {score} meets threshold ({ROUTING_SCORE_THRESHOLD}+) → Routing to SDR")
         return "route"
     else:
-        print(f"⚠️ Score {score} below threshold (60) → Skipping routing")
+        print(f"⚠️ Score {score} below threshold ({ROUTING_SCORE_THRESHOLD}) → Skipping routing")
         return "skip_routing"
 
 
-def mark_unqualified(state: LeadProcessingState) -> LeadProcessingState:
+@traced("mark_unqualified", kind="node")
+def mark_unqualified(state: LeadProcessingState) -> Dict[str, Any]:
     """Mark lead as unqualified if score too low"""
-    state['assigned_rep'] = "Unassigned - Score Too Low"
-    state['rep_email'] = ""
-    state['routing_reason'] = f"Lead score ({state.get('icp_score', 0)}) is below minimum threshold of 60"
-    return state
+    return {
+        "assigned_rep": "Unassigned - Score Too Low",
+        "rep_email": "",
+        "routing_reason": f"Lead score ({state.get('icp_score', 0)}) is below minimum threshold of {ROUTING_SCORE_THRESHOLD}",
+    }
+
+
+@traced("score_bound", kind="node")
+def score_bound_node(state: LeadProcessingState) -> Dict[str, Any]:
+    """Score pruning: best ICP score the lead can reach with maximum opportunity points"""
+    bound = score_upper_bound(state["enriched_lead"])
+    if bound is not None:
+        print(f"📐 Best possible ICP score after metadata: {bound}/100")
+    return {"score_upper_bound": bound}
+
+
+def should_prune_lead(state: LeadProcessingState) -> str:
+    """
+    Conditional edge after the bound check: prune the lead if even maximum
+    opportunity points cannot lift it to the routing threshold
+    (never after a metadata error, whose empty fields prove nothing)
+    """
+    bound = state.get("score_upper_bound")
+    if state.get("error") or bound is None or bound >= ROUTING_SCORE_THRESHOLD:
+        return "continue"
+    print(f"✂️ Best possible score {bound} is below threshold ({ROUTING_SCORE_THRESHOLD}) → Skipping opportunity enrichment and scoring")
+    return "prune"
+
+
+@traced("mark_pruned", kind="node")
+def mark_pruned(state: LeadProcessingState) -> Dict[str, Any]:
+    """Mark a pruned lead as unqualified, with the engine score of its metadata alone"""
+    bound = state["score_upper_bound"]
+    result = combine_scores(state["enriched_lead"], None, "engine")
+    reason = (f"Pruned after metadata enrichment: best possible score ({bound}, with maximum opportunity "
+              f"points) is below minimum threshold of {ROUTING_SCORE_THRESHOLD}")
+    return {
+        **result,
+        "score_recommendation": reason,
+        "pruned": True,
+        "assigned_rep": "Unassigned - Score Too Low",
+        "rep_email": "",
+        "routing_reason": reason,
+    }
+
+
+def stage_is_fresh(state: FlatLeadProcessingState, stage: str) -> bool:
+    """Whether a refresh run reuses the stored results of `stage` (never in a full run)"""
+    refresh_fields = state.get("refresh_fields")
+    return refresh_fields is not None and stage not in stages_to_refresh(refresh_fields)
+
+
+def fetched_fields(state: Dict[str, Any]) -> List[str]:
+    """Fields a finished run fetched: the refreshed ones, or every stage's unless the lead was pruned"""
+    if state.get("refresh_fields") is not None:
+        return state["refresh_fields"]
+    stages = ["metadata"] if state.get("pruned") else list(STAGE_FIELDS)
+    return [field for stage in stages for field in STAGE_FIELDS[stage]]
+
+
+# Flat graph nodes: each runs one agent step on the shared state and returns
+# only the keys it updates (no per-agent state model, no subgraph invocation).
+# In a refresh run, the steps of fresh stages return nothing and their stored
+# results (in the initial state) are kept.
+@traced("metadata_browsing", kind="node")
+async def metadata_browsing_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Metadata agent, step 1: LinkedIn and Wikipedia browsing (kept in the blob store)"""
+    print("\n🔍 [AGENT 1/4] Metadata Enrichment Agent...")
+    if stage_is_fresh(state, "metadata"):
+        print("♻️  Reusing stored company metadata (still fresh)")
+        return {}
+    company_name = state["inbound_lead"].get("company", "")
+    if not company_name:
+        return {"error": "No company name provided"}
+    browsed = await coalesce_company(
+        "metadata_browsing", company_name, lambda: browse_company_metadata(company_name)
+    )
+    return {"browsed_metadata_ref": get_blob_store().put(browsed)}
+
+
+@traced("metadata_enrichment", kind="node")
+async def metadata_enrichment_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Metadata agent, step 2: structured metadata from the browsed text (only the stale fields in a refresh)"""
+    company_name = state["inbound_lead"].get("company", "")
+    if not company_name or stage_is_fresh(state, "metadata"):
+        return {}
+    try:
+        browsed = get_blob_store().get(state.get("browsed_metadata_ref"), {})
+        metadata = await coalesce_company(
+            "metadata_extraction", company_name,
+            lambda: enrich_company_metadata(company_name, browsed.get("browsed_metadata"), browsed.get("wiki_infobox")),
+        )
+        metadata_result = metadata.model_dump()
+        print_metadata(metadata_result)
+        update = metadata_update(metadata_result)
+        if state.get("refresh_fields") is not None:
+            # Fresh fields keep their stored values
+            stale = set(state["refresh_fields"])
+            update["enriched_lead"] = {key: value for key, value in update["enriched_lead"].items() if key in stale}
+        return update
+    except Exception as e:
+        print(f"❌ Metadata enrichment error: {str(e)}")
+        return {"error": f"Metadata enrichment failed: {str(e)}"}
+
+
+@traced("news_browsing", kind="node")
+async def news_browsing_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Opportunity agent, news branch: news opportunities and the scoring signals drawn from them"""
+    print("\n💼 [AGENT 2/4] Opportunity Enrichment Agent...")
+    if stage_is_fresh(state, "news"):
+        print("♻️  Reusing stored news opportunities (still fresh)")
+        return {}
+    company_name = state["inbound_lead"].get("company", "")
+    if not company_name:
+        return {"error": "No company name provided"}
+    try:
+        news = await coalesce_company(
+            "opportunity_news", company_name, lambda: browse_news_opportunities(company_name)
+        )
+        opportunity_signals = opportunity_signals_from_news(news)
+        print(f"✅ Opportunities found: {len(news)} news items")
+        print(f"✅ Opportunity signals for scoring: {opportunity_signals[:5]}...")  # Show first 5
+        return {"news_ref": get_blob_store().put(news), "enriched_lead": {"opportunity_signals": opportunity_signals}}
+    except Exception as e:
+        print(f"❌ Opportunity enrichment error: {str(e)}")
+        return {"error": f"Opportunity enrichment failed: {str(e)}"}
+
+
+@traced("linkedin_browsing", kind="node")
+async def linkedin_browsing_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Opportunity agent, LinkedIn branch: recent company posts"""
+    company_name = state["inbound_lead"].get("company", "")
+    if not company_name:
+        return {}
+    if stage_is_fresh(state, "linkedin"):
+        print("♻️  Reusing stored LinkedIn posts (still fresh)")
+        return {}
+    try:
+        linkedin = await coalesce_company(
+            "opportunity_linkedin", company_name, lambda: browse_linkedin_opportunities(company_name)
+        )
+        print(f"✅ Opportunities found: {len(linkedin.get('recent_posts', []))} LinkedIn posts")
+        return {"linkedin_ref": get_blob_store().put(linkedin)}
+    except Exception as e:
+        print(f"❌ Opportunity enrichment error: {str(e)}")
+        return {"error": f"Opportunity enrichment failed: {str(e)}"}
+
+
+@traced("opportunity_enrichment", kind="node")
+async def opportunity_analysis_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Opportunity agent, step 2: the LLM's opportunity analysis (redone when news or LinkedIn is refreshed)"""
+    company_name = state["inbound_lead"].get("company", "")
+    if not company_name or stage_is_fresh(state, "news") and stage_is_fresh(state, "linkedin"):
+        return {}
+    try:
+        # Payloads are loaded only by the call that runs (not by leads coalesced onto it)
+        blobs = get_blob_store()
+        analysis = await coalesce_company(
+            "opportunity_analysis", company_name,
+            lambda: analyze_opportunities(company_name, blobs.get(state.get("news_ref"), []),
+                                          blobs.get(state.get("linkedin_ref"), {})),
+        )
+        return {"enrichment_opportunity": analysis}
+    except Exception as e:
+        print(f"❌ Opportunity enrichment error: {str(e)}")
+        return {"error": f"Opportunity enrichment failed: {str(e)}"}
+
+
+@traced("icp_scoring", kind="node")
+async def scoring_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Scoring agent: engine score, plus the LLM score, comparison or explanation by SCORING_MODE"""
+    print("\n🎯 [AGENT 3/4] ICP Scoring Agent...")
+    try:
+        result = await score_enriched_lead(state["enriched_lead"])
+        print(f"✅ ICP Score: {result['icp_score']}/100")
+        print(f"   Breakdown: {result['score_breakdown']}")
+        return result
+    except Exception as e:
+        print(f"❌ Scoring error: {str(e)}")
+        return {"error": f"Scoring failed: {str(e)}", "icp_score": 0}
+
+
+@traced("sdr_routing", kind="node")
+async def routing_step(state: FlatLeadProcessingState) -> Dict[str, Any]:
+    """Routing agent: rule-based router with the LLM for ambiguous leads (by ROUTING_MODE)"""
+    print("\n👤 [AGENT 4/4] SDR Routing Agent...")
+    try:
+        result = await route_enriched_lead(state["enriched_lead"], state["icp_score"])
+        print(f"✅ Routed to: {result['assigned_rep']}")
+        if result["rep_email"]:
+            print(f"   Email: {result['rep_email']}")
+        print(f"   Reason: {result['routing_reason']}")
+        return result
+    except Exception as e:
+        print(f"❌ Routing error: {str(e)}")
+        return {"error": f"Routing failed: {str(e)}", "assigned_rep": "Unassigned - Error"}
 
 
 # Build the LangGraph workflow
-def create_lead_processing_workflow() -> StateGraph:
+def create_lead_processing_workflow(fused: bool = False, parallel: bool = True, prune: bool = False,
+                                    checkpointer: Optional["BaseCheckpointSaver"] = None) -> "StateGraph":
     """
     Creates a LangGraph StateGraph with 4 agent nodes and conditional routing
     
-    Workflow:
-    START → Metadata Agent → Opportunity Agent → Scoring Agent → [Conditional] → Routing Agent or Skip → END
+    Workflow (parallel):
+    START → Metadata Agent ┐
+    START → Opportunity Agent ┴→ Scoring Agent → [Conditional] → Routing Agent or Skip → END
+    
+    The opportunity agent only needs the company name, so both enrichment
+    agents start together and scoring waits for both (the merge_dicts and
+    merge_errors reducers combine their updates). With parallel=False they run
+    one after the other: Metadata Agent → Opportunity Agent → Scoring Agent.
+    
+    Fused workflow (metadata and scoring share one LLM call):
+    START → Opportunity Agent → Fused Metadata + Scoring → [Conditional] → Routing Agent or Skip → END
+    
+    Pruning workflow (prune=True; agents one after the other, overrides parallel):
+    START → Metadata Agent → Score Bound → [Conditional] → Opportunity Agent → Scoring Agent → ...
+                                                        └→ Mark Pruned → END
+    Leads whose best possible score is below the routing threshold skip the
+    opportunity agent and scoring (engine and compare modes; the bound does
+    not hold for LLM scores).
+    
+    With a checkpointer, state is saved after every step and a failing node
+    stops the run (see halt_on_error).
     """
+    from langgraph.graph import StateGraph, START, END
+    
+    wrap = halt_on_error if checkpointer is not None else (lambda node: node)
     
     # Initialize the graph with our state schema
     workflow = StateGraph(LeadProcessingState)
     
     # Add agent nodes
-    workflow.add_node("metadata_enrichment", metadata_node)
-    workflow.add_node("opportunity_enrichment", opportunity_node)
-    workflow.add_node("icp_scoring", scoring_node)
-    workflow.add_node("sdr_routing", routing_node)
-    workflow.add_node("mark_unqualified", mark_unqualified)
-    
-    # Set entry point
-    workflow.set_entry_point("metadata_enrichment")
+    workflow.add_node("opportunity_enrichment", wrap(opportunity_node))
+    workflow.add_node("sdr_routing", wrap(routing_node))
+    workflow.add_node("mark_unqualified", wrap(mark_unqualified))
     
-    # Add sequential edges for enrichment and scoring
-    workflow.add_edge("metadata_enrichment", "opportunity_enrichment")
-    workflow.add_edge("opportunity_enrichment", "icp_scoring")
+    if fused:
+        workflow.add_node("icp_scoring", wrap(fused_enrichment_node))
+        workflow.set_entry_point("opportunity_enrichment")
+        workflow.add_edge("opportunity_enrichment", "icp_scoring")
+    elif prune:
+        workflow.add_node("metadata_enrichment", wrap(metadata_node))
+        workflow.add_node("score_bound", wrap(score_bound_node))
+        workflow.add_node("mark_pruned", wrap(mark_pruned))
+        workflow.add_node("icp_scoring", wrap(scoring_node))
+        
+        # Metadata first, then the bound decides whether the rest is worth running
+        workflow.set_entry_point("metadata_enrichment")
+        workflow.add_edge("metadata_enrichment", "score_bound")
+        workflow.add_conditional_edges(
+            "score_bound",
+            should_prune_lead,
+            {
+                "continue": "opportunity_enrichment",
+                "prune": "mark_pruned"
+            }
+        )
+        workflow.add_edge("opportunity_enrichment", "icp_scoring")
+        workflow.add_edge("mark_pruned", END)
+    elif parallel:
+        workflow.add_node("metadata_enrichment", wrap(metadata_node))
+        workflow.add_node("icp_scoring", wrap(scoring_node))
+        
+        # Fan out both enrichment agents, join before scoring
+        workflow.add_edge(START, "metadata_enrichment")
+        workflow.add_edge(START, "opportunity_enrichment")
+        workflow.add_edge(["metadata_enrichment", "opportunity_enrichment"], "icp_scoring")
+    else:
+        workflow.add_node("metadata_enrichment", wrap(metadata_node))
+        workflow.add_node("icp_scoring", wrap(scoring_node))
+        
+        # Set entry point
+        workflow.set_entry_point("metadata_enrichment")
+        
+        # Add sequential edges for enrichment and scoring
+        workflow.add_edge("metadata_enrichment", "opportunity_enrichment")
+        workflow.add_edge("opportunity_enrichment", "icp_scoring")
     
     # Add conditional edge after scoring
     workflow.add_conditional_edges(
@@ -277,47 +668,240 @@ def create_lead_processing_workflow() -> StateGraph:
     workflow.add_edge("mark_unqualified", END)
     
     # Compile the graph
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def create_flat_lead_processing_workflow(checkpointer: Optional["BaseCheckpointSaver"] = None) -> "StateGraph":
+    """
+    Creates one flat LangGraph StateGraph from the agents' steps, with no
+    nested subgraphs
+    
+    Workflow:
+    START → Metadata Browsing → Metadata Enrichment ───────────────┐
+    START → News Browsing ─────┐                                   │
+    START → LinkedIn Browsing ─┴→ Opportunity Analysis ────────────┴→ Scoring → [Conditional] → Routing or Skip → END
+    
+    Same results as the nested workflow, but every step reads and updates
+    the shared FlatLeadProcessingState directly: there is no per-agent
+    pydantic state to validate and no copying of results between states.
+    The news and LinkedIn browsing branches also run in parallel.
+    Checkpointing works as in create_lead_processing_workflow.
+    """
+    from langgraph.graph import StateGraph, START, END
+    
+    wrap = halt_on_error if checkpointer is not None else (lambda node: node)
+    workflow = StateGraph(FlatLeadProcessingState)
+    
+    workflow.add_node("metadata_browsing", wrap(metadata_browsing_step))
+    workflow.add_node("metadata_enrichment", wrap(metadata_enrichment_step))
+    workflow.add_node("news_browsing", wrap(news_browsing_step))
+    workflow.add_node("linkedin_browsing", wrap(linkedin_browsing_step))
+    workflow.add_node("opportunity_enrichment", wrap(opportunity_analysis_step))
+    workflow.add_node("icp_scoring", wrap(scoring_step))
+    workflow.add_node("sdr_routing", wrap(routing_step))
+    workflow.add_node("mark_unqualified", wrap(mark_unqualified))
+    
+    # Fan out the browsing steps, join each agent's branches before its LLM step and both agents before scoring
+    workflow.add_edge(START, "metadata_browsing")
+    workflow.add_edge(START, "news_browsing")
+    workflow.add_edge(START, "linkedin_browsing")
+    workflow.add_edge("metadata_browsing", "metadata_enrichment")
+    workflow.add_edge(["news_browsing", "linkedin_browsing"], "opportunity_enrichment")
+    workflow.add_edge(["metadata_enrichment", "opportunity_enrichment"], "icp_scoring")
+    
+    workflow.add_conditional_edges(
+        "icp_scoring",
+        should_route_lead,
+        {
+            "route": "sdr_routing",
+            "skip_routing": "mark_unqualified"
+        }
+    )
+    workflow.add_edge("sdr_routing", END)
+    workflow.add_edge("mark_unqualified", END)
+    
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def pipeline_checkpointer() -> Optional["BaseCheckpointSaver"]:
+    """Checkpointer the pipeline graphs are compiled with (None when PIPELINE_CHECKPOINTS is off)"""
+    if not PIPELINE_CHECKPOINTS:
+        return None
+    from agents.sqlite_checkpointer import get_checkpointer
+    
+    return get_checkpointer()
+
+
+# Pipeline workflows by name (the name is stored with a run's checkpoints)
+PIPELINE_GRAPH_BUILDERS: Dict[str, Callable[..., Any]] = {
+    "parallel": lambda checkpointer: create_lead_processing_workflow(checkpointer=checkpointer),
+    "sequential": lambda checkpointer: create_lead_processing_workflow(parallel=False, checkpointer=checkpointer),
+    "fused": lambda checkpointer: create_lead_processing_workflow(fused=True, checkpointer=checkpointer),
+    "pruning": lambda checkpointer: create_lead_processing_workflow(prune=True, checkpointer=checkpointer),
+    "flat": lambda checkpointer: create_flat_lead_processing_workflow(checkpointer=checkpointer),
+}
+# Module attributes kept for callers of the former eagerly compiled graphs
+_GRAPH_ALIASES = {
+    "lead_processing_graph": "parallel",
+    "sequential_lead_processing_graph": "sequential",
+    "fused_lead_processing_graph": "fused",
+    "pruning_lead_processing_graph": "pruning",
+    "flat_lead_processing_graph": "flat",
+}
+
+
+@lru_cache(maxsize=None)
+def get_pipeline_graph(graph_name: str):
+    """
+    Compiled pipeline workflow (a singleton per name), compiled on first use
+    
+    Args:
+        graph_name: Key of PIPELINE_GRAPH_BUILDERS
+    
+    Raises:
+        KeyError: If graph_name is not a pipeline graph
+    """
+    return PIPELINE_GRAPH_BUILDERS[graph_name](pipeline_checkpointer())
 
 
-# Create the compiled workflow (singleton)
-lead_processing_graph = create_lead_processing_workflow()
+def __getattr__(name: str):
+    if name in _GRAPH_ALIASES:
+        return get_pipeline_graph(_GRAPH_ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-async def run_lead_processing_pipeline(inbound_lead: Dict[str, Any]) -> Dict[str, Any]:
+def warm_up_pipeline(graph_names: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Pay the pipeline's one-time costs before the first lead arrives
+    
+    Compiles the pipeline graphs and the agents' own graphs (used by the
+    step endpoints), builds the agents' static prompts and loads the token
+    encoding. The agents themselves were imported with this module.
+    
+    Args:
+        graph_names: Pipeline graphs to compile (default: all of them)
+    
+    Returns:
+        Milliseconds spent on each warm-up step
+    """
+    from agents.fused_enrichment import fused_instructions
+    from agents.metadata_enrichment_agent import get_metadata_graph
+    from agents.opportunity_enrichment_agent import get_opportunity_enrichment_graph
+    from agents.prompt_builder import count_tokens
+    from agents.routing_agent import get_routing_graph, routing_instructions
+    from agents.scoring_agent import get_scoring_graph, scoring_instructions
+    
+    steps = {
+        "agent graphs": (get_metadata_graph, get_opportunity_enrichment_graph, get_scoring_graph, get_routing_graph),
+        "pipeline graphs": [lambda name=name: get_pipeline_graph(name) for name in graph_names or PIPELINE_GRAPH_BUILDERS],
+        "static prompts": (scoring_instructions, routing_instructions, fused_instructions),
+        "token encoding": (lambda: count_tokens("warm-up"),),
+    }
+    timings = {}
+    for step, builders in steps.items():
+        start = time.perf_counter()
+        for build in builders:
+            build()
+        timings[step] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+async def invoke_pipeline_graph(graph_name: str, graph_input: Optional[Dict[str, Any]], run_id: str) -> Dict[str, Any]:
+    """
+    Run a pipeline graph, checkpointed under run_id when PIPELINE_CHECKPOINTS is on
+    
+    Args:
+        graph_name: Key of PIPELINE_GRAPH_BUILDERS
+        graph_input: Initial state, or None to resume run_id from its last checkpoint
+        run_id: Pipeline run id (the checkpoint thread id)
+    
+    Returns:
+        Final state; if a stage failed, the state as of the last successful
+        step with error set and resumable=True
+    """
+    graph = get_pipeline_graph(graph_name)
+    if not PIPELINE_CHECKPOINTS:
+        return await graph.ainvoke(graph_input)
+    
+    config = {"configurable": {"thread_id": run_id}, "metadata": {"pipeline_graph": graph_name}}
+    try:
+        final_state = await graph.ainvoke(graph_input, config)
+    except StageFailed as e:
+        print(f"💾 Run {run_id} stopped at a failed stage; resume it from its last checkpoint")
+        snapshot = await graph.aget_state(config)
+        final_state = dict(snapshot.values)
+        final_state["error"] = merge_errors(final_state.get("error"), str(e))
+        final_state["resumable"] = True
+        return final_state
+    
+    if not PIPELINE_KEEP_CHECKPOINTS:
+        await pipeline_checkpointer().adelete_thread(run_id)
+    return final_state
+
+
+def record_fetch_times(final_state: Dict[str, Any]):
+    """Stamp the fields a successful run fetched in final_state["fetched_at"] (for freshness checks)"""
+    if not final_state.get("error"):
+        final_state["fetched_at"] = mark_fetched(final_state.get("fetched_at") or {}, fetched_fields(final_state))
+
+
+def print_run_summary(run_id: str):
+    print("\n" + "="*60)
+    print("✅ LangGraph Pipeline Complete!")
+    for agent, usage in summarize_records(get_metrics_registry().run_records(run_id)).items():
+        print(f"   📈 {agent}: {usage['calls']} LLM call(s), {usage['wall_ms']:.0f} ms, "
+              f"{usage['prompt_tokens']}+{usage['completion_tokens']} tokens, ${usage['cost_usd']:.4f}")
+    print("="*60 + "\n")
+
+
+async def run_lead_processing_pipeline(inbound_lead: Dict[str, Any], fused: Optional[bool] = None,
+                                      parallel: Optional[bool] = None, flat: Optional[bool] = None,
+                                      prune: Optional[bool] = None) -> Dict[str, Any]:
     """
     Run the full LangGraph multi-agent pipeline
     
     Args:
         inbound_lead: Initial lead data with name, company, etc.
+        fused: Extract metadata and score it in one LLM call (defaults to
+            PIPELINE_FUSED_ENRICHMENT)
+        parallel: Run the metadata and opportunity agents in parallel (defaults
+            to PIPELINE_PARALLEL_ENRICHMENT; ignored in fused mode)
+        flat: Run the flat single graph instead of nested agent subgraphs
+            (defaults to PIPELINE_FLAT_GRAPH; always parallel; ignored in
+            fused mode)
+        prune: Skip the opportunity agent and scoring for leads that cannot
+            reach the routing threshold (defaults to PIPELINE_SCORE_PRUNING;
+            runs the agents one after the other; ignored in fused and flat
+            modes)
     
     Returns:
-        Final state with enriched data, score, and routing
+        Final state with enriched data, score, and routing, plus run_id (the
+        key of this run's LLM call metrics and checkpoints) and fetched_at
+        (when each enriched field was fetched). The browsed news and
+        LinkedIn posts are in the blob store under news_ref and linkedin_ref.
+        If a stage
+        failed in a checkpointed run, the state stops at the last successful
+        step, with error set and resumable=True (see
+        resume_lead_processing_pipeline).
     """
     # Initialize state with all required fields
     initial_state = LeadProcessingState(
         inbound_lead=inbound_lead,
-        enriched_lead={},
         
         # Metadata fields
-        industry="",
-        company_size="",
-        locations=[],
-        technologies=[],
-        products_services=[],
-        strategic_focus=[],
-        company_culture="",
-        data_confidence="",
+        enriched_lead={},
         
         # Opportunity fields
         enrichment_opportunity="",
-        browsed_opportunity_from_news=[],
-        browsed_opportunity_from_linkedin={},
+        news_ref=None,
+        linkedin_ref=None,
         
         # Scoring fields
         icp_score=0,
         score_breakdown={},
         score_recommendation="",
+        score_upper_bound=None,
+        pruned=False,
         
         # Routing fields
         assigned_rep="",
@@ -331,11 +915,125 @@ async def run_lead_processing_pipeline(inbound_lead: Dict[str, Any]) -> Dict[str
     print("🚀 Starting LangGraph Multi-Agent Pipeline")
     print("="*60)
     
-    # Run the graph
-    final_state = await lead_processing_graph.ainvoke(initial_state)
+    if PIPELINE_FUSED_ENRICHMENT if fused is None else fused:
+        graph_name = "fused"
+    elif PIPELINE_FLAT_GRAPH if flat is None else flat:
+        graph_name = "flat"
+    elif PIPELINE_SCORE_PRUNING if prune is None else prune:
+        graph_name = "pruning"
+    elif PIPELINE_PARALLEL_ENRICHMENT if parallel is None else parallel:
+        graph_name = "parallel"
+    else:
+        graph_name = "sequential"
+    
+    # Run the graph; every LLM call inside is attributed to this run, and every
+    # node, fetch, search and LLM call is traced under it (trace id = run id)
+    lead_label = inbound_lead.get("email") or inbound_lead.get("company")
+    with llm_run(lead_id=lead_label) as run_id, trace(run_id, graph=graph_name, lead=lead_label):
+        final_state = await invoke_pipeline_graph(graph_name, initial_state, run_id)
+    final_state["run_id"] = run_id
+    record_fetch_times(final_state)
+    
+    print_run_summary(run_id)
+    return final_state
+
+
+async def resume_lead_processing_pipeline(run_id: str) -> Dict[str, Any]:
+    """
+    Resume a failed pipeline run from its last successful node
+    
+    Nodes that completed (including a parallel branch that finished while
+    its sibling failed) are not run again; the run keeps its graph and its
+    run_id.
+    
+    Args:
+        run_id: run_id of the failed run
+    
+    Returns:
+        Final state, as from run_lead_processing_pipeline
+    
+    Raises:
+        KeyError: If there are no checkpoints for run_id (unknown run,
+            completed run, or checkpointing disabled)
+    """
+    checkpointer = pipeline_checkpointer()
+    checkpoint = await checkpointer.aget_tuple({"configurable": {"thread_id": run_id}}) if checkpointer else None
+    if checkpoint is None:
+        raise KeyError(run_id)
+    graph_name = checkpoint.metadata.get("pipeline_graph", "parallel")
+    inbound_lead = checkpoint.checkpoint["channel_values"].get("inbound_lead", {})
     
     print("\n" + "="*60)
-    print("✅ LangGraph Pipeline Complete!")
-    print("="*60 + "\n")
+    print(f"🔁 Resuming LangGraph Multi-Agent Pipeline (run {run_id}, {graph_name} graph)")
+    print("="*60)
+    
+    lead_label = inbound_lead.get("email") or inbound_lead.get("company")
+    with llm_run(lead_id=lead_label, run_id=run_id), trace(run_id, graph=graph_name, lead=lead_label, resumed=True):
+        final_state = await invoke_pipeline_graph(graph_name, None, run_id)
+    final_state["run_id"] = run_id
+    record_fetch_times(final_state)
+    
+    print_run_summary(run_id)
+    return final_state
+
+
+async def refresh_lead_pipeline(stored: Dict[str, Any], refresh_fields: List[str]) -> Dict[str, Any]:
+    """
+    Re-enrich a stored lead incrementally: re-run only the stages producing
+    the fields to refresh, reuse the stored results of the others, then
+    re-score and re-route
+    
+    Runs the flat graph with the stored results in its initial state; the
+    steps of fresh stages return nothing, and refreshed metadata replaces
+    only the stale fields. Checkpointed and resumable like a full run.
+    
+    Args:
+        stored: The stored result: inbound_lead, enriched_lead, news_ref,
+            linkedin_ref, enrichment_opportunity, fetched_at (fetch time per field) and
+            stored_lead_id (its database id, kept in the state for resumes)
+        refresh_fields: Fields to refresh (see agents.freshness)
+    
+    Returns:
+        Final state, as from run_lead_processing_pipeline, with fetched_at
+        updated for the refreshed fields
+    """
+    initial_state = FlatLeadProcessingState(
+        inbound_lead=stored["inbound_lead"],
+        
+        # Metadata fields
+        enriched_lead=stored.get("enriched_lead") or {},
+        browsed_metadata_ref=None,
+        
+        # Opportunity fields
+        enrichment_opportunity=stored.get("enrichment_opportunity", ""),
+        news_ref=stored.get("news_ref"),
+        linkedin_ref=stored.get("linkedin_ref"),
+        
+        # Scoring and routing fields (always redone)
+        icp_score=0,
+        score_breakdown={},
+        score_recommendation="",
+        score_upper_bound=None,
+        pruned=False,
+        assigned_rep="",
+        rep_email="",
+        routing_reason="",
+        
+        refresh_fields=list(refresh_fields),
+        fetched_at=stored.get("fetched_at") or {},
+        stored_lead_id=stored.get("stored_lead_id"),
+        error=None
+    )
+    
+    print("\n" + "="*60)
+    print(f"♻️  Re-enriching lead (refreshing {', '.join(refresh_fields)})")
+    print("="*60)
+    
+    lead_label = stored["inbound_lead"].get("email") or stored["inbound_lead"].get("company")
+    with llm_run(lead_id=lead_label) as run_id, trace(run_id, graph="flat", lead=lead_label, refresh=list(refresh_fields)):
+        final_state = await invoke_pipeline_graph("flat", initial_state, run_id)
+    final_state["run_id"] = run_id
+    record_fetch_times(final_state)
     
+    print_run_summary(run_id)
     return final_state
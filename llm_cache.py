@@ -0,0 +1,168 @@
+# agents/llm_cache.py
+"""
+Content-addressed cache for LLM chat completions.
+
+Entries are keyed by a fingerprint of (model, messages, parameters), so an
+identical request - e.g. re-scoring the same company with temperature=0 -
+is answered without an LLM round trip. Lookups go through an in-memory LRU
+tier first and a SQLite tier second; both honour the same TTL.
+
+The disk tier is read and written from the event loop on every LLM call, so
+it keeps one WAL-mode connection (no fsync per write) instead of connecting
+per call, and a database error (e.g. a locked file) counts as a miss rather
+than failing the call.
+
+Configuration (environment variables):
+    LLM_CACHE_DB: SQLite file for the disk tier
+    LLM_CACHE_TTL_SECONDS: entry lifetime
+    LLM_CACHE_MAX_ENTRIES: size of the in-memory LRU tier
+    LLM_CACHE_BYPASS: "1"/"true" disables the cache for every call
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """Fingerprint a chat completion request."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + SQLite) response cache with per-agent hit metrics."""
+
+    def __init__(self, db_file: str = LLM_CACHE_DB, ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use; callers hold self._lock
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None, timeout=1.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                agent TEXT,
+                model TEXT,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """)
+            self._connection = connection
+        return self._connection
+
+    def _count(self, agent: str, outcome: str):
+        with self._lock:
+            counters = self._stats.setdefault(agent, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0})
+            counters[outcome] += 1
+
+    def record_bypass(self, agent: str):
+        self._count(agent, "bypassed")
+
+    def get(self, key: str, agent: str) -> Optional[str]:
+        """Return the cached response for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+        if entry is not None:
+            self._count(agent, "memory_hits")
+            return entry[1]
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache read failed ({e}), treating as a miss")
+            row = None
+        if row is None:
+            self._count(agent, "misses")
+            return None
+
+        self._remember(key, row[0], row[1])
+        self._count(agent, "disk_hits")
+        return row[0]
+
+    def set(self, key: str, response: str, agent: str, model: str):
+        """Store a response in both tiers."""
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, response, expires_at)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, agent, model, response, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, agent, model, response, expires_at),
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache write failed ({e}), kept in memory only")
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        with self._lock:
+            self._memory[key] = (expires_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the disk tier; returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent hit/miss counters with the overall hit rate."""
+        with self._lock:
+            snapshot = {agent: dict(counters) for agent, counters in self._stats.items()}
+        for counters in snapshot.values():
+            hits = counters["memory_hits"] + counters["disk_hits"]
+            lookups = hits + counters["misses"]
+            counters["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        return snapshot
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache (created on first use)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
@@ -0,0 +1,215 @@
+# agents/llm_gateway.py
+"""
+Shared async LLM gateway used by every agent.
+
+All chat completions go through one `openai.AsyncOpenAI` client backed by a
+pooled httpx connection pool, and a global semaphore caps the number of
+in-flight LLM requests. Concurrent leads therefore overlap their LLM waits on
+the event loop instead of blocking it with synchronous calls. Responses are
+cached by request fingerprint (see llm_cache), and every call is recorded in
+the LLM metrics registry (see llm_metrics) and traced as a span of the
+pipeline run (see tracing). Completions are streamed internally so time to
+first token can be measured, and the tokens of one agent's calls can be
+forwarded to a caller as they arrive (see token_sink).
+
+Configuration (environment variables):
+    LLM_BASE_URL: OpenAI-compatible endpoint (LiteLLM proxy by default)
+    LLM_API_KEY: API key for the endpoint
+    LLM_MAX_CONCURRENCY: max concurrent chat completions
+    LLM_MAX_CONNECTIONS: max pooled HTTP connections
+    LLM_TIMEOUT: request timeout in seconds
+    LLM_STREAM_METRICS: "0" disables internal streaming (no time to first token)
+        except for calls whose tokens go to a token_sink
+"""
+import asyncio
+import contextvars
+import os
+import time
+import weakref
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+if TYPE_CHECKING:
+    import openai
+
+from agents.llm_cache import LLM_CACHE_BYPASS, cache_key, get_llm_cache
+from agents.llm_metrics import get_metrics_registry
+from agents.tracing import annotate, traced
+
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://0.0.0.0:4000")
+LLM_API_KEY = os.getenv("LLM_API_KEY", "sk-TE5BPNfSh4IOCNpW3I5EDQ")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_STREAM_METRICS = os.getenv("LLM_STREAM_METRICS", "1").lower() not in ("0", "false", "no")
+
+
+# (agent, callback) receiving the text deltas of that agent's completions
+_token_sink: contextvars.ContextVar[Optional[Tuple[str, Callable[[str], None]]]] = contextvars.ContextVar(
+    "llm_token_sink", default=None
+)
+
+
+@contextmanager
+def token_sink(callback: Callable[[str], None], agent: str) -> Iterator[None]:
+    """
+    Forward the text of `agent`'s chat completions made inside the block to
+    `callback`, delta by delta, as the tokens arrive (a cache hit is
+    forwarded as one delta). Tasks created inside the block inherit the sink.
+    """
+    token = _token_sink.set((agent, callback))
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+class _LoopResources:
+    """Client and concurrency limiter bound to one event loop.
+
+    httpx connections and asyncio primitives cannot be shared across event
+    loops, so each loop (normally just the server's) gets its own pair.
+    """
+
+    def __init__(self):
+        # Imported on first use: the openai SDK is slow to import and not needed at startup
+        import openai
+        
+        self.client = openai.AsyncOpenAI(
+            api_key=LLM_API_KEY,
+            base_url=LLM_BASE_URL,
+            timeout=LLM_TIMEOUT,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                ),
+            ),
+        )
+        self.semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+
+_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = weakref.WeakKeyDictionary()
+
+
+def _get_resources() -> _LoopResources:
+    loop = asyncio.get_running_loop()
+    resources = _resources.get(loop)
+    if resources is None:
+        resources = _resources[loop] = _LoopResources()
+    return resources
+
+
+def get_async_client() -> "openai.AsyncOpenAI":
+    """Return the shared AsyncOpenAI client for the running event loop."""
+    return _get_resources().client
+
+
+@traced("llm", kind="llm", args=("agent", "model"))
+async def chat_completion(messages: List[Dict[str, str]], *, agent: str, model: str,
+                          cache: bool = True, **params: Any) -> str:
+    """
+    Run a chat completion through the shared client and return the message text.
+
+    Identical requests are served from the LLM response cache unless
+    `cache=False` is passed or LLM_CACHE_BYPASS is set.
+
+    Args:
+        messages: Chat messages (role/content dicts)
+        agent: Name of the calling agent (metadata, opportunity, scoring, routing)
+        model: Model name
+        cache: Whether to read/write the LLM response cache for this call
+        **params: Extra completion parameters (temperature, ...)
+
+    Returns:
+        Content of the first choice's message
+    """
+    registry = get_metrics_registry()
+    started = time.perf_counter()
+    sink = _token_sink.get()
+    on_delta = sink[1] if sink is not None and sink[0] == agent else None
+    response_cache = get_llm_cache()
+    key = None
+    if cache and not LLM_CACHE_BYPASS:
+        key = cache_key(model, messages, params)
+        cached = response_cache.get(key, agent)
+        if cached is not None:
+            if on_delta is not None:
+                on_delta(cached)
+            registry.record(agent=agent, model=model, wall_ms=(time.perf_counter() - started) * 1000, cached=True)
+            annotate(cached=True)
+            return cached
+    else:
+        response_cache.record_bypass(agent)
+
+    resources = _get_resources()
+    ttft_ms = None
+    queue_ms = 0.0
+    try:
+        async with resources.semaphore:
+            sent = time.perf_counter()
+            queue_ms = (sent - started) * 1000
+            if LLM_STREAM_METRICS or on_delta is not None:
+                content, usage, ttft_ms = await _streamed_completion(
+                    resources.client, model, messages, sent, params, on_delta
+                )
+            else:
+                response = await resources.client.chat.completions.create(model=model, messages=messages, **params)
+                content, usage = response.choices[0].message.content, response.usage
+    except Exception as e:
+        registry.record(agent=agent, model=model, wall_ms=(time.perf_counter() - started) * 1000,
+                        queue_ms=queue_ms, error=f"{type(e).__name__}: {e}")
+        raise
+
+    prompt_tokens, completion_tokens, estimated = _token_counts(usage, messages, content)
+    registry.record(agent=agent, model=model, wall_ms=(time.perf_counter() - started) * 1000,
+                    ttft_ms=ttft_ms, queue_ms=queue_ms, prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens, tokens_estimated=estimated)
+    annotate(queue_ms=round(queue_ms, 2), ttft_ms=None if ttft_ms is None else round(ttft_ms, 2),
+             prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    if key is not None and content:
+        response_cache.set(key, content, agent, model)
+    return content
+
+
+async def _streamed_completion(client: "openai.AsyncOpenAI", model: str, messages: List[Dict[str, str]],
+                               started: float, params: Dict[str, Any],
+                               on_delta: Optional[Callable[[str], None]] = None) -> Tuple[str, Any, Optional[float]]:
+    """Stream a completion, returning (content, usage or None, ms from `started` to the first token)."""
+    stream = await client.chat.completions.create(
+        model=model, messages=messages, stream=True, stream_options={"include_usage": True}, **params
+    )
+    parts: List[str] = []
+    usage = None
+    ttft_ms = None
+    async for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            parts.append(chunk.choices[0].delta.content)
+            if on_delta is not None:
+                on_delta(chunk.choices[0].delta.content)
+    return "".join(parts), usage, ttft_ms
+
+
+def _token_counts(usage: Any, messages: List[Dict[str, str]], content: Optional[str]) -> Tuple[int, int, bool]:
+    """Prompt/completion tokens from the provider's usage, estimated locally if it sent none."""
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        return usage.prompt_tokens, usage.completion_tokens or 0, False
+    from agents.prompt_builder import count_tokens
+
+    prompt_tokens = sum(count_tokens(message.get("content") or "") for message in messages)
+    return prompt_tokens, count_tokens(content or ""), True
+
+
+async def aclose():
+    """Close the running loop's client and its connection pool."""
+    loop = asyncio.get_running_loop()
+    resources = _resources.pop(loop, None)
+    if resources is not None:
+        await resources.client.close()
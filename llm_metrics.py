@@ -0,0 +1,158 @@
+# agents/llm_metrics.py
+"""
+Per-call LLM instrumentation.
+
+The gateway records one entry per chat completion: wall time, time to first
+token, time before the request was sent (cache lookup and waiting for a
+concurrency slot), prompt/completion tokens, estimated cost, model, agent,
+and the pipeline run and lead the call belongs to. Entries go to an
+in-process registry (recent calls plus per-agent totals); a pipeline run's
+entries are persisted with the leads in SQLite.
+
+The run and lead are taken from context variables set by llm_run(), so they
+follow the pipeline through awaits and asyncio tasks without being passed
+explicitly.
+"""
+import contextvars
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# USD per 1M tokens (input, output)
+MODEL_PRICING = {
+    "claude-4.5-sonnet": (3.00, 15.00),
+    "claude-4.5-haiku": (1.00, 5.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+# Most recent calls kept in memory
+MAX_RECENT_CALLS = 10000
+
+current_run_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_run_id", default=None)
+current_lead_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_lead_id", default=None)
+
+
+@contextmanager
+def llm_run(lead_id: Optional[Any] = None, run_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Attribute every LLM call made inside the block to one pipeline run.
+
+    Yields:
+        The run id
+    """
+    run_id = run_id or uuid.uuid4().hex
+    run_token = current_run_id.set(run_id)
+    lead_token = current_lead_id.set(None if lead_id is None else str(lead_id))
+    try:
+        yield run_id
+    finally:
+        current_lead_id.reset(lead_token)
+        current_run_id.reset(run_token)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Cost in USD from MODEL_PRICING, or None for unknown models."""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    return round((prompt_tokens * pricing[0] + completion_tokens * pricing[1]) / 1_000_000, 6)
+
+
+class LLMMetricsRegistry:
+    """In-process store of recent LLM calls and per-agent totals."""
+
+    def __init__(self, max_recent: int = MAX_RECENT_CALLS):
+        self._recent: deque = deque(maxlen=max_recent)
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, *, agent: str, model: str, wall_ms: float, ttft_ms: Optional[float] = None,
+               queue_ms: float = 0.0, prompt_tokens: int = 0, completion_tokens: int = 0,
+               tokens_estimated: bool = False, cached: bool = False, error: Optional[str] = None) -> Dict[str, Any]:
+        """Record one chat completion and return the stored entry."""
+        cost = None if cached or error else estimate_cost(model, prompt_tokens, completion_tokens)
+        entry = {
+            "run_id": current_run_id.get(),
+            "lead_id": current_lead_id.get(),
+            "agent": agent,
+            "model": model,
+            "started_at": time.time() - wall_ms / 1000,
+            "wall_ms": round(wall_ms, 2),
+            "ttft_ms": None if ttft_ms is None else round(ttft_ms, 2),
+            "queue_ms": round(queue_ms, 2),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_estimated": tokens_estimated,
+            "cost_usd": cost,
+            "cached": cached,
+            "error": error,
+        }
+        with self._lock:
+            self._recent.append(entry)
+            totals = self._totals.setdefault(agent, {
+                "calls": 0, "cached_calls": 0, "errors": 0, "wall_ms": 0.0, "ttft_ms": 0.0,
+                "ttft_samples": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+            })
+            totals["calls"] += 1
+            totals["cached_calls"] += int(cached)
+            totals["errors"] += int(error is not None)
+            totals["wall_ms"] += wall_ms
+            if ttft_ms is not None:
+                totals["ttft_ms"] += ttft_ms
+                totals["ttft_samples"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["cost_usd"] += cost or 0.0
+        return entry
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent totals with average latency and share of total LLM wall time."""
+        with self._lock:
+            totals = {agent: dict(values) for agent, values in self._totals.items()}
+        all_wall = sum(values["wall_ms"] for values in totals.values()) or 1.0
+        for values in totals.values():
+            calls = values["calls"] or 1
+            values["avg_wall_ms"] = round(values["wall_ms"] / calls, 2)
+            values["avg_ttft_ms"] = (
+                round(values["ttft_ms"] / values["ttft_samples"], 2) if values["ttft_samples"] else None
+            )
+            values["wall_share"] = round(values["wall_ms"] / all_wall, 3)
+            values["wall_ms"] = round(values["wall_ms"], 2)
+            values["cost_usd"] = round(values["cost_usd"], 6)
+            del values["ttft_ms"], values["ttft_samples"]
+        return totals
+
+    def run_records(self, run_id: str) -> List[Dict[str, Any]]:
+        """Entries recorded for one pipeline run (while still in memory)."""
+        with self._lock:
+            return [entry for entry in self._recent if entry["run_id"] == run_id]
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._recent)[-limit:]
+
+
+def summarize_records(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-agent totals (calls, wall time, tokens, cost) of a list of entries, e.g. one run."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for entry in records:
+        agent = summary.setdefault(entry["agent"], {
+            "calls": 0, "wall_ms": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+        })
+        agent["calls"] += 1
+        agent["wall_ms"] = round(agent["wall_ms"] + entry["wall_ms"], 2)
+        agent["prompt_tokens"] += entry["prompt_tokens"]
+        agent["completion_tokens"] += entry["completion_tokens"]
+        agent["cost_usd"] = round(agent["cost_usd"] + (entry["cost_usd"] or 0.0), 6)
+    return summary
+
+
+_registry = LLMMetricsRegistry()
+
+
+def get_metrics_registry() -> LLMMetricsRegistry:
+    """Return the process-wide LLM metrics registry."""
+    return _registry
@@ -1,37 +1,37 @@
 from agents import prompts
 from asyncio.log import logger
+import asyncio
 import json
 import os
 import sys
 import re
-import langgraph
-import requests
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
+import httpx
 from pydantic import BaseModel, Field
-from langgraph.graph import StateGraph, START, END
-from langchain_core.output_parsers import PydanticOutputParser
 from typing import Literal, Optional, Dict, Any, List, Union
 from typing import TypedDict, Annotated
-from bs4 import BeautifulSoup
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-# Import config for API keys
+# LLM calls go through the shared async gateway
+from agents.llm_gateway import chat_completion
+from agents.web_client import get_web_client
+from agents.prompt_builder import PromptBuilder
+from agents.model_policy import run_tiered
+from agents.icp_scoring_engine import parse_company_size
+from agents.tracing import traced
 
-import openai
-client = openai.OpenAI(
-    api_key="sk-TE5BPNfSh4IOCNpW3I5EDQ",
-    base_url="http://0.0.0.0:4000"
-)
-
-MODEL_NAME = "claude-4.5-sonnet"
 SERPER_API_KEY=os.getenv("SERPER_API_KEY")
+# Overridable to point at local fakes (see start_fakes.py)
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")
+WIKIPEDIA_BASE_URL = os.getenv("WIKIPEDIA_BASE_URL", "https://en.wikipedia.org/wiki")
 
 class MetadataEnrichmentState(BaseModel):
     inbound_lead: Optional[str] = None
     browsed_metadata: Optional[str] = None
+    wiki_infobox: Optional[Dict[str, str]] = None
     enrichment_metadata: Optional[List[Dict[str, Any]]] = None
     enrichment_opportunity: Optional[str] = None
     industry: Optional[str] = None
@@ -55,45 +55,43 @@ class CompanyMetadata(BaseModel):
     data_confidence: Literal["high", "medium", "low"]
 
 
-def fetch_url(url: str, full_text: bool = False) -> str:
+@traced("fetch", kind="http", args=("url",))
+async def fetch_url(url: str, full_text: bool = False) -> str:
     """Fetch content from a URL and extract text."""
     try:
-        USER_AGENT = "Mozilla/5.0"
-        headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
+        response = await get_web_client().get(url)
         response.raise_for_status()
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(response.text, "html.parser")
         text = soup.get_text(separator=" ", strip=True)
         logger.info(f"Successfully fetched {url}")
         return text if full_text else text[:2000]
-    except requests.Timeout:
+    except httpx.TimeoutException:
         return "Timeout error while fetching URL"
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return f"HTTP error occurred: {e}"
     except Exception as e:
         return f"An unexpected error occurred: {e}"
 
 
-def search_web(query: str, num_results: int = 2) -> dict[str, Any] | None:
+@traced("search", kind="search", args=("query",))
+async def search_web(query: str, num_results: int = 2) -> dict[str, Any] | None:
     """Search the web using the Serper API."""
     payload = json.dumps({"q": query, "num": num_results})
-    USER_AGENT = "Mozilla/5.0"
-    SERPER_URL = "https://google.serper.dev/search"
     headers = {
         "X-API-KEY": SERPER_API_KEY,
         "Content-Type": "application/json"
     }
     
     try:
-        response = requests.post(
-            SERPER_URL, headers=headers, data=payload, timeout=30
-        )
+        response = await get_web_client().post(SERPER_URL, headers=headers, content=payload)
         response.raise_for_status()
         return response.json()
-    except requests.Timeout:
+    except httpx.TimeoutException:
         logger.error("Search request timed out")
         return {"organic": []}
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"HTTP error occurred: {e}")
         return {"organic": []}
     except Exception as e:
@@ -101,19 +99,21 @@ def search_web(query: str, num_results: int = 2) -> dict[str, Any] | None:
         return {"organic": []}
 
 
-def extract_wiki_data(company_name):
+@traced("wikipedia", kind="http", args=("company_name",))
+async def extract_wiki_data(company_name):
     """Extract company data from Wikipedia"""
     try:
         company_name = company_name.replace(" ", "_")
-        url = f"https://en.wikipedia.org/wiki/{company_name}"
+        url = f"{WIKIPEDIA_BASE_URL}/{company_name}"
         
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await get_web_client().get(url, timeout=10)
         
         if response.status_code != 200:
             print(f"Error fetching Wikipedia page: {response.status_code}")
             return None
         
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(response.text, "html.parser")
         
         # Locate the infobox (standard for companies)
@@ -138,86 +138,190 @@ def extract_wiki_data(company_name):
         return None
 
 
-def metadata_web_browsing_node(state:MetadataEnrichmentState):
-    """Browse web for company metadata from LinkedIn and Wikipedia"""
+@traced("linkedin_about", args=("company_name",))
+async def extract_linkedin_about(company_name: str) -> Optional[str]:
+    """Find the company's LinkedIn page via search and extract its About section"""
+    search_query = f"{company_name} company linkedin"
+    search_results = await search_web(search_query)
+    
+    if not search_results or "organic" not in search_results:
+        return None
+    
+    # Find the LinkedIn company URL
+    linkedin_url = None
+    for result in search_results.get("organic", []):
+        if "linkedin.com/company/" in result.get("link", ""):
+            linkedin_url = result.get("link")
+            break
+    
+    if not linkedin_url:
+        return None
+    
+    print(f"Found LinkedIn URL: {linkedin_url}")
+    company_html = await fetch_url(linkedin_url, full_text=True)
+    
+    # Extract about section
+    about_pattern = re.compile(r'About<.*?>(?:.*?(?:see all)?)(.{50,2000})', re.DOTALL | re.IGNORECASE)
+    about_match = about_pattern.search(company_html)
+    return about_match.group(1).strip()[:1500] if about_match else None
+
+
+async def browse_company_metadata(company_name: str) -> Dict[str, Any]:
+    """
+    Browse the web for company metadata from LinkedIn and Wikipedia
+    
+    Args:
+        company_name: Name of the company
+        
+    Returns:
+        Dictionary with browsed_metadata (text for the LLM) and wiki_infobox
+        (None if no infobox was found)
+    """
     print("🔍 Starting metadata browsing...")
-    company_name = state.inbound_lead
     
-    # Collect data from multiple sources
+    # Collect data from multiple sources; LinkedIn and Wikipedia are fetched concurrently
     data_sources = []
+    linkedin_about, wiki_data = await asyncio.gather(
+        extract_linkedin_about(company_name),
+        extract_wiki_data(company_name),
+        return_exceptions=True,
+    )
     
-    # Try LinkedIn
-    try:
-        search_query = f"{company_name} company linkedin"
-        search_results = search_web(search_query)
-        
-        if search_results and "organic" in search_results:
-            # Find the LinkedIn company URL
-            linkedin_url = None
-            for result in search_results.get("organic", []):
-                if "linkedin.com/company/" in result.get("link", ""):
-                    linkedin_url = result.get("link")
-                    break
-            
-            if linkedin_url:
-                print(f"Found LinkedIn URL: {linkedin_url}")
-                company_html = fetch_url(linkedin_url, full_text=True)
-                
-                # Extract about section
-                about_pattern = re.compile(r'About<.*?>(?:.*?(?:see all)?)(.{50,2000})', re.DOTALL | re.IGNORECASE)
-                about_match = about_pattern.search(company_html)
-                if about_match:
-                    linkedin_about = about_match.group(1).strip()[:1500]
-                    data_sources.append(f"LinkedIn About: {linkedin_about}")
-                    print("✅ LinkedIn data extracted")
-    except Exception as e:
-        print(f"⚠️ LinkedIn extraction failed: {str(e)}")
+    if isinstance(linkedin_about, Exception):
+        print(f"⚠️ LinkedIn extraction failed: {str(linkedin_about)}")
+    elif linkedin_about:
+        data_sources.append(f"LinkedIn About: {linkedin_about}")
+        print("✅ LinkedIn data extracted")
     
-    # Try Wikipedia
-    try:
-        wiki_data = extract_wiki_data(company_name)
-        if wiki_data:
-            data_sources.append(f"Wikipedia Data: {str(wiki_data)}")
-            print("✅ Wikipedia data extracted")
-    except Exception as e:
-        print(f"⚠️ Wikipedia extraction failed: {str(e)}")
+    if isinstance(wiki_data, Exception):
+        print(f"⚠️ Wikipedia extraction failed: {str(wiki_data)}")
+    elif wiki_data:
+        data_sources.append(f"Wikipedia Data: {str(wiki_data)}")
+        print("✅ Wikipedia data extracted")
     
     # Combine all sources or use company name as fallback
     if data_sources:
-        state.browsed_metadata = f"Company: {company_name}\n\n" + "\n\n".join(data_sources)
+        browsed_metadata = f"Company: {company_name}\n\n" + "\n\n".join(data_sources)
         print(f"✅ Metadata browsing complete ({len(data_sources)} sources)")
     else:
-        state.browsed_metadata = f"Company Name: {company_name}"
+        browsed_metadata = f"Company Name: {company_name}"
         print("⚠️ No web data found, using company name only")
     
+    return {
+        "browsed_metadata": browsed_metadata,
+        "wiki_infobox": wiki_data if isinstance(wiki_data, dict) and wiki_data else None,
+    }
+
+
+@traced("metadata_web_browsing_node", kind="node")
+async def metadata_web_browsing_node(state:MetadataEnrichmentState):
+    """Browse web for company metadata from LinkedIn and Wikipedia"""
+    browsed = await browse_company_metadata(state.inbound_lead)
+    state.browsed_metadata = browsed["browsed_metadata"]
+    state.wiki_infobox = browsed["wiki_infobox"]
     return state
 
 
-def metadata_enrichment_node(state:MetadataEnrichmentState):
+def _infobox_value(infobox: Dict[str, str], *keys: str) -> str:
+    """First non-empty infobox value among keys, without citation marks and "(2024)" style dates"""
+    for key in keys:
+        value = infobox.get(key, "")
+        value = re.sub(r"\[\s*[\w ]{1,12}\s*\]", "", value)
+        value = re.sub(r"\(\s*\d{4}\s*\)", "", value)
+        value = re.sub(r"\s+", " ", value).strip(" ,;")
+        if value:
+            return value
+    return ""
+
+
+def infobox_facts(infobox: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Fields the Wikipedia infobox states outright
+    
+    Returns:
+        The CompanyMetadata fields found among industry, company_size (only a
+        parseable employee count) and locations (the headquarters)
+    """
+    if not infobox:
+        return {}
+    facts: Dict[str, Any] = {}
+    industry = _infobox_value(infobox, "Industry", "Industries")
+    if industry:
+        facts["industry"] = industry
+    company_size = _infobox_value(infobox, "Number of employees", "Employees")
+    if parse_company_size(company_size) is not None:
+        facts["company_size"] = company_size
+    headquarters = _infobox_value(infobox, "Headquarters", "Location")
+    if headquarters:
+        facts["locations"] = [headquarters]
+    return facts
+
+
+def apply_infobox(result: CompanyMetadata, infobox: Optional[Dict[str, str]]) -> CompanyMetadata:
+    """Model result with the infobox's industry, size and headquarters in place of the model's reading"""
+    facts = infobox_facts(infobox)
+    if "locations" in facts:
+        # Headquarters first, then the other locations the model found
+        facts["locations"] += [location for location in result.locations or []
+                               if location.lower() != facts["locations"][0].lower()]
+    return result.model_copy(update=facts)
+
+
+def validate_metadata(result: CompanyMetadata) -> Optional[str]:
+    """Escalation reason for a metadata result, or None to accept it"""
+    if not result.industry or not result.industry.strip():
+        return "no industry"
+    if result.data_confidence == "low":
+        return "data_confidence low"
+    # Both carry up to 15 points each in the scoring engine
+    if not result.technologies or not result.strategic_focus:
+        return "no technologies/strategic focus"
+    return None
+
+
+async def enrich_company_metadata(company_name: str, browsed_metadata: Optional[str],
+                                  wiki_infobox: Optional[Dict[str, str]] = None) -> CompanyMetadata:
+    """
+    Extract structured company metadata from the browsed text
+    
+    Args:
+        company_name: Name of the company
+        browsed_metadata: Text from browse_company_metadata
+        wiki_infobox: Wikipedia infobox, whose industry, size and headquarters
+            take precedence over the model's reading
+        
+    Returns:
+        CompanyMetadata from the first model tier whose result validates
+    """
     print("Enriching company data...")
     
     # Validate browsed_metadata is not empty
-    if not state.browsed_metadata or state.browsed_metadata.strip() == "":
+    if not browsed_metadata or browsed_metadata.strip() == "":
         print("Warning: No browsed metadata available, using company name only")
-        content = f"Company Name: {state.inbound_lead}\nPlease provide best estimate metadata based on this company name."
+        content = f"Company Name: {company_name}\nPlease provide best estimate metadata based on this company name."
     else:
-        content = state.browsed_metadata
+        content = browsed_metadata
     
-    # Call OpenAI API with enrichment logic
-    response = client.chat.completions.create(model=MODEL_NAME, messages = [
-        {
-            "role": "system",
-            "content": prompts.METADATA_ENRICHMENT_PROMPT
-        },
-        {
-            "role": "user",
-            "content": content
-        }
-    ])
+    # Call the LLM with enrichment logic (browsed text is held to the metadata token budget)
+    messages = (PromptBuilder("metadata")
+                .static(prompts.METADATA_ENRICHMENT_PROMPT)
+                .data("", content)
+                .build())
+    from langchain_core.output_parsers import PydanticOutputParser
     
     parser = PydanticOutputParser(pydantic_object=CompanyMetadata)
-    response_dict = response.choices[0].message.content
-    result = parser.parse(response_dict)
+    
+    async def call_model(model: str) -> CompanyMetadata:
+        response_dict = await chat_completion(agent="metadata", model=model, messages=messages)
+        return apply_infobox(parser.parse(response_dict), wiki_infobox)
+    
+    # Small model first, then the large one (see model_policy)
+    return await run_tiered("metadata", call_model, validate_metadata)
+
+
+@traced("metadata_enrichment_node", kind="node")
+async def metadata_enrichment_node(state:MetadataEnrichmentState):
+    result = await enrich_company_metadata(state.inbound_lead, state.browsed_metadata, state.wiki_infobox)
     
     # Store results in state
     state.industry = result.industry
@@ -232,23 +336,27 @@ def metadata_enrichment_node(state:MetadataEnrichmentState):
     return state
 
 
-# Build the graph
-metadata_graph = StateGraph(MetadataEnrichmentState)
-
-# Register nodes
-metadata_graph.add_node("metadata_web_browsing_node", metadata_web_browsing_node)
-metadata_graph.add_node("metadata_enrichment_node", metadata_enrichment_node)
-
-# Define transitions (edges)
-metadata_graph.add_edge(START, "metadata_web_browsing_node")
-metadata_graph.add_edge("metadata_web_browsing_node", "metadata_enrichment_node")
-metadata_graph.add_edge("metadata_enrichment_node", END)
-
-# Compile the graph
-metadata_graph_compiled = metadata_graph.compile()
+@lru_cache(maxsize=1)
+def get_metadata_graph():
+    """Compiled metadata workflow, built on first use (langgraph is imported here, not at module load)"""
+    from langgraph.graph import StateGraph, START, END
+    
+    metadata_graph = StateGraph(MetadataEnrichmentState)
+    
+    # Register nodes
+    metadata_graph.add_node("metadata_web_browsing_node", metadata_web_browsing_node)
+    metadata_graph.add_node("metadata_enrichment_node", metadata_enrichment_node)
+    
+    # Define transitions (edges)
+    metadata_graph.add_edge(START, "metadata_web_browsing_node")
+    metadata_graph.add_edge("metadata_web_browsing_node", "metadata_enrichment_node")
+    metadata_graph.add_edge("metadata_enrichment_node", END)
+    
+    # Never checkpointed on its own: the pipeline checkpoints per agent node
+    return metadata_graph.compile(checkpointer=False)
 
 
-def run_metadata_enrichment(company_name: str) -> dict:
+async def arun_metadata_enrichment(company_name: str) -> dict:
     """
     Run the metadata enrichment workflow for a company
     
@@ -259,6 +367,11 @@ def run_metadata_enrichment(company_name: str) -> dict:
         Dictionary with enriched metadata
     """
     initial_state = {"inbound_lead": company_name}
-    result = metadata_graph_compiled.invoke(initial_state)
+    result = await get_metadata_graph().ainvoke(initial_state)
     return result
 
+
+def run_metadata_enrichment(company_name: str) -> dict:
+    """Synchronous entry point for scripts; use arun_metadata_enrichment inside an event loop."""
+    return asyncio.run(arun_metadata_enrichment(company_name))
+
@@ -0,0 +1,162 @@
+# agents/model_policy.py
+"""
+Tiered model selection with escalation.
+
+Each agent has an ordered list of tiers to try:
+
+    rules - no model: a deterministic extraction, for agents that provide one
+    small - LLM_SMALL_MODEL, cheaper and faster
+    large - LLM_LARGE_MODEL, the model every agent used before
+
+A tier's result is accepted when the agent's validator accepts it (schema
+valid, data_confidence not low, rep exists, ...); otherwise, or if the tier
+raises, the next tier runs. The last tier's result is returned even if it
+does not validate. Tiers an agent cannot run (no rules extractor) are
+skipped.
+
+Every attempt is recorded per agent and tier (accepted, escalated with the
+reason, errors, latency) so the policy can be tuned from GET
+/metrics/model_policy.
+
+Configuration (environment variables):
+    LLM_SMALL_MODEL / LLM_LARGE_MODEL: model names of the LLM tiers
+    MODEL_POLICY_<AGENT>: comma-separated tiers, e.g. MODEL_POLICY_SCORING=large
+"""
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+LLM_SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "claude-4.5-haiku")
+LLM_LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", "claude-4.5-sonnet")
+
+TIERS = ("rules", "small", "large")
+
+# Default tiers per agent, cheapest first
+MODEL_POLICIES = {
+    "metadata": ["small", "large"],  # Wikipedia infobox facts override the model's reading
+    "opportunity": ["large"],  # free-text analysis, no validator to escalate on
+    "scoring": ["small", "large"],  # also the batch scoring request, on its first LLM tier
+    "scoring_explanation": ["large"],  # free-text recommendation of an engine score
+    "routing": ["small", "large"],
+    "fused": ["large"],  # metadata and score in one response; an invalid one escalates
+}
+DEFAULT_MODEL_POLICY = ["large"]
+
+T = TypeVar("T")
+
+
+def model_policy(agent: str) -> List[str]:
+    """Tiers to try for an agent, from MODEL_POLICY_<AGENT> or MODEL_POLICIES."""
+    override = os.getenv(f"MODEL_POLICY_{agent.upper()}")
+    if override:
+        tiers = [tier.strip().lower() for tier in override.split(",") if tier.strip()]
+        unknown = [tier for tier in tiers if tier not in TIERS]
+        if unknown:
+            raise ValueError(f"MODEL_POLICY_{agent.upper()}: unknown tier(s) {unknown}, expected {TIERS}")
+        return tiers
+    return MODEL_POLICIES.get(agent, DEFAULT_MODEL_POLICY)
+
+
+def tier_model(tier: str) -> Optional[str]:
+    """Model name of an LLM tier (None for rules)."""
+    return {"small": LLM_SMALL_MODEL, "large": LLM_LARGE_MODEL}.get(tier)
+
+
+class ModelPolicyStats:
+    """Per agent and tier outcome counts and latency."""
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, agent: str, tier: str, outcome: str, elapsed_ms: float, reason: str = ""):
+        """Record one attempt; outcome is accepted, escalated, error or final (last tier, not valid)."""
+        with self._lock:
+            stats = self._stats.setdefault((agent, tier), {
+                "attempts": 0, "accepted": 0, "escalated": 0, "errors": 0, "final": 0,
+                "total_ms": 0.0, "escalation_reasons": {},
+            })
+            stats["attempts"] += 1
+            stats[outcome if outcome != "error" else "errors"] += 1
+            stats["total_ms"] += elapsed_ms
+            if reason and outcome != "accepted":
+                reasons = stats["escalation_reasons"]
+                reasons[reason] = reasons.get(reason, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """agent -> tier -> counts, acceptance rate and average latency."""
+        with self._lock:
+            items = [(key, dict(stats, escalation_reasons=dict(stats["escalation_reasons"])))
+                     for key, stats in self._stats.items()]
+        summary: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (agent, tier), stats in items:
+            stats["acceptance_rate"] = round(stats["accepted"] / stats["attempts"], 3)
+            stats["avg_ms"] = round(stats.pop("total_ms") / stats["attempts"], 2)
+            summary.setdefault(agent, {})[tier] = stats
+        return summary
+
+
+_stats = ModelPolicyStats()
+
+
+def get_model_policy_stats() -> ModelPolicyStats:
+    """Return the process-wide model policy stats."""
+    return _stats
+
+
+async def run_tiered(agent: str,
+                     call_model: Callable[[str], Awaitable[T]],
+                     validate: Callable[[T], Optional[str]],
+                     rules: Optional[Callable[[], Optional[T]]] = None) -> T:
+    """
+    Run an agent's step through its model policy.
+
+    Args:
+        agent: Agent name (selects the policy)
+        call_model: Coroutine function taking a model name and returning a result
+        validate: Returns None to accept a result, or the reason to escalate
+        rules: Model-free extraction for the rules tier; returns None when it
+            cannot decide
+
+    Returns:
+        The first accepted result, else the last tier's result
+
+    Raises:
+        The last tier's exception if it failed and no earlier tier produced a result
+    """
+    tiers = [tier for tier in model_policy(agent) if tier != "rules" or rules is not None]
+    if not tiers:
+        tiers = ["large"]
+    fallback: Optional[T] = None
+    has_fallback = False
+    for position, tier in enumerate(tiers):
+        last = position == len(tiers) - 1
+        started = time.perf_counter()
+        try:
+            result = rules() if tier == "rules" else await call_model(tier_model(tier))
+        except Exception as e:
+            _stats.record(agent, tier, "error", (time.perf_counter() - started) * 1000, type(e).__name__)
+            print(f"⚠️ [{agent}] {tier} tier failed: {str(e)[:200]}")
+            if last and not has_fallback:
+                raise
+            continue
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        reason = "no result" if result is None else validate(result)
+        if reason is None:
+            _stats.record(agent, tier, "accepted", elapsed_ms)
+            if position:
+                print(f"⬆️ [{agent}] accepted at {tier} tier")
+            return result
+        if result is not None:
+            fallback, has_fallback = result, True
+        if last:
+            _stats.record(agent, tier, "final", elapsed_ms, reason)
+            break
+        _stats.record(agent, tier, "escalated", elapsed_ms, reason)
+        print(f"⬆️ [{agent}] escalating from {tier} tier: {reason}")
+
+    if not has_fallback:
+        raise ValueError(f"No {agent} result from any model tier")
+    return fallback
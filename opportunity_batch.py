@@ -0,0 +1,182 @@
+# agents/opportunity_batch.py
+"""
+Vectorized opportunity scoring for batches of articles.
+
+Each article is scanned once with the shared keyword matcher; the keyword
+counts of all articles form a sparse (CSR) term-count matrix over the
+signal/category vocabulary. Category and opportunity type scores for the whole
+batch are then computed with NumPy as matrix products against the
+OPPORTUNITY_CATEGORIES table, and give the same results as
+analyze_opportunity_text article by article.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from agents.opportunity_signals import (
+    DEFAULT_OPPORTUNITY_TYPE,
+    OPPORTUNITY_CATEGORIES,
+    OPPORTUNITY_MATCHER,
+    scan_opportunities,
+)
+
+VOCABULARY = OPPORTUNITY_MATCHER.keywords
+KEYWORD_INDEX = {keyword: i for i, keyword in enumerate(VOCABULARY)}
+
+
+def _build_tables():
+    """Compile OPPORTUNITY_CATEGORIES into keyword -> category/type weight matrices."""
+    labels: List[str] = []
+    label_index: Dict[str, int] = {}
+
+    def label_column(label: str) -> int:
+        if label not in label_index:
+            label_index[label] = len(labels)
+            labels.append(label)
+        return label_index[label]
+
+    # Per category: trigger column, default label column, [(type label column, type column)]
+    category_columns = []
+    type_columns = []
+    for category in OPPORTUNITY_CATEGORIES:
+        types = []
+        for label, _ in category["types"]:
+            types.append((label_column(label), len(type_columns)))
+            type_columns.append(label)
+        category_columns.append((label_column(category["default"]), types))
+
+    triggers = np.zeros((len(VOCABULARY), len(OPPORTUNITY_CATEGORIES)))
+    type_keywords = np.zeros((len(VOCABULARY), len(type_columns)))
+    for g, category in enumerate(OPPORTUNITY_CATEGORIES):
+        for keyword in category["triggers"]:
+            triggers[KEYWORD_INDEX[keyword], g] = 1
+    column = 0
+    for category in OPPORTUNITY_CATEGORIES:
+        for _, keywords in category["types"]:
+            for keyword in keywords:
+                type_keywords[KEYWORD_INDEX[keyword], column] = 1
+            column += 1
+    return labels, category_columns, triggers, type_keywords
+
+
+LABELS, CATEGORY_COLUMNS, TRIGGER_MATRIX, TYPE_MATRIX = _build_tables()
+
+
+def build_term_matrix(keyword_counts: List[Dict[str, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a CSR term-count matrix (articles x VOCABULARY).
+
+    Returns:
+        Tuple of (indptr, indices, data) arrays
+    """
+    indptr = np.zeros(len(keyword_counts) + 1, dtype=np.int64)
+    indices: List[int] = []
+    data: List[int] = []
+    for row, counts in enumerate(keyword_counts):
+        indices.extend(KEYWORD_INDEX[keyword] for keyword in counts)
+        data.extend(counts.values())
+        indptr[row + 1] = len(indices)
+    return indptr, np.asarray(indices, dtype=np.int64), np.asarray(data, dtype=np.float64)
+
+
+def sparse_dot(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Multiply a CSR matrix by a dense (vocabulary x columns) weight matrix."""
+    n_rows = len(indptr) - 1
+    n_cols = weights.shape[1]
+    rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+
+    # Weight matrix as CSR so each nonzero count only touches the columns its
+    # keyword contributes to
+    w_rows, w_cols = np.nonzero(weights)
+    w_vals = weights[w_rows, w_cols]
+    w_ptr = np.searchsorted(w_rows, np.arange(weights.shape[0] + 1))
+
+    counts = w_ptr[indices + 1] - w_ptr[indices]
+    entry = np.repeat(np.arange(len(indices)), counts)
+    offsets = np.arange(len(entry)) - np.repeat(np.cumsum(counts) - counts, counts)
+    w_entry = np.repeat(w_ptr[indices], counts) + offsets
+
+    flat = rows[entry] * n_cols + w_cols[w_entry]
+    values = data[entry] * w_vals[w_entry]
+    return np.bincount(flat, weights=values, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+
+def score_opportunity_types(keyword_counts: List[Dict[str, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every opportunity type for a batch of articles at once.
+
+    Args:
+        keyword_counts: Per-article keyword occurrence counts
+
+    Returns:
+        Tuple of (scores, primary): scores is an (articles x LABELS) array of
+        keyword hits per type, primary the LABELS column of each article's
+        primary type (-1 when no category keyword matched)
+    """
+    indptr, indices, data = build_term_matrix(keyword_counts)
+    trigger_hits = sparse_dot(indptr, indices, data, TRIGGER_MATRIX)
+    type_hits = sparse_dot(indptr, indices, data, TYPE_MATRIX)
+
+    n_rows = len(keyword_counts)
+    scores = np.zeros((n_rows, len(LABELS)))
+    primary = np.full(n_rows, -1, dtype=np.int64)
+    for g, (default_column, types) in enumerate(CATEGORY_COLUMNS):
+        active = trigger_hits[:, g] > 0
+        if types:
+            hits = type_hits[:, [type_column for _, type_column in types]]
+            has_type = active & (hits > 0).any(axis=1)
+            for label_column, type_column in types:
+                scores[:, label_column] += np.where(has_type, type_hits[:, type_column], 0)
+            first_type = np.asarray([label_column for label_column, _ in types])[np.argmax(hits > 0, axis=1)]
+            category_primary = np.where(has_type, first_type, default_column)
+        else:
+            has_type = np.zeros(n_rows, dtype=bool)
+            category_primary = np.full(n_rows, default_column)
+        use_default = active & ~has_type
+        scores[:, default_column] += np.where(use_default, trigger_hits[:, g], 0)
+        primary = np.where(active & (primary < 0), category_primary, primary)
+    return scores, primary
+
+
+def analyze_opportunity_texts(news_texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Batch counterpart of analyze_opportunity_text.
+
+    Args:
+        news_texts: Article texts
+
+    Returns:
+        One opportunity dictionary per article, identical to what
+        analyze_opportunity_text returns for that article
+    """
+    scans = [scan_opportunities(text) for text in news_texts]
+    scores, primary = score_opportunity_types([keyword_counts for _, keyword_counts in scans])
+
+    results = []
+    for row, (opportunity_matches, _) in enumerate(scans):
+        opportunity = {
+            "found": False,
+            "summary": "",
+            "details": "",
+            "opportunity_type": "",
+            "opportunity_types": []
+        }
+        if opportunity_matches:
+            opportunity["found"] = True
+            opportunity["opportunity_types"] = _ranked_types(scores[row], primary[row])
+            opportunity["opportunity_type"] = opportunity["opportunity_types"][0]["type"]
+            opportunity["summary"] = opportunity_matches[0].strip()
+            details = "\n".join([m.strip() for m in opportunity_matches[:3]])
+            opportunity["details"] = details[:500] if details else ""
+        results.append(opportunity)
+    return results
+
+
+def _ranked_types(row_scores: np.ndarray, primary_column: int) -> List[Dict[str, Any]]:
+    """Turn one row of type scores into the ranked {type, weight} list."""
+    if primary_column < 0:
+        return [{"type": DEFAULT_OPPORTUNITY_TYPE, "weight": 1.0}]
+    columns = np.flatnonzero(row_scores)
+    total = int(row_scores[columns].sum())
+    ranked = sorted(columns, key=lambda c: (c != primary_column, -row_scores[c]))
+    return [{"type": LABELS[c], "weight": round(int(row_scores[c]) / total, 3)} for c in ranked]
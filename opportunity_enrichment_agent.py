@@ -1,23 +1,25 @@
 from asyncio.log import logger
+import asyncio
 import json
 import os
 import re
-import requests
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import PydanticOutputParser
+import httpx
+from functools import lru_cache
 from pydantic import BaseModel,Field
-from typing import Literal, Optional, Dict, Any, List, Union
+from typing import Literal, Optional, Dict, Any, List, Union, AsyncIterator
 from typing import Any, Optional
-from bs4 import BeautifulSoup
 from agents import prompts
-from langgraph.graph import StateGraph, START, END
+from agents.opportunity_signals import analyze_opportunity_text
+from agents.extraction_pool import get_extraction_pool, html_to_text
 
-import openai
-client = openai.OpenAI(
-    api_key="sk-TE5BPNfSh4IOCNpW3I5EDQ",
-    base_url="http://0.0.0.0:4000"
-)
-MODEL_NAME = "claude-4.5-sonnet"
+from agents.llm_gateway import chat_completion, token_sink
+from agents.web_client import get_web_client
+from agents.prompt_builder import PromptBuilder
+from agents.model_policy import run_tiered
+from agents.tracing import traced
+
+# Overridable to point at a local fake (see start_fakes.py)
+SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")
 
 MIN_NEWS_OPPORTUNITIES = 3
 MIN_LINKEDIN_POSTS = 3
@@ -34,46 +36,47 @@ class OpportunityEnrichmentState(BaseModel):
     enrichment_opportunity: Optional[str] = None
   
 
-def fetch_url( url: str, full_text: bool = False) -> str:
+@traced("fetch", kind="http", args=("url",))
+async def fetch_url_raw(url: str) -> tuple[bytes, str | None]:
+        """Fetch a URL and return the raw response body and its encoding."""
+        response = await get_web_client().get(url)
+        response.raise_for_status()
+        return response.content, response.encoding
+
+
+async def fetch_url( url: str, full_text: bool = False) -> str:
         """Fetch content from a URL and extract text."""
         try:
-            USER_AGENT = "Mozilla/5.0"
-            headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            text = soup.get_text(separator=" ", strip=True)
+            raw, encoding = await fetch_url_raw(url)
+            text = html_to_text(raw, encoding)
             logger.info(f"Successfully fetched {url}")
             return text if full_text else text[:2000]
-        except requests.Timeout:
+        except httpx.TimeoutException:
             return "Timeout error while fetching URL"
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return f"HTTP error occurred: {e}"
         except Exception as e:
             return f"An unexpected error occurred: {e}"
 
 
 
-def search_web( query: str, num_results: int = 2) -> dict[str, Any] | None:
+@traced("search", kind="search", args=("query",))
+async def search_web( query: str, num_results: int = 2) -> dict[str, Any] | None:
         """Search the web using the Serper API."""
         payload = json.dumps({"q": query, "num": num_results})
-        USER_AGENT = "Mozilla/5.0"
-        SERPER_URL = "https://google.serper.dev/search"
         headers = {
             "X-API-KEY": os.getenv("SERPER_API_KEY"),
             "Content-Type": "application/json"
            
         }
         try:
-            response = requests.post(
-                SERPER_URL, headers=headers, data=payload, timeout=30
-            )
+            response = await get_web_client().post(SERPER_URL, headers=headers, content=payload)
             response.raise_for_status()
             return response.json()
-        except requests.Timeout:
+        except httpx.TimeoutException:
             logger.error("Search request timed out")
             return {"organic": []}
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
             return {"organic": []}
         except Exception as e:
@@ -92,224 +95,76 @@ def analyze_news_for_opportunities(news_text: str, company_name: str) -> Dict[st
     Returns:
         Dictionary with extracted opportunity information
     """
-    # Expanded opportunity signals to include broader business opportunities
-    opportunity_signals = [
-        # Strategic initiatives
-        "partnership", "collaboration", "launch", "expand", "invest", 
-        "acquisition", "merger", "joint venture", "new product", "innovation",
-        "market entry", "strategic", "initiative", "development", "growth",
-        
-        # IT-specific terms
-        "digital transformation", "modernization", "cloud", "migration",
-        "data analytics", "big data", "automation", "AI", "machine learning",
-        "cybersecurity", "security", "blockchain", "IoT", "internet of things",
-        "software", "application", "platform", "CRM", "ERP", "infrastructure",
-        "IT strategy", "technology stack", "DevOps", "agile", "microservices",
-        "API", "integration", "legacy system", "mobile app", "web development",
-        
-        # Marketing & Sales opportunities
-        "marketing campaign", "brand launch", "rebrand", "market expansion",
-        "sales growth", "customer acquisition", "loyalty program", "e-commerce",
-        "digital marketing", "advertising", "social media", "campaign",
-        
-        # Financial opportunities
-        "funding", "investment", "IPO", "public offering", "capital raise",
-        "financing", "cost reduction", "efficiency", "revenue growth",
-        "profitability", "budget increase", "financial restructuring",
-        
-        # Operations & Supply Chain
-        "supply chain", "logistics", "operational efficiency", "outsourcing",
-        "manufacturing", "distribution", "inventory management", "procurement",
-        "warehouse", "facilities", "expansion", "relocation", "consolidation",
-        
-        # Human Resources
-        "hiring", "talent acquisition", "training program", "skill development",
-        "workforce expansion", "organization restructure", "management change",
-        "leadership", "executive appointment", "cultural transformation",
-        
-        # Product & Service Development
-        "product launch", "new service", "R&D", "research and development",
-        "innovation center", "product redesign", "service improvement",
-        "customer experience", "user experience", "design", "prototype",
-        
-        # Sustainability & ESG
-        "sustainability", "green initiative", "carbon neutral", "ESG",
-        "environmental", "social responsibility", "governance", "renewable",
-        "circular economy", "ethical", "sustainable development",
-        
-        # Strategic Alliances & Partnerships
-        "strategic alliance", "industry partnership", "channel partner",
-        "distribution agreement", "licensing agreement", "cross-industry",
-        "collaborative venture", "co-development", "business ecosystem",
-        
-        # Global Expansion
-        "global expansion", "international market", "new territory", "overseas",
-        "cross-border", "new country", "regional headquarters", "localization",
-        "foreign investment", "international presence", "global reach",
-        
-        # Regulatory & Compliance
-        "regulatory compliance", "legal requirement", "industry standard",
-        "certification", "accreditation", "regulatory change", "policy adaptation"
-    ]
-    
-    opportunity = {
-        "found": False,
-        "summary": "",
-        "details": "",
-        "opportunity_type": ""
-    }
+    return analyze_opportunity_text(news_text)
+
+
+def analyze_news_batch_for_opportunities(news_texts: List[str], company_name: str = "") -> List[Dict[str, Any]]:
+    """
+    Analyze many news texts at once (e.g. when enriching a batch of companies).
     
-    # Check if any opportunity signals are present
-    opportunity_matches = []
-    for signal in opportunity_signals:
-        pattern = re.compile(r'(.{0,100}' + signal + r'.{0,100})', re.IGNORECASE | re.DOTALL)
-        matches = pattern.findall(news_text)
-        if matches:
-            opportunity_matches.extend(matches)
+    Category scores for the whole batch are computed with NumPy from a sparse
+    term-count matrix; results match analyze_news_for_opportunities per article.
     
-    if opportunity_matches:
-        opportunity["found"] = True
-        
-        # Determine opportunity type with broader categories
-        # IT opportunities
-        if any(x in news_text.lower() for x in ["digital transformation", "modernization", "cloud", "cybersecurity",
-                                             "ai", "machine learning", "data analytics", "big data", 
-                                             "crm", "erp", "mobile app", "software", "application"]):
-            if any(x in news_text.lower() for x in ["digital transformation", "modernization"]):
-                opportunity["opportunity_type"] = "Digital Transformation"
-            elif any(x in news_text.lower() for x in ["cloud", "migration", "aws", "azure", "google cloud"]):
-                opportunity["opportunity_type"] = "Cloud Migration"
-            elif any(x in news_text.lower() for x in ["data analytics", "big data", "business intelligence"]):
-                opportunity["opportunity_type"] = "Data Analytics"
-            elif any(x in news_text.lower() for x in ["cybersecurity", "security", "compliance"]):
-                opportunity["opportunity_type"] = "Cybersecurity"
-            elif any(x in news_text.lower() for x in ["ai", "machine learning", "automation"]):
-                opportunity["opportunity_type"] = "AI/ML Implementation"
-            elif any(x in news_text.lower() for x in ["crm", "customer relationship", "salesforce"]):
-                opportunity["opportunity_type"] = "CRM Implementation"
-            elif any(x in news_text.lower() for x in ["erp", "enterprise resource", "sap"]):
-                opportunity["opportunity_type"] = "ERP Implementation" 
-            elif any(x in news_text.lower() for x in ["mobile app", "application development"]):
-                opportunity["opportunity_type"] = "Application Development"
-            else:
-                opportunity["opportunity_type"] = "IT Strategic Initiative"
-                
-        # Marketing & Sales opportunities
-        elif any(x in news_text.lower() for x in ["marketing campaign", "brand launch", "rebrand", "market expansion",
-                                              "sales growth", "customer acquisition", "loyalty program", "e-commerce",
-                                              "digital marketing", "advertising", "social media", "campaign"]):
-            if any(x in news_text.lower() for x in ["brand launch", "rebrand"]):
-                opportunity["opportunity_type"] = "Brand Development"
-            elif any(x in news_text.lower() for x in ["market expansion", "new market", "enter market"]):
-                opportunity["opportunity_type"] = "Market Expansion"
-            elif any(x in news_text.lower() for x in ["e-commerce", "online store", "digital commerce"]):
-                opportunity["opportunity_type"] = "E-commerce Development"
-            elif any(x in news_text.lower() for x in ["social media", "digital marketing", "online advertising"]):
-                opportunity["opportunity_type"] = "Digital Marketing"
-            else:
-                opportunity["opportunity_type"] = "Marketing & Sales Initiative"
-                
-        # Financial opportunities
-        elif any(x in news_text.lower() for x in ["funding", "investment", "ipo", "public offering", "capital raise",
-                                               "financing", "cost reduction", "efficiency", "revenue growth",
-                                               "profitability", "budget increase", "financial restructuring"]):
-            if any(x in news_text.lower() for x in ["funding", "investment", "capital raise", "financing"]):
-                opportunity["opportunity_type"] = "Capital Investment"
-            elif any(x in news_text.lower() for x in ["ipo", "public offering"]):
-                opportunity["opportunity_type"] = "Public Offering"
-            elif any(x in news_text.lower() for x in ["cost reduction", "efficiency", "financial restructuring"]):
-                opportunity["opportunity_type"] = "Financial Optimization"
-            else:
-                opportunity["opportunity_type"] = "Financial Initiative"
-                
-        # Operations & Supply Chain opportunities
-        elif any(x in news_text.lower() for x in ["supply chain", "logistics", "operational efficiency", "outsourcing",
-                                              "manufacturing", "distribution", "inventory management", "procurement",
-                                              "warehouse", "facilities", "expansion", "relocation"]):
-            if any(x in news_text.lower() for x in ["supply chain", "logistics"]):
-                opportunity["opportunity_type"] = "Supply Chain Optimization"
-            elif any(x in news_text.lower() for x in ["manufacturing", "production"]):
-                opportunity["opportunity_type"] = "Manufacturing Enhancement"
-            elif any(x in news_text.lower() for x in ["warehouse", "facilities", "expansion", "relocation"]):
-                opportunity["opportunity_type"] = "Facilities Expansion"
-            else:
-                opportunity["opportunity_type"] = "Operational Improvement"
-                
-        # Human Resources opportunities
-        elif any(x in news_text.lower() for x in ["hiring", "talent acquisition", "training program", "skill development",
-                                              "workforce expansion", "organization restructure", "management change",
-                                              "leadership", "executive appointment", "cultural transformation"]):
-            if any(x in news_text.lower() for x in ["training program", "skill development"]):
-                opportunity["opportunity_type"] = "Training & Development"
-            elif any(x in news_text.lower() for x in ["hiring", "talent acquisition", "workforce expansion"]):
-                opportunity["opportunity_type"] = "Talent Acquisition"
-            elif any(x in news_text.lower() for x in ["organization restructure", "management change", "leadership"]):
-                opportunity["opportunity_type"] = "Organizational Change"
-            else:
-                opportunity["opportunity_type"] = "HR Initiative"
-                
-        # Product & Service Development opportunities
-        elif any(x in news_text.lower() for x in ["product launch", "new service", "r&d", "research and development",
-                                             "innovation center", "product redesign", "service improvement",
-                                             "customer experience", "user experience", "design", "prototype"]):
-            if any(x in news_text.lower() for x in ["product launch", "new product"]):
-                opportunity["opportunity_type"] = "Product Launch"
-            elif any(x in news_text.lower() for x in ["new service", "service offering"]):
-                opportunity["opportunity_type"] = "Service Development"
-            elif any(x in news_text.lower() for x in ["r&d", "research and development", "innovation center"]):
-                opportunity["opportunity_type"] = "R&D Initiative"
-            elif any(x in news_text.lower() for x in ["customer experience", "user experience"]):
-                opportunity["opportunity_type"] = "CX/UX Enhancement"
-            else:
-                opportunity["opportunity_type"] = "Product/Service Innovation"
-                
-        # Sustainability & ESG opportunities
-        elif any(x in news_text.lower() for x in ["sustainability", "green initiative", "carbon neutral", "esg",
-                                             "environmental", "social responsibility", "governance", "renewable",
-                                             "circular economy", "ethical", "sustainable development"]):
-            opportunity["opportunity_type"] = "Sustainability/ESG Initiative"
-                
-        # Strategic Alliances & Partnerships
-        elif any(x in news_text.lower() for x in ["strategic alliance", "industry partnership", "channel partner",
-                                             "distribution agreement", "licensing agreement", "cross-industry",
-                                             "collaborative venture", "co-development", "business ecosystem",
-                                             "partnership", "collaboration", "joint venture"]):
-            opportunity["opportunity_type"] = "Strategic Partnership"
-                
-        # Global Expansion
-        elif any(x in news_text.lower() for x in ["global expansion", "international market", "new territory", "overseas",
-                                             "cross-border", "new country", "regional headquarters", "localization",
-                                             "foreign investment", "international presence", "global reach"]):
-            opportunity["opportunity_type"] = "Global Expansion"
-                
-        # Mergers & Acquisitions
-        elif any(x in news_text.lower() for x in ["acquisition", "merger", "takeover"]):
-            opportunity["opportunity_type"] = "M&A Activity"
-                
-        # Regulatory & Compliance
-        elif any(x in news_text.lower() for x in ["regulatory compliance", "legal requirement", "industry standard",
-                                             "certification", "accreditation", "regulatory change", "policy adaptation"]):
-            opportunity["opportunity_type"] = "Regulatory & Compliance"
-        
-        # General growth & expansion
-        elif any(x in news_text.lower() for x in ["expansion", "growth", "new market"]):
-            opportunity["opportunity_type"] = "Business Expansion"
+    Args:
+        news_texts: The text content of the news articles
+        company_name: The company name for context
         
-        # Default for other opportunities
-        else:
-            opportunity["opportunity_type"] = "Strategic Business Initiative"
+    Returns:
+        List of opportunity dictionaries, one per article
+    """
+    from agents.opportunity_batch import analyze_opportunity_texts
+    return analyze_opportunity_texts(news_texts)
+
+
+async def extract_news_opportunities(results: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Fetch each search result's article and extract opportunity information.
+    
+    Articles are fetched concurrently on the event loop and each is handed to
+    the extraction process pool as soon as it arrives, so parsing one article
+    overlaps fetching the others.
+    
+    Args:
+        results: Search results, each with a "link"
         
-        # Create a summary from the first match
-        if opportunity_matches:
-            opportunity["summary"] = opportunity_matches[0].strip()
-            
-        # Collect details from all matches
-        details = "\n".join([m.strip() for m in opportunity_matches[:3]])
-        opportunity["details"] = details[:500] if details else ""
+    Returns:
+        One compact extraction result per search result (None if the fetch
+        failed or the page looks like a job posting), in input order
+    """
+    pool = get_extraction_pool()
     
-    return opportunity
+    async def extract(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            raw, encoding = await fetch_url_raw(result.get("link"))
+        except Exception as e:
+            logger.error(f"Failed to fetch {result.get('link')}: {e}")
+            return None
+        try:
+            info = await pool.asubmit(raw, encoding)
+        except Exception as e:
+            logger.error(f"Article extraction failed: {e}")
+            return None
+        # Skip if it's likely a job posting based on content
+        return None if info["is_job_posting"] else info
+    
+    return list(await asyncio.gather(*(extract(result) for result in results)))
+
+
+def build_news_item(result: Dict[str, Any], opportunity_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a news opportunity entry from a search result and its analysis."""
+    return {
+        "title": result.get("title", ""),
+        "source": result.get("link", ""),
+        "snippet": result.get("snippet", ""),
+        "date": result.get("date", ""),
+        "opportunity_type": opportunity_info["opportunity_type"],
+        "opportunity_types": opportunity_info["opportunity_types"],
+        "opportunity_summary": opportunity_info["summary"],
+        "opportunity_details": opportunity_info["details"]
+    }
+
 
-def opportunity_news_browsing_node(state:OpportunityEnrichmentState):
+async def browse_news_opportunities(company_name: str) -> List[Dict[str, Any]]:
     """
     Fetch recent news about a company and analyze for business opportunities.
     
@@ -320,46 +175,27 @@ def opportunity_news_browsing_node(state:OpportunityEnrichmentState):
         List of dictionaries containing news and business opportunities
     """
     # Broader search query for business opportunities, not just IT-focused
-    company_name=state.processed_data
-
     search_query = f"{company_name} news business growth expansion partnership investment innovation"
-    search_results = search_web(search_query, num_results=MIN_NEWS_OPPORTUNITIES * 3)
+    search_results = await search_web(search_query, num_results=MIN_NEWS_OPPORTUNITIES * 3)
     
     news_opportunities = []
     
     if not search_results or "organic" not in search_results:
         return news_opportunities
     
-    for result in search_results.get("organic", []):
-        if "link" not in result:
-            continue
-            
-        # Skip job listings
-        if any(x in result.get("link", "").lower() for x in ["job", "career", "vacancy", "hiring"]):
-            continue
-            
-        # Fetch the news article
-        news_text =  fetch_url(result.get("link"), full_text=True)
-        
-        # Skip if it's likely a job posting based on content
-        if any(x in news_text.lower() for x in ["apply now", "job description", "responsibilities:", "requirements:", "qualifications:"]):
-            continue
-            
-        # Analyze the news for business opportunities
-        opportunity_info =  analyze_news_for_opportunities(news_text, company_name)
-        
+    # Skip results without a link and job listings
+    candidates = [
+        result for result in search_results.get("organic", [])
+        if "link" in result
+        and not any(x in result.get("link", "").lower() for x in ["job", "career", "vacancy", "hiring"])
+    ]
+    
+    # Fetch the news articles and analyze them for business opportunities
+    # (parsing and analysis run in the extraction process pool)
+    for result, opportunity_info in zip(candidates, await extract_news_opportunities(candidates)):
         # Only include if opportunities were found
-        if opportunity_info["found"]:
-            news_item = {
-                "title": result.get("title", ""),
-                "source": result.get("link", ""),
-                "snippet": result.get("snippet", ""),
-                "date": result.get("date", ""),
-                "opportunity_type": opportunity_info["opportunity_type"],
-                "opportunity_summary": opportunity_info["summary"],
-                "opportunity_details": opportunity_info["details"]
-            }
-            news_opportunities.append(news_item)
+        if opportunity_info and opportunity_info["found"]:
+            news_opportunities.append(build_news_item(result, opportunity_info))
     
     # If we don't have enough news opportunities, try additional searches
     if len(news_opportunities) < MIN_NEWS_OPPORTUNITIES:
@@ -380,42 +216,20 @@ def opportunity_news_browsing_node(state:OpportunityEnrichmentState):
             if len(news_opportunities) >= MIN_NEWS_OPPORTUNITIES:
                 break
                 
-            additional_results =  search_web(query, num_results=5)
+            additional_results = await search_web(query, num_results=5)
             if additional_results and "organic" in additional_results:
-                for result in additional_results.get("organic", []):
-                    if "link" not in result:
-                        continue
-                        
+                candidates = [
+                    result for result in additional_results.get("organic", [])
+                    if "link" in result
                     # Skip if we already have this result
-                    if any(news["source"] == result.get("link", "") for news in news_opportunities):
-                        continue
-                        
+                    and not any(news["source"] == result.get("link", "") for news in news_opportunities)
                     # Skip job listings
-                    if any(x in result.get("link", "").lower() for x in ["job", "career", "vacancy", "hiring"]):
-                        continue
-                        
-                    # Fetch the news article
-                    news_text =  fetch_url(result.get("link"), full_text=True)
-                    
-                    # Skip if it's likely a job posting based on content
-                    if any(x in news_text.lower() for x in ["apply now", "job description", "responsibilities:", "requirements:", "qualifications:"]):
-                        continue
-                        
-                    # Analyze the news for business opportunities
-                    opportunity_info =  analyze_news_for_opportunities(news_text, company_name)
-                    
+                    and not any(x in result.get("link", "").lower() for x in ["job", "career", "vacancy", "hiring"])
+                ]
+                for result, opportunity_info in zip(candidates, await extract_news_opportunities(candidates)):
                     # Only include if opportunities were found
-                    if opportunity_info["found"]:
-                        news_item = {
-                            "title": result.get("title", ""),
-                            "source": result.get("link", ""),
-                            "snippet": result.get("snippet", ""),
-                            "date": result.get("date", ""),
-                            "opportunity_type": opportunity_info["opportunity_type"],
-                            "opportunity_summary": opportunity_info["summary"],
-                            "opportunity_details": opportunity_info["details"]
-                        }
-                        news_opportunities.append(news_item)
+                    if opportunity_info and opportunity_info["found"]:
+                        news_opportunities.append(build_news_item(result, opportunity_info))
     
     # If we still don't have enough opportunities, add placeholders
     if len(news_opportunities) < MIN_NEWS_OPPORTUNITIES:
@@ -431,12 +245,17 @@ def opportunity_news_browsing_node(state:OpportunityEnrichmentState):
                 "opportunity_details": "No details available"
             }
             news_opportunities.append(placeholder_news)
-    state.browsed_opportunity_from_news=news_opportunities  
     
+    return news_opportunities
+
+
+@traced("opportunity_news_browsing_node", kind="node")
+async def opportunity_news_browsing_node(state:OpportunityEnrichmentState):
+    state.browsed_opportunity_from_news = await browse_news_opportunities(state.processed_data)
     return state
 
 
-def opportunity_linkedin_browsing_node(state:OpportunityEnrichmentState):
+async def browse_linkedin_opportunities(company_name: str) -> Dict[str, Any]:
     """
     Extract LinkedIn company information.
     
@@ -447,11 +266,7 @@ def opportunity_linkedin_browsing_node(state:OpportunityEnrichmentState):
         Dictionary with about and recent posts
     """
     # Search for the company's LinkedIn page
-    company_name=state.processed_data
-
-
     search_query = f"{company_name} company linkedin"
-    search_results = search_web(search_query)
     
     linkedin_data = {
         "company_name": company_name,
@@ -462,8 +277,11 @@ def opportunity_linkedin_browsing_node(state:OpportunityEnrichmentState):
     # Try to get posts by searching for them - increase search results to get at least MIN_LINKEDIN_POSTS
     posts_search_query = f"site:linkedin.com/posts {company_name}"
     
-    # First attempt with more results
-    posts_results =  search_web(posts_search_query, num_results=MIN_LINKEDIN_POSTS * 2)
+    # First attempt with more results (issued concurrently with the company page search)
+    search_results, posts_results = await asyncio.gather(
+        search_web(search_query),
+        search_web(posts_search_query, num_results=MIN_LINKEDIN_POSTS * 2),
+    )
     
     if posts_results and "organic" in posts_results:
         for result in posts_results.get("organic", []):
@@ -489,7 +307,7 @@ def opportunity_linkedin_browsing_node(state:OpportunityEnrichmentState):
             if len(linkedin_data["recent_posts"]) >= MIN_LINKEDIN_POSTS:
                 break
                 
-            additional_results =  search_web(query, num_results=MIN_LINKEDIN_POSTS)
+            additional_results = await search_web(query, num_results=MIN_LINKEDIN_POSTS)
             if additional_results and "organic" in additional_results:
                 for result in additional_results.get("organic", []):
                     if "linkedin.com/posts/" in result.get("link", ""):
@@ -514,58 +332,83 @@ def opportunity_linkedin_browsing_node(state:OpportunityEnrichmentState):
                 "url": ""
             }
             linkedin_data["recent_posts"].append(placeholder_post)
-    state.browsed_opportunity_from_linkedin=linkedin_data
 
+    return linkedin_data
+
+
+@traced("opportunity_linkedin_browsing_node", kind="node")
+async def opportunity_linkedin_browsing_node(state:OpportunityEnrichmentState):
+    state.browsed_opportunity_from_linkedin = await browse_linkedin_opportunities(state.processed_data)
     return state
 
 
-def opportunity_enrichment_node(state:OpportunityEnrichmentState):
+async def analyze_opportunities(company_name: str, news: List[Dict[str, Any]],
+                                linkedin: Dict[str, Any]) -> str:
+    """
+    Write the opportunity analysis for a company from its news and LinkedIn data
+    
+    Args:
+        company_name: Name of the company
+        news: News opportunities from browse_news_opportunities
+        linkedin: LinkedIn data from browse_linkedin_opportunities
+        
+    Returns:
+        The analysis text
+    """
     print("Enriching opportunity data...")
     # Enrichment logic here
     print("Enriching company data...")
     # Insert enrichment logic here
-    merged_opportunity = state.browsed_opportunity_from_linkedin.copy()
-    merged_opportunity["news_opportunities"] = state.browsed_opportunity_from_news
-
-# Step 2: Convert to a string (JSON format is most LLM-friendly)
-    result_string = json.dumps(merged_opportunity)
-    response = client.chat.completions.create(model="claude-4.5-sonnet", messages = [
-            {
-            "role": "system",
-            "content": prompts.OPPORTUNITY_ENRICHMENT_PROMPT
-        },
-        {
-            "role": "user",
-            "content": "Company: " + state.processed_data + "\n" + result_string
-        }
-    ])
-    response_dict=response.choices[0].message.content
-    state.enrichment_opportunity=response_dict
-    return state
-
+    merged_opportunity = (linkedin or {}).copy()
+    merged_opportunity["news_opportunities"] = news
 
-# Build the graph
-graph = StateGraph(OpportunityEnrichmentState)
-
-# Register nodes
-
-
-graph.add_node("opportunity_news_browsing_node", opportunity_news_browsing_node)
-graph.add_node("opportunity_linkedin_browsing_node", opportunity_linkedin_browsing_node)
-graph.add_node("opportunity_enrichment_node", opportunity_enrichment_node)
+# Step 2: Static prompt first, then the compact (placeholder-free) JSON data
+    messages = (PromptBuilder("opportunity")
+                .static(prompts.OPPORTUNITY_ENRICHMENT_PROMPT)
+                .data("Company", company_name)
+                .data("", merged_opportunity)
+                .build())
+    
+    async def call_model(model: str) -> str:
+        return await chat_completion(agent="opportunity", model=model, messages=messages)
+    
+    # Large model by default; a cheaper tier is accepted if it returns any analysis (see model_policy)
+    return await run_tiered(
+        "opportunity", call_model, lambda text: None if text and text.strip() else "empty analysis"
+    )
 
-# Define transitions (edges)
-graph.add_edge(START, "opportunity_news_browsing_node")
-graph.add_edge("opportunity_news_browsing_node", "opportunity_linkedin_browsing_node")
-graph.add_edge("opportunity_linkedin_browsing_node", "opportunity_enrichment_node")
-graph.add_edge("opportunity_enrichment_node", END)
 
+@traced("opportunity_enrichment_node", kind="node")
+async def opportunity_enrichment_node(state:OpportunityEnrichmentState):
+    state.enrichment_opportunity = await analyze_opportunities(
+        state.processed_data, state.browsed_opportunity_from_news, state.browsed_opportunity_from_linkedin
+    )
+    return state
 
-opportunity_enrichment_graph = graph.compile()
 
+@lru_cache(maxsize=1)
+def get_opportunity_enrichment_graph():
+    """Compiled opportunity workflow, built on first use (langgraph is imported here, not at module load)"""
+    from langgraph.graph import StateGraph, START, END
+    
+    graph = StateGraph(OpportunityEnrichmentState)
+    
+    # Register nodes
+    graph.add_node("opportunity_news_browsing_node", opportunity_news_browsing_node)
+    graph.add_node("opportunity_linkedin_browsing_node", opportunity_linkedin_browsing_node)
+    graph.add_node("opportunity_enrichment_node", opportunity_enrichment_node)
+    
+    # Define transitions (edges)
+    graph.add_edge(START, "opportunity_news_browsing_node")
+    graph.add_edge("opportunity_news_browsing_node", "opportunity_linkedin_browsing_node")
+    graph.add_edge("opportunity_linkedin_browsing_node", "opportunity_enrichment_node")
+    graph.add_edge("opportunity_enrichment_node", END)
+    
+    # Never checkpointed on its own: the pipeline checkpoints per agent node
+    return graph.compile(checkpointer=False)
 
 
-def run_opportunity_enrichment(company_name: str) -> dict:
+async def arun_opportunity_enrichment(company_name: str) -> dict:
     """
     Run the opportunity enrichment workflow for a company
     
@@ -576,5 +419,58 @@ def run_opportunity_enrichment(company_name: str) -> dict:
         Dictionary with opportunity data
     """
     initial_state = {"processed_data": company_name}
-    result = opportunity_enrichment_graph.invoke(initial_state)
+    result = await get_opportunity_enrichment_graph().ainvoke(initial_state)
     return result
+
+
+async def astream_opportunity_enrichment(company_name: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the opportunity enrichment workflow, yielding progress events
+    
+    Args:
+        company_name: Name of the company to find opportunities for
+        
+    Yields:
+        {"event": "stage", "stage": <node name>} as each node finishes,
+        {"event": "token", "text": <delta>} as enrichment_opportunity streams in,
+        and finally {"event": "result", "result": <same dict as arun_opportunity_enrichment>}
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def on_token(text: str):
+        queue.put_nowait({"event": "token", "text": text})
+    
+    async def run() -> dict:
+        final_state = {}
+        with token_sink(on_token, agent="opportunity"):
+            async for mode, chunk in get_opportunity_enrichment_graph().astream(
+                {"processed_data": company_name}, stream_mode=["updates", "values"]
+            ):
+                if mode == "updates":
+                    for node in chunk:
+                        queue.put_nowait({"event": "stage", "stage": node})
+                else:
+                    final_state = chunk
+        return final_state
+    
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            break
+        while not queue.empty():
+            yield queue.get_nowait()
+        yield {"event": "result", "result": task.result()}
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def run_opportunity_enrichment(company_name: str) -> dict:
+    """Synchronous entry point for scripts; use arun_opportunity_enrichment inside an event loop."""
+    return asyncio.run(arun_opportunity_enrichment(company_name))
@@ -0,0 +1,410 @@
+# agents/opportunity_signals.py
+"""
+Opportunity signal vocabulary and keyword matching for news analysis.
+
+The signal list and the opportunity type table are compiled once, at import
+time, into a single trie-shaped regular expression. One scan over an article
+finds every keyword occurrence (including overlapping ones such as "expansion"
+inside "market expansion"), which yields both the signal context windows and
+the keyword counts used to score every opportunity type.
+"""
+import re
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Expanded opportunity signals to include broader business opportunities
+OPPORTUNITY_SIGNALS = [
+    # Strategic initiatives
+    "partnership", "collaboration", "launch", "expand", "invest",
+    "acquisition", "merger", "joint venture", "new product", "innovation",
+    "market entry", "strategic", "initiative", "development", "growth",
+
+    # IT-specific terms
+    "digital transformation", "modernization", "cloud", "migration",
+    "data analytics", "big data", "automation", "AI", "machine learning",
+    "cybersecurity", "security", "blockchain", "IoT", "internet of things",
+    "software", "application", "platform", "CRM", "ERP", "infrastructure",
+    "IT strategy", "technology stack", "DevOps", "agile", "microservices",
+    "API", "integration", "legacy system", "mobile app", "web development",
+
+    # Marketing & Sales opportunities
+    "marketing campaign", "brand launch", "rebrand", "market expansion",
+    "sales growth", "customer acquisition", "loyalty program", "e-commerce",
+    "digital marketing", "advertising", "social media", "campaign",
+
+    # Financial opportunities
+    "funding", "investment", "IPO", "public offering", "capital raise",
+    "financing", "cost reduction", "efficiency", "revenue growth",
+    "profitability", "budget increase", "financial restructuring",
+
+    # Operations & Supply Chain
+    "supply chain", "logistics", "operational efficiency", "outsourcing",
+    "manufacturing", "distribution", "inventory management", "procurement",
+    "warehouse", "facilities", "expansion", "relocation", "consolidation",
+
+    # Human Resources
+    "hiring", "talent acquisition", "training program", "skill development",
+    "workforce expansion", "organization restructure", "management change",
+    "leadership", "executive appointment", "cultural transformation",
+
+    # Product & Service Development
+    "product launch", "new service", "R&D", "research and development",
+    "innovation center", "product redesign", "service improvement",
+    "customer experience", "user experience", "design", "prototype",
+
+    # Sustainability & ESG
+    "sustainability", "green initiative", "carbon neutral", "ESG",
+    "environmental", "social responsibility", "governance", "renewable",
+    "circular economy", "ethical", "sustainable development",
+
+    # Strategic Alliances & Partnerships
+    "strategic alliance", "industry partnership", "channel partner",
+    "distribution agreement", "licensing agreement", "cross-industry",
+    "collaborative venture", "co-development", "business ecosystem",
+
+    # Global Expansion
+    "global expansion", "international market", "new territory", "overseas",
+    "cross-border", "new country", "regional headquarters", "localization",
+    "foreign investment", "international presence", "global reach",
+
+    # Regulatory & Compliance
+    "regulatory compliance", "legal requirement", "industry standard",
+    "certification", "accreditation", "regulatory change", "policy adaptation"
+]
+
+# Characters of context kept on each side of a signal hit
+SIGNAL_CONTEXT_CHARS = 100
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Build a regex alternation shaped like a prefix trie of `words`.
+
+    Shared prefixes are factored out ("invest(?:ment)?") so the regex engine
+    never re-tries the same characters for sibling keywords.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        is_word_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_word_end:
+            # Greedy optional group - the longest keyword at a position wins
+            body = ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Case-insensitive multi-keyword matcher that scans a text once.
+
+    `finditer` reports every vocabulary keyword occurring in the text, including
+    keywords that overlap or share a start position with a longer keyword.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+        # Zero-width lookahead so the scan advances one position at a time and
+        # overlapping hits ("security" inside "cybersecurity") are not consumed
+        trie = "(?=(" + _trie_pattern(self.keywords) + "))"
+        self.pattern = re.compile(trie)
+        # Only used when lowercasing would shift character offsets
+        self.pattern_ignorecase = re.compile(trie, re.IGNORECASE)
+        # Longest hit at a position -> every keyword that is a prefix of it
+        self._prefix_keywords = {
+            word: [k for k in self.keywords if word.startswith(k)] for word in self.keywords
+        }
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, keyword) for each keyword occurrence, in text order."""
+        prefix_keywords = self._prefix_keywords
+        # Lowercasing once and matching case-sensitively is several times faster
+        # than re.IGNORECASE, as long as offsets still line up with `text`
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self.pattern.finditer(lowered)
+        else:
+            matches = self.pattern_ignorecase.finditer(text)
+        for match in matches:
+            start = match.start()
+            for keyword in prefix_keywords[match.group(1).lower()]:
+                yield start, start + len(keyword), keyword
+
+
+SIGNAL_KEYWORDS = frozenset(signal.lower() for signal in OPPORTUNITY_SIGNALS)
+
+# Opportunity type classification table.
+# Categories are checked in order; the first category with a trigger keyword in
+# the article decides the primary type: its first matching sub-type, or the
+# category default when no sub-type keyword is present.
+OPPORTUNITY_CATEGORIES = [
+    {
+        "category": "Technology & IT",
+        "triggers": ["digital transformation", "modernization", "cloud", "cybersecurity",
+                     "ai", "machine learning", "data analytics", "big data",
+                     "crm", "erp", "mobile app", "software", "application"],
+        "types": [
+            ("Digital Transformation", ["digital transformation", "modernization"]),
+            ("Cloud Migration", ["cloud", "migration", "aws", "azure", "google cloud"]),
+            ("Data Analytics", ["data analytics", "big data", "business intelligence"]),
+            ("Cybersecurity", ["cybersecurity", "security", "compliance"]),
+            ("AI/ML Implementation", ["ai", "machine learning", "automation"]),
+            ("CRM Implementation", ["crm", "customer relationship", "salesforce"]),
+            ("ERP Implementation", ["erp", "enterprise resource", "sap"]),
+            ("Application Development", ["mobile app", "application development"]),
+        ],
+        "default": "IT Strategic Initiative",
+    },
+    {
+        "category": "Marketing & Sales",
+        "triggers": ["marketing campaign", "brand launch", "rebrand", "market expansion",
+                     "sales growth", "customer acquisition", "loyalty program", "e-commerce",
+                     "digital marketing", "advertising", "social media", "campaign"],
+        "types": [
+            ("Brand Development", ["brand launch", "rebrand"]),
+            ("Market Expansion", ["market expansion", "new market", "enter market"]),
+            ("E-commerce Development", ["e-commerce", "online store", "digital commerce"]),
+            ("Digital Marketing", ["social media", "digital marketing", "online advertising"]),
+        ],
+        "default": "Marketing & Sales Initiative",
+    },
+    {
+        "category": "Finance & Investment",
+        "triggers": ["funding", "investment", "ipo", "public offering", "capital raise",
+                     "financing", "cost reduction", "efficiency", "revenue growth",
+                     "profitability", "budget increase", "financial restructuring"],
+        "types": [
+            ("Capital Investment", ["funding", "investment", "capital raise", "financing"]),
+            ("Public Offering", ["ipo", "public offering"]),
+            ("Financial Optimization", ["cost reduction", "efficiency", "financial restructuring"]),
+        ],
+        "default": "Financial Initiative",
+    },
+    {
+        "category": "Operations & Supply Chain",
+        "triggers": ["supply chain", "logistics", "operational efficiency", "outsourcing",
+                     "manufacturing", "distribution", "inventory management", "procurement",
+                     "warehouse", "facilities", "expansion", "relocation"],
+        "types": [
+            ("Supply Chain Optimization", ["supply chain", "logistics"]),
+            ("Manufacturing Enhancement", ["manufacturing", "production"]),
+            ("Facilities Expansion", ["warehouse", "facilities", "expansion", "relocation"]),
+        ],
+        "default": "Operational Improvement",
+    },
+    {
+        "category": "Human Resources",
+        "triggers": ["hiring", "talent acquisition", "training program", "skill development",
+                     "workforce expansion", "organization restructure", "management change",
+                     "leadership", "executive appointment", "cultural transformation"],
+        "types": [
+            ("Training & Development", ["training program", "skill development"]),
+            ("Talent Acquisition", ["hiring", "talent acquisition", "workforce expansion"]),
+            ("Organizational Change", ["organization restructure", "management change", "leadership"]),
+        ],
+        "default": "HR Initiative",
+    },
+    {
+        "category": "Product & Service Development",
+        "triggers": ["product launch", "new service", "r&d", "research and development",
+                     "innovation center", "product redesign", "service improvement",
+                     "customer experience", "user experience", "design", "prototype"],
+        "types": [
+            ("Product Launch", ["product launch", "new product"]),
+            ("Service Development", ["new service", "service offering"]),
+            ("R&D Initiative", ["r&d", "research and development", "innovation center"]),
+            ("CX/UX Enhancement", ["customer experience", "user experience"]),
+        ],
+        "default": "Product/Service Innovation",
+    },
+    {
+        "category": "Sustainability & ESG",
+        "triggers": ["sustainability", "green initiative", "carbon neutral", "esg",
+                     "environmental", "social responsibility", "governance", "renewable",
+                     "circular economy", "ethical", "sustainable development"],
+        "types": [],
+        "default": "Sustainability/ESG Initiative",
+    },
+    {
+        "category": "Strategic Alliances & Partnerships",
+        "triggers": ["strategic alliance", "industry partnership", "channel partner",
+                     "distribution agreement", "licensing agreement", "cross-industry",
+                     "collaborative venture", "co-development", "business ecosystem",
+                     "partnership", "collaboration", "joint venture"],
+        "types": [],
+        "default": "Strategic Partnership",
+    },
+    {
+        "category": "Global Expansion",
+        "triggers": ["global expansion", "international market", "new territory", "overseas",
+                     "cross-border", "new country", "regional headquarters", "localization",
+                     "foreign investment", "international presence", "global reach"],
+        "types": [],
+        "default": "Global Expansion",
+    },
+    {
+        "category": "Mergers & Acquisitions",
+        "triggers": ["acquisition", "merger", "takeover"],
+        "types": [],
+        "default": "M&A Activity",
+    },
+    {
+        "category": "Regulatory & Compliance",
+        "triggers": ["regulatory compliance", "legal requirement", "industry standard",
+                     "certification", "accreditation", "regulatory change", "policy adaptation"],
+        "types": [],
+        "default": "Regulatory & Compliance",
+    },
+    {
+        "category": "Business Expansion",
+        "triggers": ["expansion", "growth", "new market"],
+        "types": [],
+        "default": "Business Expansion",
+    },
+]
+
+# Type used when signals were found but no category keyword matched
+DEFAULT_OPPORTUNITY_TYPE = "Strategic Business Initiative"
+
+
+def _category_keywords() -> List[str]:
+    keywords = []
+    for category in OPPORTUNITY_CATEGORIES:
+        keywords.extend(category["triggers"])
+        for _, type_keywords in category["types"]:
+            keywords.extend(type_keywords)
+    return keywords
+
+
+# One matcher covers both the signal vocabulary and every classification keyword
+OPPORTUNITY_MATCHER = KeywordMatcher(OPPORTUNITY_SIGNALS + _category_keywords())
+
+
+def classify_opportunity_types(keyword_counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """
+    Score every opportunity type from keyword hit counts.
+
+    Args:
+        keyword_counts: Occurrences of each (lowercase) keyword in the article
+
+    Returns:
+        Ranked list of {"type", "weight"} dicts. The first entry is the primary
+        type given by the category order; the rest are ordered by weight.
+    """
+    def hits(keywords: List[str]) -> int:
+        return sum(keyword_counts.get(keyword, 0) for keyword in keywords)
+
+    primary = None
+    scores: Dict[str, int] = {}
+    for category in OPPORTUNITY_CATEGORIES:
+        category_hits = hits(category["triggers"])
+        if not category_hits:
+            continue
+        type_scores = [(label, hits(keywords)) for label, keywords in category["types"]]
+        type_scores = [(label, score) for label, score in type_scores if score]
+        if not type_scores:
+            type_scores = [(category["default"], category_hits)]
+        if primary is None:
+            primary = type_scores[0][0]
+        for label, score in type_scores:
+            scores[label] = scores.get(label, 0) + score
+
+    if primary is None:
+        return [{"type": DEFAULT_OPPORTUNITY_TYPE, "weight": 1.0}]
+
+    total = sum(scores.values())
+    ranked = sorted(scores.items(), key=lambda item: (item[0] != primary, -item[1]))
+    return [{"type": label, "weight": round(score / total, 3)} for label, score in ranked]
+
+
+def scan_opportunities(text: str, context_chars: int = SIGNAL_CONTEXT_CHARS) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Scan an article once for signal context windows and keyword counts.
+
+    Args:
+        text: Article text to scan
+        context_chars: Characters of context to keep on each side of a signal hit
+
+    Returns:
+        Tuple of (signal context windows, occurrences per keyword)
+    """
+    signals = SIGNAL_KEYWORDS
+    windows: Dict[str, List[str]] = {}
+    window_ends: Dict[str, int] = {}
+    keyword_counts: Dict[str, int] = {}
+    for start, end, keyword in OPPORTUNITY_MATCHER.finditer(text):
+        keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+        if keyword not in signals or start < window_ends.get(keyword, 0):
+            continue
+        window_end = end + context_chars
+        windows.setdefault(keyword, []).append(text[max(0, start - context_chars):window_end])
+        window_ends[keyword] = window_end
+
+    contexts = []
+    for signal in OPPORTUNITY_SIGNALS:
+        contexts.extend(windows.get(signal.lower(), []))
+    return contexts, keyword_counts
+
+
+def find_signal_contexts(text: str, context_chars: int = SIGNAL_CONTEXT_CHARS) -> List[str]:
+    """
+    Find opportunity signals in text and return their context windows.
+
+    Windows are grouped by signal in OPPORTUNITY_SIGNALS order; within a signal,
+    hits that fall inside the previous window for that signal are skipped, as
+    a per-signal `findall` would.
+
+    Args:
+        text: Article text to scan
+        context_chars: Characters of context to keep on each side of a hit
+
+    Returns:
+        List of context snippets, one per non-overlapping signal hit
+    """
+    return scan_opportunities(text, context_chars)[0]
+
+
+def analyze_opportunity_text(news_text: str) -> Dict[str, Any]:
+    """
+    Extract opportunity information from article text in a single scan.
+
+    Args:
+        news_text: The text content of the news article
+
+    Returns:
+        Dictionary with found, summary, details, opportunity_type and the
+        ranked opportunity_types
+    """
+    opportunity = {
+        "found": False,
+        "summary": "",
+        "details": "",
+        "opportunity_type": "",
+        "opportunity_types": []
+    }
+
+    # Single pass over the text: signal context windows plus keyword counts
+    opportunity_matches, keyword_counts = scan_opportunities(news_text)
+
+    if opportunity_matches:
+        opportunity["found"] = True
+
+        # Score every opportunity category from the declarative table;
+        # the first entry is the primary type
+        opportunity["opportunity_types"] = classify_opportunity_types(keyword_counts)
+        opportunity["opportunity_type"] = opportunity["opportunity_types"][0]["type"]
+
+        # Summary from the first match, details from the first three
+        opportunity["summary"] = opportunity_matches[0].strip()
+        details = "\n".join([m.strip() for m in opportunity_matches[:3]])
+        opportunity["details"] = details[:500] if details else ""
+
+    return opportunity
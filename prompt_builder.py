@@ -0,0 +1,240 @@
+# agents/prompt_builder.py
+"""
+Compact, token-budgeted prompt assembly.
+
+Every agent builds its chat messages the same way:
+
+- static content (instructions, rubrics, rep tables) goes first, in the
+  system message, and is byte-identical across calls so provider-side prompt
+  caching can reuse the prefix
+- per-lead data follows in the user message as compact JSON, with empty
+  values and placeholder items ("... (Not Found)") removed
+- the whole prompt is held to a per-agent token budget, counted with
+  tiktoken; over-budget data is trimmed by shortening its longest strings,
+  then dropping items from the end of its largest lists
+
+Input token counts are logged for every call.
+
+Configuration (environment variables):
+    PROMPT_TOKEN_ENCODING: tiktoken encoding name
+    PROMPT_BUDGET_<AGENT>: token budget override, e.g. PROMPT_BUDGET_SCORING=2000
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+PROMPT_TOKEN_ENCODING = os.getenv("PROMPT_TOKEN_ENCODING", "cl100k_base")
+
+# Default input token budget per agent
+PROMPT_TOKEN_BUDGETS = {
+    "metadata": 6000,
+    "opportunity": 5000,
+    "scoring": 4000,
+    "scoring_batch": 16000,
+    "routing": 2500,
+    "fused": 9000,
+}
+DEFAULT_TOKEN_BUDGET = 6000
+
+# Substrings that mark filler items added to meet minimum result counts
+PLACEHOLDER_MARKERS = ("(Not Found)", "This is a placeholder", "placeholder #")
+# Values that carry no information for the LLM
+EMPTY_VALUES = ("", "N/A", "n/a", "Unknown", "Not available", "No details available", "Unknown Opportunity")
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """Load the tiktoken encoding once; None if it is unavailable (e.g. offline)."""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(PROMPT_TOKEN_ENCODING)
+        except Exception as e:
+            print(f"⚠️ tiktoken encoding '{PROMPT_TOKEN_ENCODING}' unavailable ({type(e).__name__}), estimating tokens")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken (about 4 characters per token if the encoding cannot be loaded)."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def token_budget(agent: str) -> int:
+    override = os.getenv(f"PROMPT_BUDGET_{agent.upper()}")
+    if override:
+        return int(override)
+    return PROMPT_TOKEN_BUDGETS.get(agent, DEFAULT_TOKEN_BUDGET)
+
+
+def is_placeholder(value: Any) -> bool:
+    """True for placeholder strings, and for dicts that contain one."""
+    if isinstance(value, str):
+        return any(marker in value for marker in PLACEHOLDER_MARKERS)
+    if isinstance(value, dict):
+        return any(isinstance(v, str) and is_placeholder(v) for v in value.values())
+    return False
+
+
+def prune(value: Any) -> Any:
+    """Recursively drop empty values and placeholder items (None if nothing is left)."""
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            item = prune(item)
+            if item is not None:
+                pruned[key] = item
+        return pruned or None
+    if isinstance(value, (list, tuple)):
+        pruned = [prune(item) for item in value if not is_placeholder(item)]
+        pruned = [item for item in pruned if item is not None]
+        return pruned or None
+    if isinstance(value, str):
+        value = value.strip()
+        return None if value in EMPTY_VALUES or is_placeholder(value) else value
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """Serialize without whitespace (after pruning)."""
+    pruned = prune(value)
+    return json.dumps(pruned if pruned is not None else {}, separators=(",", ":"), ensure_ascii=False)
+
+
+# Strings are shortened to this many characters before whole list items are dropped
+MIN_TRIMMED_STRING_CHARS = 200
+
+
+def _leaves(value: Any, path: Tuple = ()):
+    """Yield (path, value) for every string and non-empty list inside `value`."""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, list):
+        if value:
+            yield path, value
+        for i, item in enumerate(value):
+            yield from _leaves(item, path + (i,))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _leaves(item, path + (key,))
+
+
+def _replace(value: Any, path: Tuple, new: Any) -> Any:
+    """Copy of `value` with the item at `path` replaced."""
+    if not path:
+        return new
+    head, rest = path[0], path[1:]
+    if isinstance(value, list):
+        return value[:head] + [_replace(value[head], rest, new)] + value[head + 1:]
+    return {**value, head: _replace(value[head], rest, new)}
+
+
+def _trim_once(value: Any, overshoot_chars: int) -> Tuple[Any, bool]:
+    """
+    Shrink `value` by one step: shorten the longest string (down to
+    MIN_TRIMMED_STRING_CHARS), else drop the last item of the largest list,
+    else shorten the longest remaining string.
+
+    Returns:
+        Tuple of (new value, whether anything was trimmed)
+    """
+    strings = [(path, leaf) for path, leaf in _leaves(value) if isinstance(leaf, str)]
+    lists = [(path, leaf) for path, leaf in _leaves(value) if isinstance(leaf, list)]
+
+    longest = max(strings, key=lambda item: len(item[1]), default=None)
+    if longest and len(longest[1]) > MIN_TRIMMED_STRING_CHARS:
+        path, text = longest
+        keep = max(MIN_TRIMMED_STRING_CHARS, len(text) - max(overshoot_chars, len(text) // 10))
+        return _replace(value, path, _truncate(text, keep)), True
+    if lists:
+        path, items = max(lists, key=lambda item: len(json.dumps(item[1], ensure_ascii=False)))
+        return _replace(value, path, items[:-1]), True
+    if longest and len(longest[1]) > 1:
+        path, text = longest
+        keep = max(1, len(text) - max(overshoot_chars, len(text) // 10, 1))
+        return _replace(value, path, _truncate(text, keep)), True
+    return value, False
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut text to at most max_chars characters, the trailing "…" included."""
+    return text[:max(0, max_chars - 1)].rstrip() + "…"
+
+
+class PromptBuilder:
+    """
+    Assembles [system, user] messages for one agent call.
+
+    Usage:
+        messages = (PromptBuilder("scoring")
+                    .static(SCORING_INSTRUCTIONS)
+                    .data("Enriched Lead", enriched_lead)
+                    .build())
+    """
+
+    def __init__(self, agent: str, budget: Optional[int] = None):
+        self.agent = agent
+        self.budget = token_budget(agent) if budget is None else budget
+        self._static: List[str] = []
+        self._data: List[Tuple[str, Any]] = []
+
+    def static(self, text: str) -> "PromptBuilder":
+        """Add content that is identical for every call (goes into the system message)."""
+        self._static.append(text.strip())
+        return self
+
+    def data(self, label: str, value: Any) -> "PromptBuilder":
+        """Add per-call data; dicts/lists are pruned and serialized as compact JSON."""
+        if not isinstance(value, str):
+            value = prune(value)
+        self._data.append((label, value))
+        return self
+
+    @staticmethod
+    def _render_data(sections: List[Tuple[str, Any]]) -> str:
+        parts = []
+        for label, value in sections:
+            if value is None or value == "":
+                continue
+            text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+            parts.append(f"{label}:\n{text}" if label else text)
+        return "\n\n".join(parts)
+
+    def build(self) -> List[Dict[str, str]]:
+        """Render the messages, trimming per-call data until it fits the token budget."""
+        system = "\n\n".join(self._static)
+        system_tokens = count_tokens(system)
+        sections = list(self._data)
+        user = self._render_data(sections)
+        user_tokens = count_tokens(user)
+        untrimmed_tokens = user_tokens
+
+        while system_tokens + user_tokens > self.budget:
+            overshoot_chars = (system_tokens + user_tokens - self.budget) * 4
+            # Trim the largest data section that can still shrink
+            changed = False
+            for index in sorted(range(len(sections)), key=lambda i: -len(self._render_data([sections[i]]))):
+                label, value = sections[index]
+                value, changed = _trim_once(value, overshoot_chars)
+                if changed:
+                    sections[index] = (label, value)
+                    break
+            if not changed:
+                break
+            user = self._render_data(sections)
+            user_tokens = count_tokens(user)
+
+        trimmed = untrimmed_tokens - user_tokens
+        print(f"🧮 [{self.agent}] input tokens: {system_tokens + user_tokens} "
+              f"(static {system_tokens}, data {user_tokens}, budget {self.budget}"
+              f"{f', trimmed {trimmed}' if trimmed else ''})")
+
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": user})
+        return messages
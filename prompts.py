@@ -435,14 +435,61 @@ Example Output:
 - The recommendation should highlight what makes this lead valuable
 - If opportunity data is missing, infer opportunities from strategic_focus
 
-## Input Data
-
-Enriched Lead:
-{enriched_lead}
+## ICP Criteria
 
-ICP Criteria:
 {icp_criteria}
+"""
+
+
+BATCH_SCORING_PROMPT = """
+## Batch Mode
+
+This request contains SEVERAL leads: a JSON array of objects with "lead_index" and "enriched_lead".
+Score every lead independently with the methodology above.
+
+Instead of a single object, return a JSON array with exactly one object per lead:
+
+[
+  {{"lead_index": 0, "score": 88, "breakdown": {{"industry": 20, "company_size": 20, "technologies": 14, "strategic_focus": 13, "location": 10, "opportunities": 11}}, "recommendation": "..."}},
+  {{"lead_index": 1, "score": 54, "breakdown": {{...}}, "recommendation": "..."}}
+]
+
+Copy each lead_index unchanged. Return ONLY the JSON array - no markdown, no explanations.
+"""
+
+
+FUSED_ENRICHMENT_PROMPT = """
+## Combined Mode
+
+This request combines BOTH tasks above in a single response. You receive the browsed company data
+and the lead's opportunity_signals (from news and LinkedIn).
+
+1. Extract the company metadata exactly as MetadataEnrichmentAgent would.
+2. Score that metadata, together with the opportunity_signals, against the ICP criteria
+   with the scoring methodology above (use the first location as headquarters_location).
+
+Return ONE JSON object with two keys:
+
+{
+  "metadata": {"industry": "...", "company_size": "...", "locations": ["..."], "technologies": ["..."],
+               "products_services": ["..."], "strategic_focus": ["..."], "company_culture": "...", "data_confidence": "high"},
+  "score": {"score": 88, "breakdown": {"industry": 20, "company_size": 20, "technologies": 14, "strategic_focus": 13,
+            "location": 10, "opportunities": 11}, "recommendation": "..."}
+}
+
+Return ONLY the JSON object - no markdown, no explanations.
+"""
+
+
+SCORE_EXPLANATION_PROMPT = """
+You are LeadScoringAgent. The lead you receive has already been scored against the Ideal Customer Profile (ICP);
+do not change the score. Write a brief 2-3 sentence recommendation explaining the score and fit quality,
+mentioning the lead's key strengths and its weakest dimensions.
+
+You receive the ICP score (out of 100), the score breakdown (points earned / max points per dimension)
+and the enriched lead data.
 
+Return only the recommendation text - no JSON, no markdown.
 """
 
 
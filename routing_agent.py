@@ -3,20 +3,26 @@
 SDR Routing Agent - Routes leads to appropriate sales reps
 Follows the same LangGraph pattern as metadata_enrichment_agent
 """
+import asyncio
 import json
 import os
 import logging
+from functools import lru_cache
 from pydantic import BaseModel, Field
-from langgraph.graph import StateGraph, START, END
 from typing import Optional, Dict, Any
-import openai
 
-# Initialize OpenAI client
-client = openai.OpenAI(
-    api_key="sk-TE5BPNfSh4IOCNpW3I5EDQ",
-    base_url="http://0.0.0.0:4000"
-)
-MODEL_NAME = "claude-4.5-sonnet"
+# LLM calls go through the shared async gateway
+from agents.llm_gateway import chat_completion
+from agents.sdr_router import SdrRouter
+from agents.prompt_builder import PromptBuilder, compact_json
+from agents.model_policy import run_tiered
+from agents.tracing import traced
+
+# How leads are routed:
+#   rules      - deterministic SdrRouter, LLM only for ambiguous locations/industries (default)
+#   rules_only - SdrRouter alone, never calls the LLM
+#   llm        - the LLM applies the routing policy
+ROUTING_MODE = os.getenv("ROUTING_MODE", "rules").lower()
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +32,13 @@ class RoutingState(BaseModel):
     # Input from previous agents
     enriched_lead: Optional[Dict[str, Any]] = None
     icp_score: int = 0
+    routing_mode: Optional[str] = None  # Per-call override of ROUTING_MODE
     
     # Output fields
     assigned_rep: str = ""
     rep_email: str = ""
     routing_reason: str = ""
+    routing_ambiguity: str = ""  # Why the rule-based router deferred to the LLM
 
 
 # Sales reps configuration (loaded from config, not hardcoded in logic)
@@ -86,8 +94,11 @@ ROUTING_CONFIG = {
     "enable_overflow_routing": True
 }
 
+SDR_ROUTER = SdrRouter(load_sales_reps())
+
 
-def routing_validation_node(state: RoutingState):
+@traced("routing_validation_node", kind="node")
+async def routing_validation_node(state: RoutingState):
     """
     Node 1: Validate input data for routing
     """
@@ -114,30 +125,50 @@ def routing_validation_node(state: RoutingState):
     return state
 
 
-def llm_routing_node(state: RoutingState):
+def resolve_routing_mode(state: RoutingState) -> str:
+    return (state.routing_mode or ROUTING_MODE).lower()
+
+
+@traced("rules_routing_node", kind="node")
+async def rules_routing_node(state: RoutingState):
     """
-    Node 2: Use LLM to route lead to best-matching sales rep
+    Node 2: Route the lead with the deterministic rule-based router
     """
-    # Skip LLM if already marked as unassigned
-    if "Unassigned" in state.assigned_rep:
+    # Skip if already marked as unassigned, or if the LLM routes every lead
+    if "Unassigned" in state.assigned_rep or resolve_routing_mode(state) == "llm":
         return state
     
-    print("🤖 Using LLM to find best sales rep...")
+    decision = SDR_ROUTER.route(state.enriched_lead, state.icp_score)
+    if decision["ambiguous"] and resolve_routing_mode(state) != "rules_only":
+        print(f"⚠️ Ambiguous lead ({decision['ambiguous']}) - deferring to LLM routing")
+        state.routing_ambiguity = decision["ambiguous"]
+        return state
     
-    # Load sales reps from config
-    sales_reps = load_sales_reps()
+    state.assigned_rep = decision["assigned_rep"]
+    state.rep_email = decision["rep_email"]
+    state.routing_reason = decision["routing_reason"]
     
-    # Build routing prompt
-    routing_prompt = f"""
-You are an SDR routing expert. Assign this lead to the best-matching sales representative.
+    print(f"✅ Lead routed to: {state.assigned_rep}")
+    if state.rep_email:
+        print(f"   Email: {state.rep_email}")
+    print(f"   Reason: {state.routing_reason}")
+    return state
+
+
+def needs_llm_routing(state: RoutingState) -> str:
+    """Conditional edge: go to the LLM only if the rules did not decide"""
+    return "done" if state.assigned_rep else "llm"
 
-## Enriched Lead Data:
-{json.dumps(state.enriched_lead, indent=2)}
 
-## ICP Score: {state.icp_score}/90
+@lru_cache(maxsize=1)
+def routing_instructions() -> str:
+    """Static routing prompt: policy plus the compact sales rep table"""
+    return f"""You are an SDR routing expert. Return only valid JSON.
+
+Assign the lead you receive (enriched lead data and ICP score) to the best-matching sales representative.
 
 ## Available Sales Reps:
-{json.dumps(sales_reps, indent=2)}
+{compact_json(load_sales_reps())}
 
 ## Routing Logic (Priority Order):
 1. **Territory Match**: Match lead's headquarters_location to rep's territory
@@ -160,20 +191,43 @@ You are an SDR routing expert. Assign this lead to the best-matching sales repre
   "reason": "<detailed explanation: territory match, industry match, score/size qualification>"
 }}
 
-Return ONLY valid JSON, no markdown, no explanations.
-"""
+Return ONLY valid JSON, no markdown, no explanations."""
+
+
+def validate_routing(routing_data: Dict[str, Any]) -> Optional[str]:
+    """Escalation reason for an LLM routing decision, or None if it names a known rep (or Unassigned)"""
+    rep_name = routing_data.get("rep_name") if isinstance(routing_data, dict) else None
+    if not rep_name:
+        return "no rep_name"
+    if rep_name.startswith("Unassigned") or any(rep["name"] == rep_name for rep in SDR_ROUTER.sales_reps):
+        return None
+    return f"unknown rep '{rep_name}'"
+
+
+async def request_llm_routing(enriched_lead: Dict[str, Any], icp_score: int) -> Dict[str, str]:
+    """
+    Ask the LLM to route a lead to the best-matching sales rep
     
-    try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are an SDR routing expert. Return only valid JSON."},
-                {"role": "user", "content": routing_prompt}
-            ],
+    Returns:
+        Dict with assigned_rep, rep_email and routing_reason ("Unassigned -
+        Error" if the call or its JSON failed)
+    """
+    print("🤖 Using LLM to find best sales rep...")
+    
+    messages = (PromptBuilder("routing")
+                .static(routing_instructions())
+                .data("Enriched Lead Data", enriched_lead)
+                .data("ICP Score", f"{icp_score}/90")
+                .build())
+    
+    async def call_model(model: str) -> Dict[str, Any]:
+        content = await chat_completion(
+            agent="routing",
+            model=model,
+            messages=messages,
             temperature=0
         )
         
-        content = response.choices[0].message.content
         print(f"📊 Raw LLM response: {content[:150]}")
         
         # Extract JSON from markdown if present
@@ -189,67 +243,138 @@ Return ONLY valid JSON, no markdown, no explanations.
             content = content[start:end]
         
         # Parse routing decision
-        routing_data = json.loads(content)
+        return json.loads(content)
+    
+    try:
+        # Small model first, escalating to the large one on an unknown rep (see model_policy)
+        routing_data = await run_tiered("routing", call_model, validate_routing)
         
-        state.assigned_rep = routing_data.get("rep_name", "Unassigned")
-        state.rep_email = routing_data.get("rep_email", "")
-        state.routing_reason = routing_data.get("reason", "No reason provided")
+        decision = {
+            "assigned_rep": routing_data.get("rep_name", "Unassigned"),
+            "rep_email": routing_data.get("rep_email", ""),
+            "routing_reason": routing_data.get("reason", "No reason provided"),
+        }
         
-        print(f"✅ Lead routed to: {state.assigned_rep}")
-        if state.rep_email:
-            print(f"   Email: {state.rep_email}")
-        print(f"   Reason: {state.routing_reason}")
+        print(f"✅ Lead routed to: {decision['assigned_rep']}")
+        if decision["rep_email"]:
+            print(f"   Email: {decision['rep_email']}")
+        print(f"   Reason: {decision['routing_reason']}")
+        return decision
         
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse LLM routing response: {e}")
-        state.assigned_rep = "Unassigned - Error"
-        state.routing_reason = f"Error parsing routing response: {str(e)}"
-        state.rep_email = ""
+        reason = f"Error parsing routing response: {str(e)}"
     except Exception as e:
         logger.error(f"Routing error: {str(e)}")
-        state.assigned_rep = "Unassigned - Error"
-        state.routing_reason = f"Error during routing: {str(e)}"
-        state.rep_email = ""
+        reason = f"Error during routing: {str(e)}"
+    return {"assigned_rep": "Unassigned - Error", "rep_email": "", "routing_reason": reason}
+
+
+@traced("llm_routing_node", kind="node")
+async def llm_routing_node(state: RoutingState):
+    """
+    Node 3: Use LLM to route lead to best-matching sales rep
+    """
+    # Skip LLM if already marked as unassigned
+    if "Unassigned" in state.assigned_rep:
+        return state
     
+    decision = await request_llm_routing(state.enriched_lead, state.icp_score)
+    state.assigned_rep = decision["assigned_rep"]
+    state.rep_email = decision["rep_email"]
+    state.routing_reason = decision["routing_reason"]
     return state
 
 
-# Build the LangGraph workflow
-routing_graph = StateGraph(RoutingState)
-
-# Register nodes
-routing_graph.add_node("routing_validation_node", routing_validation_node)
-routing_graph.add_node("llm_routing_node", llm_routing_node)
+async def route_enriched_lead(enriched_lead: Dict[str, Any], icp_score: int,
+                              routing_mode: Optional[str] = None) -> Dict[str, str]:
+    """
+    Route a lead in one call: the whole routing graph (validation, rules, LLM
+    fallback) without its state model
+    
+    Args:
+        enriched_lead: Dictionary with enriched lead data
+        icp_score: ICP score from scoring agent
+        routing_mode: Override of ROUTING_MODE (rules, rules_only, llm)
+        
+    Returns:
+        Dictionary with assigned_rep, rep_email, and routing_reason
+    """
+    min_threshold = ROUTING_CONFIG["min_score_threshold"]
+    if icp_score < min_threshold:
+        return {"assigned_rep": "Unassigned - Score Too Low", "rep_email": "",
+                "routing_reason": f"ICP score {icp_score}/90 is below minimum threshold of {min_threshold}"}
+    if not enriched_lead or not any(enriched_lead.values()):
+        return {"assigned_rep": "Unassigned - No Data", "rep_email": "",
+                "routing_reason": "Missing enriched lead data"}
+    
+    mode = (routing_mode or ROUTING_MODE).lower()
+    if mode != "llm":
+        decision = SDR_ROUTER.route(enriched_lead, icp_score)
+        if not decision["ambiguous"] or mode == "rules_only":
+            return {key: decision[key] for key in ("assigned_rep", "rep_email", "routing_reason")}
+        print(f"⚠️ Ambiguous lead ({decision['ambiguous']}) - deferring to LLM routing")
+    return await request_llm_routing(enriched_lead, icp_score)
 
-# Define transitions
-routing_graph.add_edge(START, "routing_validation_node")
-routing_graph.add_edge("routing_validation_node", "llm_routing_node")
-routing_graph.add_edge("llm_routing_node", END)
 
-# Compile the graph
-routing_graph_compiled = routing_graph.compile()
+@lru_cache(maxsize=1)
+def get_routing_graph():
+    """Compiled routing workflow, built on first use (langgraph is imported here, not at module load)"""
+    from langgraph.graph import StateGraph, START, END
+    
+    routing_graph = StateGraph(RoutingState)
+    
+    # Register nodes
+    routing_graph.add_node("routing_validation_node", routing_validation_node)
+    routing_graph.add_node("rules_routing_node", rules_routing_node)
+    routing_graph.add_node("llm_routing_node", llm_routing_node)
+    
+    # Define transitions
+    routing_graph.add_edge(START, "routing_validation_node")
+    routing_graph.add_edge("routing_validation_node", "rules_routing_node")
+    routing_graph.add_conditional_edges(
+        "rules_routing_node",
+        needs_llm_routing,
+        {
+            "llm": "llm_routing_node",
+            "done": END
+        }
+    )
+    routing_graph.add_edge("llm_routing_node", END)
+    
+    # Never checkpointed on its own: the pipeline checkpoints per agent node
+    return routing_graph.compile(checkpointer=False)
 
 
-def run_sdr_routing(enriched_lead: Dict[str, Any], icp_score: int) -> dict:
+async def arun_sdr_routing(enriched_lead: Dict[str, Any], icp_score: int,
+                           routing_mode: Optional[str] = None) -> dict:
     """
     Run the SDR routing workflow
     
     Args:
         enriched_lead: Dictionary with enriched lead data
         icp_score: ICP score from scoring agent
+        routing_mode: Override of ROUTING_MODE (rules, rules_only, llm)
         
     Returns:
         Dictionary with assigned_rep, rep_email, and routing_reason
     """
     initial_state = {
         "enriched_lead": enriched_lead,
-        "icp_score": icp_score
+        "icp_score": icp_score,
+        "routing_mode": routing_mode
     }
     
-    result = routing_graph_compiled.invoke(initial_state)
+    result = await get_routing_graph().ainvoke(initial_state)
     return result
 
 
+def run_sdr_routing(enriched_lead: Dict[str, Any], icp_score: int,
+                    routing_mode: Optional[str] = None) -> dict:
+    """Synchronous entry point for scripts; use arun_sdr_routing inside an event loop."""
+    return asyncio.run(arun_sdr_routing(enriched_lead, icp_score, routing_mode))
+
+
 # Async version for FastAPI compatibility
 async def route_lead_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -259,7 +384,7 @@ async def route_lead_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     enriched_lead = state.get("enriched_lead", {})
     icp_score = state.get("icp_score", 0)
     
-    result = run_sdr_routing(enriched_lead, icp_score)
+    result = await arun_sdr_routing(enriched_lead, icp_score, state.get("routing_mode"))
     
     # Update original state with results
     state["assigned_rep"] = result.get("assigned_rep", "Unassigned")
@@ -3,22 +3,32 @@
 ICP Scoring Agent - Scores leads against Ideal Customer Profile criteria
 Follows the same LangGraph pattern as metadata_enrichment_agent
 """
+import asyncio
 import json
 import os
 import logging
-from pydantic import BaseModel, Field
-from langgraph.graph import StateGraph, START, END
-from typing import Optional, Dict, Any
-import openai
-
-# Initialize OpenAI client
-client = openai.OpenAI(
-    api_key="sk-TE5BPNfSh4IOCNpW3I5EDQ",
-    base_url="http://0.0.0.0:4000"
-)
-MODEL_NAME = "claude-4.5-sonnet"
+import time
+from functools import lru_cache
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Optional, Dict, Any, List
+
+# LLM calls go through the shared async gateway
+from agents.llm_gateway import chat_completion
+from agents.icp_scoring_engine import IcpScoringEngine, compare_scores
+from agents.prompt_builder import PromptBuilder, compact_json, count_tokens, token_budget
+from agents.model_policy import get_model_policy_stats, model_policy, run_tiered, tier_model
+from agents.tracing import traced
+
 logger = logging.getLogger(__name__)
 
+# How the score is computed:
+#   engine  - deterministic IcpScoringEngine (default)
+#   llm     - the LLM computes score and breakdown from the rubric
+#   compare - engine score, plus a report of where the LLM disagrees
+SCORING_MODE = os.getenv("SCORING_MODE", "engine").lower()
+# Whether engine mode asks the LLM for a free-text recommendation
+SCORING_EXPLAIN = os.getenv("SCORING_EXPLAIN", "").lower() in ("1", "true", "yes")
+
 
 class ScoringState(BaseModel):
     """State for ICP scoring workflow"""
@@ -38,10 +48,15 @@ class ScoringState(BaseModel):
     # For backward compatibility
     enriched_lead: Optional[Dict[str, Any]] = None
     
+    # Per-call overrides of SCORING_MODE / SCORING_EXPLAIN
+    scoring_mode: Optional[str] = None
+    explain: Optional[bool] = None
+    
     # Output fields
     icp_score: int = 0
     score_breakdown: Dict[str, Any] = Field(default_factory=dict)
     score_recommendation: str = ""
+    score_comparison: Dict[str, Any] = Field(default_factory=dict)
 
 
 # ICP Criteria loaded from config (not hardcoded in logic)
@@ -96,6 +111,9 @@ def load_icp_criteria() -> Dict[str, Any]:
     }
 
 
+ICP_ENGINE = IcpScoringEngine(load_icp_criteria())
+
+
 def build_enriched_lead_from_state(state: ScoringState) -> Dict[str, Any]:
     """
     Build enriched_lead from metadata enrichment agent output.
@@ -118,7 +136,8 @@ def build_enriched_lead_from_state(state: ScoringState) -> Dict[str, Any]:
     return enriched_lead
 
 
-def scoring_analysis_node(state: ScoringState):
+@traced("scoring_analysis_node", kind="node")
+async def scoring_analysis_node(state: ScoringState):
     """
     Node 1: Analyze enriched lead data and prepare for scoring
     """
@@ -140,64 +159,195 @@ def scoring_analysis_node(state: ScoringState):
     return state
 
 
-def llm_scoring_node(state: ScoringState):
+def score_upper_bound(enriched_lead: Dict[str, Any], scoring_mode: Optional[str] = None) -> Optional[int]:
     """
-    Node 2: Use LLM to calculate ICP score based on enriched data
+    Best ICP score a lead can reach before its opportunity signals are known
+    (every other dimension scored from the criteria tables, opportunities at
+    their max points)
+    
+    Returns:
+        The bound, or None in llm mode, where the LLM's score is not bounded
+        by the tables
     """
-    print("🤖 Calculating ICP score with LLM...")
+    if (scoring_mode or SCORING_MODE).lower() == "llm":
+        return None
+    return ICP_ENGINE.upper_bound(enriched_lead, unknown=["opportunities"])["score"]
+
+
+def has_lead_data(state: ScoringState) -> bool:
+    return bool(state.enriched_lead) and any(state.enriched_lead.values())
+
+
+@traced("engine_scoring_node", kind="node")
+async def engine_scoring_node(state: ScoringState):
+    """
+    Node 2: Compute the ICP score deterministically from the rubric tables
+    """
+    if not has_lead_data(state):
+        return state
     
-    # Load ICP criteria from config
-    icp_criteria = load_icp_criteria()
+    result = ICP_ENGINE.score(state.enriched_lead)
+    state.icp_score = result["score"]
+    state.score_breakdown = result["breakdown"]
+    state.score_recommendation = ICP_ENGINE.summarize(result)
     
+    print(f"✅ ICP Score calculated: {state.icp_score}/100")
+    print(f"   Breakdown: {state.score_breakdown}")
+    return state
+
+
+def select_scoring_path(state: ScoringState) -> str:
+    """Conditional edge after the engine: LLM scoring, comparison, explanation or done"""
+    if not has_lead_data(state):
+        return "done"
+    mode = (state.scoring_mode or SCORING_MODE).lower()
+    if mode in ("llm", "compare"):
+        return mode
+    explain = SCORING_EXPLAIN if state.explain is None else state.explain
+    return "explain" if explain else "done"
+
+
+@lru_cache(maxsize=1)
+def scoring_instructions() -> str:
+    """Static scoring prompt: instructions plus the compact ICP criteria"""
     # Use the updated prompt from prompts.py
     from agents.prompts import LEAD_SCORING_PROMPT
     
-    scoring_prompt = LEAD_SCORING_PROMPT.format(
-        enriched_lead=json.dumps(state.enriched_lead, indent=2),
-        icp_criteria=json.dumps(icp_criteria, indent=2)
-    )
+    return ("You are an ICP scoring expert. Return only valid JSON.\n"
+            + LEAD_SCORING_PROMPT.format(icp_criteria=compact_json(load_icp_criteria())))
+
+
+async def request_llm_score(enriched_lead: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ask the LLM to score a lead against the ICP rubric
     
-    try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are an ICP scoring expert. Return only valid JSON."},
-                {"role": "user", "content": scoring_prompt}
-            ],
+    Returns:
+        Parsed score data with score, breakdown and recommendation
+    
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON
+    """
+    messages = (PromptBuilder("scoring")
+                .static(scoring_instructions())
+                .data("Enriched Lead", enriched_lead)
+                .build())
+    
+    async def call_model(model: str) -> Dict[str, Any]:
+        content = await chat_completion(
+            agent="scoring",
+            model=model,
+            messages=messages,
             temperature=0
         )
         
-        content = response.choices[0].message.content
         print(f"📊 Raw LLM response: {content[:200]}")
-        
-        # Extract JSON from markdown if present
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        # Find JSON boundaries
-        start = content.find('{')
-        end = content.rfind('}') + 1
-        if start >= 0 and end > start:
-            content = content[start:end]
-        
-        # Parse the score data
-        score_data = json.loads(content)
-        
-        # Extract and validate score (updated to 100-point scale)
-        icp_score = score_data.get("score", 0)
-        if not isinstance(icp_score, (int, float)) or icp_score < 0:
-            icp_score = 0
-        elif icp_score > 100:
-            icp_score = 100
+        return normalize_score_data(json.loads(extract_json_text(content, "{", "}")))
+    
+    # Small model first, escalating to the large one on an invalid score (see model_policy)
+    return await run_tiered("scoring", call_model, validate_score)
+
+
+def extract_json_text(content: str, open_char: str, close_char: str) -> str:
+    """Strip markdown fences and surrounding prose from a JSON object/array response"""
+    # Extract JSON from markdown if present
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    
+    # Find JSON boundaries
+    start = content.find(open_char)
+    end = content.rfind(close_char) + 1
+    if start >= 0 and end > start:
+        content = content[start:end]
+    return content
+
+
+def normalize_score_data(score_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Clamp the score to the 100-point scale"""
+    icp_score = score_data.get("score", 0)
+    if not isinstance(icp_score, (int, float)) or icp_score < 0:
+        icp_score = 0
+    elif icp_score > 100:
+        icp_score = 100
+    score_data["score"] = int(icp_score)
+    return score_data
+
+
+class IcpScore(BaseModel):
+    """Schema of an LLM score response"""
+    score: int = Field(ge=0, le=100)
+    breakdown: Dict[str, int]
+    recommendation: str = ""
+    
+    @field_validator("breakdown")
+    @classmethod
+    def check_breakdown(cls, breakdown: Dict[str, int]) -> Dict[str, int]:
+        """Every rubric dimension present, each within its max points"""
+        missing = [d for d in ICP_ENGINE.max_points if d not in breakdown]
+        if missing:
+            raise ValueError(f"breakdown is missing {missing}")
+        for dimension, points in breakdown.items():
+            max_points = ICP_ENGINE.max_points.get(dimension)
+            if max_points is not None and not 0 <= points <= max_points:
+                raise ValueError(f"breakdown[{dimension}]={points} is outside 0-{max_points}")
+        return breakdown
+
+
+def validate_score(score_data: Dict[str, Any]) -> Optional[str]:
+    """Escalation reason for LLM score data, or None if it matches IcpScore"""
+    try:
+        IcpScore.model_validate(score_data)
+    except ValidationError as e:
+        return f"invalid score ({e.errors()[0]['loc']})"
+    return None
+
+
+def combine_scores(enriched_lead: Dict[str, Any], score_data: Optional[Dict[str, Any]],
+                   scoring_mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Turn an LLM score obtained outside the scoring graph into scoring results
+    for the given mode (engine: engine score with the LLM's recommendation,
+    llm: the LLM score, compare: engine score plus score_comparison)
+    
+    Returns:
+        Dict with icp_score, score_breakdown, score_recommendation (and
+        score_comparison in compare mode)
+    """
+    mode = (scoring_mode or SCORING_MODE).lower()
+    if mode == "llm":
+        if score_data:
+            return score_result(score_data)
+        return {"icp_score": 0, "score_breakdown": {},
+                "score_recommendation": "Error during scoring: no valid LLM response"}
+    
+    engine_result = ICP_ENGINE.score(enriched_lead)
+    result = score_result(engine_result)
+    result["score_recommendation"] = (score_data or {}).get("recommendation") or ICP_ENGINE.summarize(engine_result)
+    if mode == "compare":
+        result["score_comparison"] = (
+            compare_scores(engine_result, score_data) if score_data
+            else {"engine_score": engine_result["score"], "error": "No LLM score"}
+        )
+    return result
+
+
+@traced("llm_scoring_node", kind="node")
+async def llm_scoring_node(state: ScoringState):
+    """
+    Node 3a (SCORING_MODE=llm): Use LLM to calculate ICP score based on enriched data
+    """
+    print("🤖 Calculating ICP score with LLM...")
+    
+    try:
+        score_data = await request_llm_score(state.enriched_lead)
         
         # Update state with results
-        state.icp_score = int(icp_score)
+        state.icp_score = score_data["score"]
         state.score_breakdown = score_data.get("breakdown", {})
         state.score_recommendation = score_data.get("recommendation", "")
         
-        print(f"✅ ICP Score calculated: {state.icp_score}/100")
+        print(f"✅ LLM ICP Score calculated: {state.icp_score}/100")
         print(f"   Breakdown: {state.score_breakdown}")
         
     except json.JSONDecodeError as e:
@@ -214,23 +364,157 @@ def llm_scoring_node(state: ScoringState):
     return state
 
 
-# Build the LangGraph workflow
-scoring_graph = StateGraph(ScoringState)
+@traced("compare_scoring_node", kind="node")
+async def compare_scoring_node(state: ScoringState):
+    """
+    Node 3b (SCORING_MODE=compare): Keep the engine score and report where the LLM disagrees
+    """
+    print("🔍 Comparing engine score with LLM score...")
+    engine_result = {"score": state.icp_score, "breakdown": state.score_breakdown}
+    
+    try:
+        score_data = await request_llm_score(state.enriched_lead)
+        state.score_comparison = compare_scores(engine_result, score_data)
+        if score_data.get("recommendation"):
+            state.score_recommendation = score_data["recommendation"]
+        
+        disagreements = state.score_comparison["disagreements"]
+        print(f"✅ Engine={state.icp_score}, LLM={score_data['score']}, "
+              f"disagreements: {disagreements or 'none'}")
+        
+    except Exception as e:
+        logger.error(f"Score comparison error: {str(e)}")
+        state.score_comparison = {"engine_score": state.icp_score, "error": str(e)}
+    
+    return state
 
-# Register nodes
-scoring_graph.add_node("scoring_analysis_node", scoring_analysis_node)
-scoring_graph.add_node("llm_scoring_node", llm_scoring_node)
 
-# Define transitions
-scoring_graph.add_edge(START, "scoring_analysis_node")
-scoring_graph.add_edge("scoring_analysis_node", "llm_scoring_node")
-scoring_graph.add_edge("llm_scoring_node", END)
+async def explain_score(icp_score: int, score_breakdown: Dict[str, Any],
+                        enriched_lead: Dict[str, Any]) -> Optional[str]:
+    """
+    Ask the LLM for a free-text recommendation of an engine score
+    
+    Returns:
+        The recommendation, or None if the call failed or returned nothing
+    """
+    print("🤖 Writing score recommendation with LLM...")
+    from agents.prompts import SCORE_EXPLANATION_PROMPT
+    
+    breakdown = {
+        dimension: f"{points}/{ICP_ENGINE.max_points.get(dimension, '?')}"
+        for dimension, points in score_breakdown.items()
+    }
+    messages = (PromptBuilder("scoring")
+                .static(SCORE_EXPLANATION_PROMPT)
+                .data("ICP Score", f"{icp_score}/100")
+                .data("Score Breakdown", breakdown)
+                .data("Enriched Lead", enriched_lead)
+                .build())
+    
+    async def call_model(model: str) -> str:
+        content = await chat_completion(
+            agent="scoring",
+            model=model,
+            messages=messages,
+            temperature=0
+        )
+        return (content or "").strip()
+    
+    # Free text: only an empty answer escalates (MODEL_POLICY_SCORING_EXPLANATION, large by default)
+    try:
+        content = await run_tiered("scoring_explanation", call_model,
+                                   lambda text: None if text else "empty explanation")
+        return content or None
+    except Exception as e:
+        logger.error(f"Score explanation error: {str(e)}")
+    return None
 
-# Compile the graph
-scoring_graph_compiled = scoring_graph.compile()
+
+@traced("explanation_node", kind="node")
+async def explanation_node(state: ScoringState):
+    """
+    Node 3c (explain): Ask the LLM for a free-text recommendation of the engine score
+    """
+    recommendation = await explain_score(state.icp_score, state.score_breakdown, state.enriched_lead)
+    # Keep the engine's summary as the recommendation if the LLM gave none
+    if recommendation:
+        state.score_recommendation = recommendation
+    return state
 
 
-def run_icp_scoring(enriched_data: Dict[str, Any]) -> dict:
+async def score_enriched_lead(enriched_lead: Dict[str, Any], scoring_mode: Optional[str] = None,
+                              explain: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Score an enriched lead in one call: the whole scoring graph (engine, then
+    LLM scoring, comparison or explanation by mode) without its state model
+    
+    Args:
+        enriched_lead: Enriched lead data (metadata fields and opportunity_signals)
+        scoring_mode: Override of SCORING_MODE (engine, llm, compare)
+        explain: Override of SCORING_EXPLAIN (engine mode)
+        
+    Returns:
+        Dict with icp_score, score_breakdown, score_recommendation (and
+        score_comparison in compare mode)
+    """
+    if not enriched_lead or not any(enriched_lead.values()):
+        print("⚠️ No enriched lead data available for scoring")
+        return {"icp_score": 0, "score_breakdown": {},
+                "score_recommendation": "No enriched data available to score"}
+    
+    mode = (scoring_mode or SCORING_MODE).lower()
+    if mode in ("llm", "compare"):
+        try:
+            score_data = await request_llm_score(enriched_lead)
+        except Exception as e:
+            logger.error(f"Scoring error: {str(e)}")
+            score_data = None
+        return combine_scores(enriched_lead, score_data, mode)
+    
+    result = combine_scores(enriched_lead, None, mode)
+    if SCORING_EXPLAIN if explain is None else explain:
+        recommendation = await explain_score(result["icp_score"], result["score_breakdown"], enriched_lead)
+        if recommendation:
+            result["score_recommendation"] = recommendation
+    return result
+
+
+@lru_cache(maxsize=1)
+def get_scoring_graph():
+    """Compiled scoring workflow, built on first use (langgraph is imported here, not at module load)"""
+    from langgraph.graph import StateGraph, START, END
+    
+    scoring_graph = StateGraph(ScoringState)
+    
+    # Register nodes
+    scoring_graph.add_node("scoring_analysis_node", scoring_analysis_node)
+    scoring_graph.add_node("engine_scoring_node", engine_scoring_node)
+    scoring_graph.add_node("llm_scoring_node", llm_scoring_node)
+    scoring_graph.add_node("compare_scoring_node", compare_scoring_node)
+    scoring_graph.add_node("explanation_node", explanation_node)
+    
+    # Define transitions
+    scoring_graph.add_edge(START, "scoring_analysis_node")
+    scoring_graph.add_edge("scoring_analysis_node", "engine_scoring_node")
+    scoring_graph.add_conditional_edges(
+        "engine_scoring_node",
+        select_scoring_path,
+        {
+            "llm": "llm_scoring_node",
+            "compare": "compare_scoring_node",
+            "explain": "explanation_node",
+            "done": END
+        }
+    )
+    scoring_graph.add_edge("llm_scoring_node", END)
+    scoring_graph.add_edge("compare_scoring_node", END)
+    scoring_graph.add_edge("explanation_node", END)
+    
+    # Never checkpointed on its own: the pipeline checkpoints per agent node
+    return scoring_graph.compile(checkpointer=False)
+
+
+async def arun_icp_scoring(enriched_data: Dict[str, Any]) -> dict:
     """
     Run the ICP scoring workflow
     
@@ -257,23 +541,214 @@ def run_icp_scoring(enriched_data: Dict[str, Any]) -> dict:
             "data_confidence": enriched_data.get("data_confidence"),
             "opportunity_signals": enriched_data.get("opportunity_signals")  # NEW: Include opportunity signals
         }
+    for option in ("scoring_mode", "explain"):
+        if enriched_data.get(option) is not None:
+            initial_state[option] = enriched_data[option]
     
-    result = scoring_graph_compiled.invoke(initial_state)
+    result = await get_scoring_graph().ainvoke(initial_state)
     return result
 
 
+def run_icp_scoring(enriched_data: Dict[str, Any]) -> dict:
+    """Synchronous entry point for scripts; use arun_icp_scoring inside an event loop."""
+    return asyncio.run(arun_icp_scoring(enriched_data))
+
+
+# Batch scoring (backfills): many leads per LLM call against one copy of the criteria
+SCORING_BATCH_MAX_LEADS = int(os.getenv("SCORING_BATCH_MAX_LEADS", "20"))
+# Expected output tokens per lead in a batch response (reserved out of the budget)
+SCORING_BATCH_OUTPUT_TOKENS_PER_LEAD = 120
+
+
+@lru_cache(maxsize=1)
+def batch_scoring_instructions() -> str:
+    """Static batch scoring prompt: single-lead rubric plus the batch output format"""
+    from agents.prompts import BATCH_SCORING_PROMPT
+    
+    return scoring_instructions() + "\n" + BATCH_SCORING_PROMPT.format()
+
+
+def plan_scoring_batches(enriched_leads: List[Dict[str, Any]], budget: Optional[int] = None) -> List[List[int]]:
+    """
+    Group lead indices into batches that fit the scoring_batch token budget
+    
+    Args:
+        enriched_leads: Enriched leads to score
+        budget: Token budget per request (defaults to the scoring_batch budget)
+    
+    Returns:
+        List of batches, each a list of indices into enriched_leads
+    """
+    budget = token_budget("scoring_batch") if budget is None else budget
+    available = budget - count_tokens(batch_scoring_instructions())
+    
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    used = 0
+    for index, lead in enumerate(enriched_leads):
+        cost = count_tokens(compact_json({"lead_index": index, "enriched_lead": lead})) + SCORING_BATCH_OUTPUT_TOKENS_PER_LEAD
+        if batch and (used + cost > available or len(batch) >= SCORING_BATCH_MAX_LEADS):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(index)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch_scores(content: str, expected: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Parse a batch scoring response into {lead_index: score_data}
+    
+    Entries that are malformed, that fail validate_score (a missing rubric
+    dimension, points over a dimension's max) or whose lead_index was not
+    requested are left out, so those leads are retried individually through
+    the scoring model policy.
+    """
+    try:
+        items = json.loads(extract_json_text(content, "[", "]"))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+    
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index = item.get("lead_index")
+        if index not in expected or index in results:
+            continue
+        if not isinstance(item.get("score"), (int, float)) or not isinstance(item.get("breakdown"), dict):
+            continue
+        score_data = normalize_score_data({key: value for key, value in item.items() if key != "lead_index"})
+        if validate_score(score_data) is None:
+            results[index] = score_data
+    return results
+
+
+async def request_llm_scores_batch(enriched_leads: List[Dict[str, Any]], indices: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    One LLM call scoring the leads at `indices`; returns the valid results
+    
+    Runs on the first LLM tier of the scoring model policy. Each lead is
+    recorded in the policy stats under "scoring_batch": accepted, or
+    escalated when its entry is missing or invalid (the lead is then scored
+    individually, through the whole policy).
+    """
+    # Batches are planned to fit the budget; if the builder still trims leads,
+    # they come back missing and are retried individually
+    leads = [{"lead_index": index, "enriched_lead": enriched_leads[index]} for index in indices]
+    messages = (PromptBuilder("scoring_batch")
+                .static(batch_scoring_instructions())
+                .data("Leads", leads)
+                .build())
+    tier = next((tier for tier in model_policy("scoring") if tier != "rules"), "large")
+    stats = get_model_policy_stats()
+    started = time.perf_counter()
+    try:
+        content = await chat_completion(
+            agent="scoring",
+            model=tier_model(tier),
+            messages=messages,
+            temperature=0
+        )
+    except Exception as e:
+        logger.error(f"Batch scoring error: {str(e)}")
+        for _ in indices:
+            stats.record("scoring_batch", tier, "error", (time.perf_counter() - started) * 1000, type(e).__name__)
+        return {}
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    results = parse_batch_scores(content, indices)
+    for index in indices:
+        if index in results:
+            stats.record("scoring_batch", tier, "accepted", elapsed_ms)
+        else:
+            stats.record("scoring_batch", tier, "escalated", elapsed_ms, "missing or invalid batch entry")
+    return results
+
+
+def score_result(score_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "icp_score": score_data["score"],
+        "score_breakdown": score_data.get("breakdown", {}),
+        "score_recommendation": score_data.get("recommendation", "")
+    }
+
+
+async def score_leads_batch(enriched_leads: List[Dict[str, Any]], scoring_mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Score many enriched leads, packing several into each LLM request
+    
+    In engine mode every lead is scored locally. In llm and compare modes the
+    leads are packed into token-budgeted batches (one copy of the criteria per
+    request), the batches run concurrently, and leads whose result is missing
+    or malformed are retried one by one.
+    
+    Args:
+        enriched_leads: Enriched lead dictionaries
+        scoring_mode: Override of SCORING_MODE (engine, llm, compare)
+    
+    Returns:
+        One dict per lead, in input order, with icp_score, score_breakdown,
+        score_recommendation (and score_comparison in compare mode)
+    """
+    mode = (scoring_mode or SCORING_MODE).lower()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(enriched_leads)
+    
+    pending = []
+    for index, lead in enumerate(enriched_leads):
+        if not lead or not any(lead.values()):
+            results[index] = {"icp_score": 0, "score_breakdown": {},
+                              "score_recommendation": "No enriched data available to score"}
+        elif mode in ("llm", "compare"):
+            pending.append(index)
+        else:
+            results[index] = combine_scores(lead, None, mode)
+    
+    if pending:
+        pending_leads = [enriched_leads[index] for index in pending]
+        batches = [[pending[i] for i in batch] for batch in plan_scoring_batches(pending_leads)]
+        print(f"🤖 Scoring {len(pending)} leads with LLM in {len(batches)} batch(es)...")
+        batch_results = await asyncio.gather(*(request_llm_scores_batch(enriched_leads, batch) for batch in batches))
+        llm_scores: Dict[int, Dict[str, Any]] = {}
+        for batch_result in batch_results:
+            llm_scores.update(batch_result)
+        
+        # Retry leads whose batch result was missing or malformed individually
+        retry = [index for index in pending if index not in llm_scores]
+        if retry:
+            print(f"⚠️ Retrying {len(retry)} lead(s) individually")
+            retried = await asyncio.gather(
+                *(request_llm_score(enriched_leads[index]) for index in retry), return_exceptions=True
+            )
+            for index, score_data in zip(retry, retried):
+                if isinstance(score_data, Exception):
+                    logger.error(f"Scoring error: {str(score_data)}")
+                    continue
+                llm_scores[index] = score_data
+        
+        for index in pending:
+            results[index] = combine_scores(enriched_leads[index], llm_scores.get(index), mode)
+    
+    return results
+
+
 # Async version for FastAPI compatibility
 async def score_lead_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Async wrapper for scoring agent (for FastAPI compatibility)
     Integrates with metadata_enrichment_agent output
     """
-    result = run_icp_scoring(state)
+    result = await arun_icp_scoring(state)
     
     # Update original state with results
     state["icp_score"] = result.get("icp_score", 0)
     state["score_breakdown"] = result.get("score_breakdown", {})
     state["score_recommendation"] = result.get("score_recommendation", "")
+    if result.get("score_comparison"):
+        state["score_comparison"] = result["score_comparison"]
     if "enriched_lead" in result:
         state["enriched_lead"] = result["enriched_lead"]
     
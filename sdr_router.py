@@ -0,0 +1,230 @@
+# agents/sdr_router.py
+"""
+Deterministic SDR router.
+
+Applies the routing policy of llm_routing_node to load_sales_reps() directly:
+
+1. Territory: the lead's location resolved to a rep territory
+2. Industry: exact match on a rep's industry_focus, or a close (whole-word
+   containment) match such as "Healthcare Tech" / "Healthcare"
+3. Company size >= the rep's min_company_size
+4. ICP score >= the rep's min_icp_score
+5. Tie-breaks: exact industry over close, lower min_icp_score, then name
+
+If no rep meets every criterion, the closest match (most criteria met, same
+tie-breaks) is assigned, or "Unassigned" when the score is below every rep's
+minimum or nothing matches territory or industry.
+
+Reps are indexed by territory and industry once, so a routing decision is a
+few dictionary lookups. Locations and industries that cannot be resolved are
+reported as ambiguous so the caller can fall back to the LLM.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.icp_scoring_engine import parse_company_size
+
+US_STATES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana",
+    "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana",
+    "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina",
+    "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina",
+    "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "West Virginia",
+    "Wisconsin", "Wyoming",
+]
+
+# Location terms that resolve to each rep territory
+TERRITORY_ALIASES = {
+    "USA": [
+        "USA", "US", "U.S.", "U.S.A.", "United States", "United States of America",
+        "San Francisco", "Silicon Valley", "Seattle", "Redmond", "Boston", "Chicago", "Austin",
+        "Los Angeles", "Atlanta", "Palo Alto", "Mountain View", "Menlo Park", "Cupertino",
+    ] + US_STATES,
+    "Canada": [
+        "Canada", "Toronto", "Vancouver", "Montreal", "Ottawa", "Calgary", "Edmonton", "Waterloo",
+        "Ontario", "Quebec", "British Columbia", "Alberta", "Manitoba", "Nova Scotia",
+    ],
+    "UK": [
+        "UK", "U.K.", "United Kingdom", "Great Britain", "Britain", "England", "Scotland", "Wales",
+        "Northern Ireland", "London", "Manchester", "Edinburgh", "Cambridge, UK", "Oxford",
+    ],
+}
+
+_INDUSTRY_RANK = {"exact": 0, "close": 1}
+
+
+def _word_pattern(term: str) -> "re.Pattern[str]":
+    """Case-insensitive whole-word pattern (works for terms like "U.S.")."""
+    return re.compile(r"(?<!\w)" + re.escape(term.lower()) + r"(?!\w)")
+
+
+class SdrRouter:
+    """Rule-based router over a fixed list of sales reps."""
+
+    def __init__(self, sales_reps: List[Dict[str, Any]], territory_aliases: Optional[Dict[str, List[str]]] = None):
+        self.sales_reps = sorted(sales_reps, key=lambda rep: rep["name"])
+        aliases = TERRITORY_ALIASES if territory_aliases is None else territory_aliases
+
+        # territory -> reps
+        self.by_territory: Dict[str, List[Dict[str, Any]]] = {}
+        for rep in self.sales_reps:
+            self.by_territory.setdefault(rep["territory"], []).append(rep)
+
+        # One alternation per territory; earliest mention in the location wins
+        self.territory_patterns = []
+        for territory in self.by_territory:
+            terms = sorted(set(aliases.get(territory, []) + [territory]), key=len, reverse=True)
+            pattern = re.compile(
+                r"(?<!\w)(?:" + "|".join(re.escape(t.lower()) for t in terms) + r")(?!\w)"
+            )
+            self.territory_patterns.append((territory, pattern))
+
+        # lowercased industry focus -> reps, plus word patterns for close matches
+        self.by_industry: Dict[str, List[Dict[str, Any]]] = {}
+        self.industry_names: Dict[str, str] = {}
+        for rep in self.sales_reps:
+            for industry in rep.get("industry_focus", []):
+                self.by_industry.setdefault(industry.lower(), []).append(rep)
+                self.industry_names.setdefault(industry.lower(), industry)
+        self.industry_patterns = [(industry, _word_pattern(industry)) for industry in self.by_industry]
+        self.min_score = min((rep.get("min_icp_score", 0) for rep in self.sales_reps), default=0)
+
+    def resolve_territory(self, location: str) -> Optional[str]:
+        """Map a free-text location to a rep territory (earliest mention wins)."""
+        lowered = (location or "").lower()
+        best: Optional[Tuple[int, str]] = None
+        for territory, pattern in self.territory_patterns:
+            match = pattern.search(lowered)
+            if match and (best is None or match.start() < best[0]):
+                best = (match.start(), territory)
+        return best[1] if best else None
+
+    def industry_matches(self, industry: str) -> Dict[int, Tuple[str, str]]:
+        """
+        Find reps whose industry_focus matches the lead's industry.
+
+        Returns:
+            Mapping of rep_id -> (match level "exact"/"close", matched focus)
+        """
+        lowered = (industry or "").strip().lower()
+        matches: Dict[int, Tuple[str, str]] = {}
+        if not lowered:
+            return matches
+        for rep in self.by_industry.get(lowered, []):
+            matches[rep["rep_id"]] = ("exact", self.industry_names[lowered])
+        lead_pattern = _word_pattern(lowered)
+        for focus, pattern in self.industry_patterns:
+            if focus == lowered or not (pattern.search(lowered) or lead_pattern.search(focus)):
+                continue
+            for rep in self.by_industry[focus]:
+                matches.setdefault(rep["rep_id"], ("close", self.industry_names[focus]))
+        return matches
+
+    def route(self, enriched_lead: Dict[str, Any], icp_score: int) -> Dict[str, Any]:
+        """
+        Route a lead to a sales rep.
+
+        Args:
+            enriched_lead: Enriched lead (headquarters_location or locations,
+                industry, company_size)
+            icp_score: ICP score of the lead
+
+        Returns:
+            Dictionary with assigned_rep, rep_email and routing_reason, and
+            ambiguous (why the decision should go to the LLM, "" if not)
+        """
+        location = enriched_lead.get("headquarters_location") or ", ".join(enriched_lead.get("locations") or [])
+        industry = enriched_lead.get("industry") or ""
+        employees = parse_company_size(enriched_lead.get("company_size"))
+
+        territory = self.resolve_territory(location)
+        industry_hits = self.industry_matches(industry)
+
+        ambiguous = []
+        if location.strip() and territory is None:
+            ambiguous.append(f"location '{location}' does not map to a territory")
+        if industry.strip() and not industry_hits:
+            ambiguous.append(f"industry '{industry}' does not match any rep's focus")
+
+        if icp_score < self.min_score:
+            return self._unassigned(
+                f"ICP score {icp_score} is below every rep's minimum (lowest is {self.min_score})", []
+            )
+
+        candidates = []
+        for rep in self.sales_reps:
+            checks = self._checks(rep, territory, industry_hits.get(rep["rep_id"]), employees, icp_score)
+            met = sum(1 for ok, _ in checks.values() if ok)
+            candidates.append((rep, checks, met))
+
+        qualified = [c for c in candidates if c[2] == len(c[1])]
+        if qualified:
+            rep, checks, _ = min(qualified, key=lambda c: self._tie_break(c[0], industry_hits))
+            return self._assigned(rep, checks, ambiguous)
+
+        closest = [
+            c for c in candidates
+            if c[1]["territory"][0] or c[1]["industry"][0]
+        ]
+        if not closest:
+            return self._unassigned("No rep matches the lead's territory or industry", ambiguous)
+        rep, checks, _ = min(
+            closest,
+            key=lambda c: (-c[2], not c[1]["territory"][0]) + self._tie_break(c[0], industry_hits),
+        )
+        decision = self._assigned(rep, checks, ambiguous)
+        missed = "; ".join(reason for ok, reason in checks.values() if not ok)
+        decision["routing_reason"] = f"Closest match - {decision['routing_reason']} (not met: {missed})"
+        return decision
+
+    @staticmethod
+    def _checks(rep: Dict[str, Any], territory: Optional[str], industry_hit: Optional[Tuple[str, str]],
+                employees: Optional[int], icp_score: int) -> Dict[str, Tuple[bool, str]]:
+        """Evaluate each routing criterion for one rep: name -> (met, explanation)."""
+        min_size = rep.get("min_company_size", 0)
+        min_score = rep.get("min_icp_score", 0)
+        if industry_hit:
+            level, focus = industry_hit
+            industry = (True, f"Industry {level} match ({focus})")
+        else:
+            industry = (False, f"Industry not in {rep['name']}'s focus")
+        if employees is None:
+            # Unknown size cannot disqualify a rep
+            size = (True, "Company size unknown")
+        elif employees >= min_size:
+            size = (True, f"Company size {employees} meets minimum {min_size}")
+        else:
+            size = (False, f"Company size {employees} below minimum {min_size}")
+        return {
+            "territory": (territory == rep["territory"],
+                          f"Territory match ({rep['territory']})" if territory == rep["territory"]
+                          else f"Territory {territory or 'unknown'} is not {rep['territory']}"),
+            "industry": industry,
+            "company_size": size,
+            "icp_score": (icp_score >= min_score,
+                          f"Score {icp_score} {'meets' if icp_score >= min_score else 'below'} minimum {min_score}"),
+        }
+
+    @staticmethod
+    def _tie_break(rep: Dict[str, Any], industry_hits: Dict[int, Tuple[str, str]]) -> tuple:
+        hit = industry_hits.get(rep["rep_id"])
+        return (_INDUSTRY_RANK[hit[0]] if hit else 2, rep.get("min_icp_score", 0), rep["name"])
+
+    @staticmethod
+    def _assigned(rep: Dict[str, Any], checks: Dict[str, Tuple[bool, str]], ambiguous: List[str]) -> Dict[str, Any]:
+        return {
+            "assigned_rep": rep["name"],
+            "rep_email": rep.get("email", ""),
+            "routing_reason": ", ".join(reason for ok, reason in checks.values() if ok),
+            "ambiguous": "; ".join(ambiguous),
+        }
+
+    @staticmethod
+    def _unassigned(reason: str, ambiguous: List[str]) -> Dict[str, Any]:
+        return {
+            "assigned_rep": "Unassigned",
+            "rep_email": "",
+            "routing_reason": reason,
+            "ambiguous": "; ".join(ambiguous),
+        }
@@ -0,0 +1,137 @@
+# agents/single_flight.py
+"""
+Request coalescing ("single flight") for per-company enrichment.
+
+When several leads from the same company arrive together (a webinar list,
+a CSV import), each pipeline run would browse and call the LLM for the same
+company. A SingleFlight group lets the first caller for a key start the
+work and every concurrent caller for the same key await that one in-flight
+task instead. Keys are canonical company names, so "Microsoft",
+"Microsoft Corp." and "microsoft corporation" share one enrichment.
+
+Only concurrent calls are coalesced; once the task finishes the key is
+released and the next call starts fresh work (use the LLM cache for reuse
+across time). Each caller receives its own deep copy of the result, so
+callers can mutate it freely. The shared task is shielded: a caller that is
+cancelled (e.g. a disconnected client) does not cancel it for the others.
+LLM calls made by the shared task are attributed to the run that started it.
+
+Configuration (environment variables):
+    ENRICHMENT_SINGLE_FLIGHT: "0" disables coalescing
+"""
+import asyncio
+import copy
+import os
+import re
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+ENRICHMENT_SINGLE_FLIGHT = os.getenv("ENRICHMENT_SINGLE_FLIGHT", "1").lower() not in ("0", "false", "no")
+
+# Legal-form suffixes ignored when comparing company names
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "llc", "ltd", "limited",
+    "plc", "gmbh", "ag", "sa", "nv", "bv", "lp", "llp", "pty", "group", "holdings",
+}
+
+T = TypeVar("T")
+
+
+def canonical_company(name: str) -> str:
+    """
+    Normalize a company name for coalescing: case, punctuation, "&",
+    a leading "The" and trailing legal-form suffixes are ignored.
+
+    "The Coca-Cola Company" -> "coca cola", "Microsoft Corp." -> "microsoft"
+    """
+    words = re.sub(r"[^\w]+", " ", (name or "").lower().replace("&", " and ")).split()
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words = words[:-1]
+    return " ".join(words)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        # event loop -> key -> in-flight task (tasks cannot be awaited across loops)
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() for `key`, or wait for the call already in flight for it.
+
+        Args:
+            key: Coalescing key (e.g. canonical_company(name))
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            A deep copy of fn()'s result (exceptions propagate to every caller)
+        """
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        with self._lock:
+            self._stats["calls"] += 1
+            if task is None:
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            inflight[key] = task
+            task.add_done_callback(lambda done: self._release(inflight, key, done))
+        else:
+            print(f"🔗 [{self.name}] joined in-flight enrichment for '{key}'")
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def _release(self, inflight: Dict[str, asyncio.Task], key: str, task: asyncio.Task):
+        if inflight.get(key) is task:
+            del inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            with self._lock:
+                self._stats["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, executions (calls that did the work), coalesced calls, errors and in-flight keys."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["in_flight"] = sum(len(keys) for keys in list(self._inflight.values()))
+        stats["coalesced_rate"] = round(stats["coalesced"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight group with this name."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+async def coalesce_company(group: str, company_name: str, fn: Callable[[], Awaitable[T]]) -> T:
+    """Run fn() through the `group` SingleFlight keyed by canonical company (direct call if disabled)."""
+    if not ENRICHMENT_SINGLE_FLIGHT:
+        return await fn()
+    return await get_single_flight(group).do(canonical_company(company_name), fn)
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every SingleFlight group."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.stats() for name, group in groups.items()}
@@ -23,9 +23,36 @@ def init_db():
         enriched_lead TEXT,
         icp_score INTEGER,
         assigned_rep TEXT,
+        error TEXT,
+        opportunities TEXT,
+        fetched_at TEXT
+    )
+    """)
+    # Databases created before re-enrichment lack the opportunities and fetched_at columns
+    columns = {row["name"] for row in cursor.execute("PRAGMA table_info(leads)")}
+    for column in ("opportunities", "fetched_at"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE leads ADD COLUMN {column} TEXT")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS llm_calls (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        lead_id TEXT,
+        agent TEXT NOT NULL,
+        model TEXT,
+        started_at REAL,
+        wall_ms REAL,
+        ttft_ms REAL,
+        queue_ms REAL,
+        prompt_tokens INTEGER,
+        completion_tokens INTEGER,
+        tokens_estimated INTEGER,
+        cost_usd REAL,
+        cached INTEGER,
         error TEXT
     )
     """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls (run_id)")
     conn.commit()
     conn.close()
 
@@ -33,14 +60,17 @@ def insert_lead(lead: Dict[str, Any]) -> int:
     """
     Insert a new lead record. `lead` dict should contain keys:
     company, email, job_title, website, phone, enriched_lead (JSON string),
-    icp_score, assigned_rep, error
+    icp_score, assigned_rep, error, opportunities (JSON string: news_ref and
+    linkedin_ref, blob store refs of the crawled payloads, and
+    enrichment_opportunity), fetched_at (JSON string: fetch time per field)
     Returns inserted row id.
     """
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
-    INSERT INTO leads (company, email, job_title, website, phone, enriched_lead, icp_score, assigned_rep, error)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    INSERT INTO leads (company, email, job_title, website, phone, enriched_lead, icp_score, assigned_rep, error,
+                       opportunities, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         lead.get("company"),
         lead.get("email"),
@@ -51,12 +81,34 @@ def insert_lead(lead: Dict[str, Any]) -> int:
         lead.get("icp_score"),
         lead.get("assigned_rep"),
         lead.get("error"),
+        lead.get("opportunities"),
+        lead.get("fetched_at"),
     ))
     conn.commit()
     row_id = cursor.lastrowid
     conn.close()
     return row_id
 
+def update_lead(lead_id: int, lead: Dict[str, Any]) -> bool:
+    """
+    Update a stored lead with a re-enriched result (same keys as insert_lead;
+    keys not given keep their stored values).
+    Returns whether the lead exists.
+    """
+    columns = [column for column in ("company", "email", "job_title", "website", "phone", "enriched_lead",
+                                     "icp_score", "assigned_rep", "error", "opportunities", "fetched_at")
+               if column in lead]
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"UPDATE leads SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+        [lead[column] for column in columns] + [lead_id],
+    )
+    conn.commit()
+    updated = cursor.rowcount > 0
+    conn.close()
+    return updated
+
 def get_lead_by_id(lead_id: int) -> Optional[Dict[str, Any]]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -74,3 +126,50 @@ def get_all_leads() -> List[Dict[str, Any]]:
     rows = cursor.fetchall()
     conn.close()
     return [dict(row) for row in rows]
+
+def insert_llm_calls(calls: List[Dict[str, Any]], lead_id: Optional[Any] = None) -> int:
+    """
+    Persist LLM call metrics of a pipeline run (entries from llm_metrics).
+    `lead_id` overrides the entries' lead_id, e.g. with the saved lead's row id.
+    Returns the number of rows inserted.
+    """
+    if not calls:
+        return 0
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany("""
+    INSERT INTO llm_calls (run_id, lead_id, agent, model, started_at, wall_ms, ttft_ms, queue_ms,
+                           prompt_tokens, completion_tokens, tokens_estimated, cost_usd, cached, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(
+        call.get("run_id"),
+        str(lead_id) if lead_id is not None else call.get("lead_id"),
+        call.get("agent"),
+        call.get("model"),
+        call.get("started_at"),
+        call.get("wall_ms"),
+        call.get("ttft_ms"),
+        call.get("queue_ms"),
+        call.get("prompt_tokens"),
+        call.get("completion_tokens"),
+        int(bool(call.get("tokens_estimated"))),
+        call.get("cost_usd"),
+        int(bool(call.get("cached"))),
+        call.get("error"),
+    ) for call in calls])
+    conn.commit()
+    conn.close()
+    return len(calls)
+
+def get_llm_calls(run_id: Optional[str] = None, lead_id: Optional[Any] = None) -> List[Dict[str, Any]]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    if run_id is not None:
+        cursor.execute("SELECT * FROM llm_calls WHERE run_id = ? ORDER BY id", (run_id,))
+    elif lead_id is not None:
+        cursor.execute("SELECT * FROM llm_calls WHERE lead_id = ? ORDER BY id", (str(lead_id),))
+    else:
+        cursor.execute("SELECT * FROM llm_calls ORDER BY id DESC LIMIT 500")
+    rows = cursor.fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
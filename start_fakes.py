@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+script to start the local fake LLM, Serper and site fixture servers for offline load tests
+(see benchmarks/fake_services.py)
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+os.chdir(project_root)
+sys.path.insert(0, project_root)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--llm-port", type=int, default=9100)
+    parser.add_argument("--serper-port", type=int, default=9101)
+    parser.add_argument("--site-port", type=int, default=9102)
+    for service, latency in (("llm", 800), ("serper", 300), ("site", 150)):
+        parser.add_argument(f"--{service}-latency-ms", type=float, default=None,
+                            help=f"Mean latency (default {latency}; LLM: time to first token)")
+        parser.add_argument(f"--{service}-error-rate", type=float, default=None, help="Share of HTTP 500 responses")
+    parser.add_argument("--jitter", type=float, default=None, help="Relative latency jitter (default 0.2)")
+    parser.add_argument("--tokens-per-sec", type=float, default=None, help="LLM generation speed (default 80)")
+    parser.add_argument("--output-chars", type=int, default=None, help="Opportunity analysis length (default 1500)")
+    parser.add_argument("--article-chars", type=int, default=None, help="News article length (default 6000)")
+    parser.add_argument("--wiki-infobox-rate", type=float, default=None, help="Share of companies with an infobox")
+    return parser.parse_args()
+
+
+async def serve(args):
+    import uvicorn
+    from benchmarks.fake_services import llm_app, serper_app, site_app
+
+    servers = [
+        uvicorn.Server(uvicorn.Config(app, host=args.host, port=port, log_level="warning"))
+        for app, port in ((llm_app, args.llm_port), (serper_app, args.serper_port), (site_app, args.site_port))
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    # The fakes read their configuration from the environment at import
+    settings = {
+        "FAKE_SITE_URL": f"http://{args.host}:{args.site_port}",
+        "FAKE_LATENCY_JITTER": args.jitter,
+        "FAKE_LLM_TOKENS_PER_SEC": args.tokens_per_sec,
+        "FAKE_LLM_OUTPUT_CHARS": args.output_chars,
+        "FAKE_ARTICLE_CHARS": args.article_chars,
+        "FAKE_WIKI_INFOBOX_RATE": args.wiki_infobox_rate,
+    }
+    for service in ("llm", "serper", "site"):
+        settings[f"FAKE_{service.upper()}_LATENCY_MS"] = getattr(args, f"{service}_latency_ms")
+        settings[f"FAKE_{service.upper()}_ERROR_RATE"] = getattr(args, f"{service}_error_rate")
+    for name, value in settings.items():
+        if value is not None:
+            os.environ[name] = str(value)
+
+    print(" Starting fake LLM, Serper and site fixture servers...")
+    print(" Point the backend at them with:")
+    print(f"   export LLM_BASE_URL=http://{args.host}:{args.llm_port}")
+    print(f"   export SERPER_URL=http://{args.host}:{args.serper_port}/search")
+    print(f"   export SERPER_API_KEY=fake")
+    print(f"   export WIKIPEDIA_BASE_URL=http://{args.host}:{args.site_port}/wiki")
+    print("=" * 60)
+
+    asyncio.run(serve(args))
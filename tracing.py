@@ -0,0 +1,245 @@
+# agents/tracing.py
+"""
+Structured tracing of pipeline runs.
+
+A trace is one lead's run through the pipeline; its id is the pipeline run
+id, so traces line up with the LLM metrics and checkpoints of the same run.
+Spans nest inside it: workflow nodes, the agents' subgraph nodes, page
+fetches, web searches and LLM calls. The active trace and span live in
+context variables, so a span opened in a nested graph, an awaited helper or
+an asyncio task finds its parent without it being passed around. Outside a
+trace, span() and traced functions do nothing.
+
+When a trace finishes, its spans are appended to a JSON-lines sink (one span
+per line, written inline: one lead's spans are a few KB) and the trace is
+kept in an in-process registry of recent traces, from which a run's timing
+waterfall can be returned with its result.
+
+Configuration (environment variables):
+    TRACE_SINK: JSON-lines file finished spans are appended to ("" disables it)
+    TRACE_HISTORY: number of finished traces kept in memory
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+TRACE_SINK = os.getenv("TRACE_SINK", "pipeline_traces.jsonl")
+TRACE_HISTORY = int(os.getenv("TRACE_HISTORY", "200"))
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = ("span_id", "parent_id", "name", "kind", "attributes", "start", "end", "status")
+
+    def __init__(self, name: str, kind: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.status = "ok"
+
+    def fail(self, error: Any):
+        self.status = "error"
+        self.attributes["error"] = str(error)
+
+
+class Trace:
+    """The spans of one pipeline run."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans: List[Span] = []
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Spans as sink records, times in ms from the start of the trace."""
+        now = time.perf_counter()
+        return [{
+            "trace_id": self.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "kind": span.kind,
+            "started_at": round(self.started_at + span.start - self.start, 6),
+            "start_ms": round((span.start - self.start) * 1000, 2),
+            "duration_ms": round(((span.end or now) - span.start) * 1000, 2),
+            "status": span.status if span.end is not None else "unfinished",
+            "attributes": span.attributes,
+        } for span in self.spans]
+
+    def waterfall(self) -> List[Dict[str, Any]]:
+        """Spans in start order with their nesting depth, for display as a timing waterfall."""
+        records = sorted(self.to_records(), key=lambda record: record["start_ms"])
+        depths: Dict[str, int] = {}
+        rows = []
+        for record in records:
+            depth = depths[record["span_id"]] = depths.get(record["parent_id"], -1) + 1
+            rows.append({
+                "name": record["name"],
+                "kind": record["kind"],
+                "depth": depth,
+                "start_ms": record["start_ms"],
+                "duration_ms": record["duration_ms"],
+                "status": record["status"],
+                **record["attributes"],
+            })
+        return rows
+
+
+current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("trace_span", default=None)
+
+
+@contextmanager
+def trace(trace_id: Optional[str] = None, name: str = "pipeline", **attributes: Any) -> Iterator[Trace]:
+    """
+    Trace everything inside the block as one run, under a root span `name`.
+
+    Yields:
+        The trace (finished, exported and registered when the block exits)
+    """
+    active = Trace(trace_id or uuid.uuid4().hex)
+    token = current_trace.set(active)
+    try:
+        with span(name, kind="pipeline", **attributes):
+            yield active
+    finally:
+        current_trace.reset(token)
+        get_trace_registry().add(active)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the block as a child of the current span (no-op outside a trace).
+
+    An exception escaping the block marks the span as failed.
+
+    Yields:
+        The span, or None outside a trace
+    """
+    active = current_trace.get()
+    if active is None:
+        yield None
+        return
+    parent = current_span.get()
+    opened = Span(name, kind, parent.span_id if parent else None, attributes)
+    active.spans.append(opened)
+    token = current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.fail(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        opened.end = time.perf_counter()
+        current_span.reset(token)
+
+
+def annotate(**attributes: Any):
+    """Add attributes to the current span (no-op outside a trace)."""
+    opened = current_span.get()
+    if opened is not None and current_trace.get() is not None:
+        opened.attributes.update(attributes)
+
+
+def traced(name: str, kind: str = "internal", args: Sequence[str] = ()) -> Callable:
+    """
+    Decorator running a function (sync or async) in a span.
+
+    The arguments named in `args` are recorded as span attributes. A graph
+    node whose update carries a new "error" (how nodes report a failed
+    stage) marks its span as failed, as an exception does.
+    """
+    def decorate(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        def attributes(call_args, call_kwargs) -> Dict[str, Any]:
+            if not args:
+                return {}
+            bound = signature.bind_partial(*call_args, **call_kwargs).arguments
+            return {arg: bound[arg] for arg in args if arg in bound}
+
+        def state_error(call_args) -> Any:
+            # Read before the call: some nodes set the error on the state they were given
+            state = call_args[0] if call_args else None
+            return state.get("error") if isinstance(state, dict) else None
+
+        def check(opened: Span, result: Any, previous_error: Any) -> Any:
+            if isinstance(result, dict) and result.get("error") and result["error"] != previous_error:
+                opened.fail(result["error"])
+            return result
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*call_args, **call_kwargs):
+                if current_trace.get() is None:
+                    return await fn(*call_args, **call_kwargs)
+                previous_error = state_error(call_args)
+                with span(name, kind, **attributes(call_args, call_kwargs)) as opened:
+                    return check(opened, await fn(*call_args, **call_kwargs), previous_error)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*call_args, **call_kwargs):
+            if current_trace.get() is None:
+                return fn(*call_args, **call_kwargs)
+            previous_error = state_error(call_args)
+            with span(name, kind, **attributes(call_args, call_kwargs)) as opened:
+                return check(opened, fn(*call_args, **call_kwargs), previous_error)
+        return wrapper
+
+    return decorate
+
+
+class TraceRegistry:
+    """Recently finished traces, and the JSON-lines sink they are exported to."""
+
+    def __init__(self, sink_path: Optional[str] = TRACE_SINK, max_traces: int = TRACE_HISTORY):
+        self.sink_path = sink_path
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, Trace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, finished: Trace):
+        """Register a finished trace and append its spans to the sink."""
+        records = finished.to_records() if self.sink_path else []
+        with self._lock:
+            # A resumed run is traced again under the same id; keep the latest
+            self._traces.pop(finished.trace_id, None)
+            self._traces[finished.trace_id] = finished
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+            if records:
+                with open(self.sink_path, "a", encoding="utf-8") as sink:
+                    sink.writelines(json.dumps(record, default=str) + "\n" for record in records)
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            return self._traces.get(trace_id)
+
+    def waterfall(self, trace_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Timing waterfall of a recent trace, or None if it is not in memory."""
+        finished = self.get(trace_id)
+        return finished.waterfall() if finished else None
+
+
+_registry = TraceRegistry()
+
+
+def get_trace_registry() -> TraceRegistry:
+    """Return the process-wide trace registry."""
+    return _registry
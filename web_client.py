@@ -0,0 +1,47 @@
+# agents/web_client.py
+"""
+Shared async HTTP client for web browsing (search API, articles, LinkedIn,
+Wikipedia).
+
+Browsing nodes await requests on the caller's event loop through one pooled
+`httpx.AsyncClient`, so many concurrent pipelines share connections and no
+thread is parked per request. As with the LLM gateway, each event loop gets
+its own client (httpx connections cannot be shared across loops).
+
+Configuration (environment variables):
+    WEB_MAX_CONNECTIONS: max pooled HTTP connections
+    WEB_TIMEOUT: request timeout in seconds
+"""
+import asyncio
+import os
+import weakref
+
+import httpx
+
+WEB_MAX_CONNECTIONS = int(os.getenv("WEB_MAX_CONNECTIONS", "50"))
+WEB_TIMEOUT = float(os.getenv("WEB_TIMEOUT", "30"))
+USER_AGENT = "Mozilla/5.0"
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_web_client() -> httpx.AsyncClient:
+    """Return the shared browsing client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=WEB_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=WEB_MAX_CONNECTIONS,
+                                max_keepalive_connections=WEB_MAX_CONNECTIONS),
+        )
+    return client
+
+
+async def aclose():
+    """Close the running loop's browsing client and its connection pool."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()